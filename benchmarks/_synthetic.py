@@ -0,0 +1,64 @@
+"""
+Synthetic offline data for the benchmarks: monthly symbols in RUB with random walk closes
+"""
+import numpy as np
+import pandas as pd
+
+from cifrum._portfolio.currency import PortfolioCurrencyFactory
+from cifrum._portfolio.portfolio import PortfolioItemsFactory
+from cifrum._sources.registries import CurrencySymbolsRegistry
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol
+from cifrum.common.financial_symbol_id import FinancialSymbolId
+
+period_start = pd.Period('1995-1', freq='M')
+period_end = pd.Period('2019-6', freq='M')
+
+
+def _monthly_frame(column: str, values: np.ndarray) -> pd.DataFrame:
+    periods = pd.period_range(period_start, periods=len(values), freq='M')
+    return pd.DataFrame({'date': periods.to_timestamp(), 'period': periods, column: values})
+
+
+def _symbol(namespace: str, name: str, column: str, values: np.ndarray, currency: Currency,
+            security_type: SecurityType) -> FinancialSymbol:
+    df = _monthly_frame(column, values)
+
+    def values_func(start, end):
+        return df[(start <= df['period']) & (df['period'] <= end)]
+
+    return FinancialSymbol(identifier=FinancialSymbolId(namespace, name), values=values_func,
+                           adjusted_close=True, currency=currency, period=Period.MONTH,
+                           security_type=security_type,
+                           start_period=df['period'].iloc[0], end_period=df['period'].iloc[-1])
+
+
+class _InflationSource:
+    def fetch_financial_symbol(self, name):
+        months = (period_end - period_start).n + 1
+        return _symbol('infl', name, 'value', np.full(months, .005), Currency[name], SecurityType.INFLATION)
+
+
+class _CurrenciesSource:
+    _currency_min_date = {currency.name: pd.Period('1990', freq='D') for currency in Currency}
+
+    def fetch_financial_symbol(self, name):
+        months = (period_end - period_start).n + 1
+        return _symbol('cbr', name, 'close', np.ones(months), Currency[name], SecurityType.CURRENCY)
+
+
+def portfolio_items_factory() -> PortfolioItemsFactory:
+    currencies_source = _CurrenciesSource()
+    return PortfolioItemsFactory(
+        portfolio_currency_factory=PortfolioCurrencyFactory(inflation_source=_InflationSource(),
+                                                            cbr_currencies_source=currencies_source),
+        currency_symbols_registry=CurrencySymbolsRegistry(cbr_currencies_source=currencies_source,
+                                                          disk_cache=None))
+
+
+def symbols(count: int, seed: int = 0):
+    random_state = np.random.RandomState(seed)
+    months = (period_end - period_start).n + 1
+    for idx in range(count):
+        closes = 100. * np.cumprod(1. + random_state.normal(.008, .06, size=months))
+        yield _symbol('micex', 'S{:04d}'.format(idx), 'close', closes, Currency.RUB, SecurityType.STOCK_ETF)
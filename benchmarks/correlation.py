@@ -0,0 +1,43 @@
+"""
+Time and peak memory of the correlation matrix over pairwise-complete months: the chunked kernel against pandas
+
+Usage: python benchmarks/correlation.py [assets count] [months count]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cifrum._portfolio import metrics  # noqa: E402
+
+
+def main(assets_count: int, months_count: int):
+    random_state = np.random.RandomState(0)
+    ror = random_state.normal(.01, .05, size=(assets_count, months_count))
+    starts = random_state.randint(0, months_count // 2, size=assets_count)
+    ror[np.arange(months_count) < starts[:, np.newaxis]] = np.nan
+
+    tracemalloc.start()
+    time_start = time.perf_counter()
+    corr = metrics.pairwise(ror, kind='corr', min_periods=12)
+    time_kernel = time.perf_counter() - time_start
+    _, peak_kernel = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    time_start = time.perf_counter()
+    corr_pandas = pd.DataFrame(ror.T).corr(min_periods=12).values
+    time_pandas = time.perf_counter() - time_start
+
+    print('assets: {}, months: {}, kernel: {:.2f} s (peak {:.0f} MB), pandas: {:.2f} s, max difference: {:.1e}'
+          .format(assets_count, months_count, time_kernel, peak_kernel / 1024 ** 2, time_pandas,
+                  np.nanmax(np.abs(corr - corr_pandas))))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 300)
@@ -0,0 +1,58 @@
+"""
+Time of currency conversions over random period ranges. `rate` is done for every asset built
+
+Usage: python benchmarks/currency_conversion.py [conversions count]
+"""
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import _synthetic  # noqa: E402
+from cifrum._sources.registries import CurrencySymbolsRegistry  # noqa: E402
+from cifrum.common.enums import Currency  # noqa: E402
+
+
+class _DiskCache:
+    """
+    Daily rates to RUB over 1992-2019
+    """
+
+    def read_csv(self, url, **kwargs):
+        if url.endswith('__index.csv'):
+            return pd.DataFrame({'name': ['{}-RUB'.format(c.name) for c in Currency if c != Currency.RUB]})
+        dates = pd.date_range('1992-7-1', '2019-6-30', freq='D')
+        close = 30. * np.cumprod(1. + np.random.RandomState(len(url)).normal(0., .005, size=dates.size))
+        return pd.DataFrame({'date': dates, 'close': close, 'nominal': 1})
+
+
+def main(conversions_count: int):
+    csr = CurrencySymbolsRegistry(cbr_currencies_source=_synthetic._CurrenciesSource(), disk_cache=_DiskCache())
+    csr.convert(Currency.USD, Currency.RUB, pd.Period('2000-1', freq='M'), pd.Period('2000-1', freq='M'))
+
+    random_state = np.random.RandomState(0)
+    pairs = [pair for pair in itertools.product(Currency, Currency) if pair[0] != pair[1]]
+    starts = pd.Period('1993-1', freq='M') + random_state.randint(0, 200, size=conversions_count)
+    time_start = time.perf_counter()
+    for idx, start_period in enumerate(starts):
+        currency_from, currency_to = pairs[idx % len(pairs)]
+        csr.convert(currency_from, currency_to, start_period, start_period + 100)
+    time_convert = (time.perf_counter() - time_start) / conversions_count
+
+    time_start = time.perf_counter()
+    for idx, start_period in enumerate(starts):
+        currency_from, currency_to = pairs[idx % len(pairs)]
+        csr.rate(currency_from, currency_to, start_period, start_period + 100)
+    time_rate = (time.perf_counter() - time_start) / conversions_count
+
+    print('conversions: {}, convert: {:.3f} ms, rate: {:.3f} ms per call'
+          .format(conversions_count, time_convert * 1000, time_rate * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
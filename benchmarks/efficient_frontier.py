@@ -0,0 +1,43 @@
+"""
+Time of the mean-variance optimization over a universe of many assets
+
+Usage: python benchmarks/efficient_frontier.py [assets count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import _synthetic  # noqa: E402
+from cifrum._portfolio.frontier import EfficientFrontier  # noqa: E402
+from cifrum.common.enums import Currency  # noqa: E402
+
+
+def main(assets_count: int):
+    factory = _synthetic.portfolio_items_factory()
+    assets = [factory.new_asset(symbol=symbol, start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                currency=Currency.RUB)
+              for symbol in _synthetic.symbols(assets_count)]
+    portfolio = factory.new_portfolio(assets_to_weight={a: 1. / assets_count for a in assets},
+                                      start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                      currency=Currency.RUB)
+
+    time_start = time.perf_counter()
+    ef = EfficientFrontier(portfolio, upper=.05)
+    steps = [
+        ('mean and covariance', lambda: None),
+        ('min_variance()', ef.min_variance),
+        ('max_sharpe()', ef.max_sharpe),
+        ('target_return(.012)', lambda: ef.target_return(.012)),
+        ('frontier(points=10)', lambda: ef.frontier(points=10)),
+    ]
+    for step_name, step in steps:
+        step()
+        time_end = time.perf_counter()
+        print('{:>5} assets  {:<24} {:8.3f} s'.format(assets_count, step_name, time_end - time_start))
+        time_start = time_end
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,58 @@
+"""
+Peak memory of building a portfolio of many assets and computing its statistics
+
+Usage: python benchmarks/portfolio_memory.py [assets count] [--tree path]
+
+`--tree` imports the library from another checkout, so that the numbers are compared with the ones
+of an earlier revision, e.g. the one before the closes are shared as read-only views:
+
+    git worktree add /tmp/cifrum-before bb2f61c^
+    python benchmarks/portfolio_memory.py 500 --tree /tmp/cifrum-before
+    python benchmarks/portfolio_memory.py 500
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+_args = sys.argv[1:]
+_tree = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+if '--tree' in _args:
+    _tree = _args.pop(_args.index('--tree') + 1)
+    _args.remove('--tree')
+sys.path.insert(0, os.path.abspath(_tree))
+
+import _synthetic  # noqa: E402
+from cifrum.common.enums import Currency  # noqa: E402
+
+
+def main(assets_count: int):
+    factory = _synthetic.portfolio_items_factory()
+    symbols = list(_synthetic.symbols(assets_count))
+
+    tracemalloc.start()
+    time_start = time.perf_counter()
+    assets = [factory.new_asset(symbol=symbol, start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                currency=Currency.RUB)
+              for symbol in symbols]
+    portfolio = factory.new_portfolio(assets_to_weight={a: 1. / assets_count for a in assets},
+                                      start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                      currency=Currency.RUB)
+    portfolio.get_return(kind='cumulative')
+    portfolio.risk()
+    portfolio.cagr(years_ago=5)
+    current_before_closes, _ = tracemalloc.get_traced_memory()
+    closes = [asset.close() for asset in portfolio.assets.values()]
+    returns = [asset.get_return() for asset in portfolio.assets.values()]
+    time_elapsed = time.perf_counter() - time_start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del closes, returns
+
+    print('tree: {}'.format(os.path.abspath(_tree)))
+    print('assets: {}, peak memory: {:.1f} MiB, held by closes and returns: {:.1f} MiB, time: {:.2f} s'
+          .format(assets_count, peak / 1024 ** 2, (current - current_before_closes) / 1024 ** 2, time_elapsed))
+
+
+if __name__ == '__main__':
+    main(int(_args[0]) if len(_args) > 0 else 500)
@@ -0,0 +1,37 @@
+"""
+Time of portfolio statistics over many assets, the portfolio is built once
+
+Usage: python benchmarks/portfolio_statistics.py [assets count]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import _synthetic  # noqa: E402
+from cifrum.common.enums import Currency  # noqa: E402
+
+
+def main(assets_count: int):
+    factory = _synthetic.portfolio_items_factory()
+    assets = [factory.new_asset(symbol=symbol, start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                currency=Currency.RUB)
+              for symbol in _synthetic.symbols(assets_count)]
+    portfolio = factory.new_portfolio(assets_to_weight={a: 1. / assets_count for a in assets},
+                                      start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                      currency=Currency.RUB)
+    stats = [
+        ('get_return()', lambda: portfolio.get_return()),
+        ("get_return(kind='ytd', real=True)", lambda: portfolio.get_return(kind='ytd', real=True)),
+        ('risk()', lambda: portfolio.risk()),
+        ('cagr(years_ago=5)', lambda: portfolio.cagr(years_ago=5)),
+    ]
+    for stat_name, stat in stats:
+        number = 20
+        seconds = min(timeit.repeat(stat, number=number, repeat=3)) / number
+        print('{:>5} assets  {:<36} {:10.2f} ms'.format(assets_count, stat_name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
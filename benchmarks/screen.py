@@ -0,0 +1,43 @@
+"""
+Time of the metrics of every symbol: per-asset `cagr`/`risk` against the kernels over a return panel
+
+Usage: python benchmarks/screen.py [assets count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import _synthetic  # noqa: E402
+from cifrum._portfolio import metrics  # noqa: E402
+from cifrum._portfolio.return_panel import ReturnPanel  # noqa: E402
+from cifrum.common.enums import Currency  # noqa: E402
+
+
+def main(assets_count: int):
+    factory = _synthetic.portfolio_items_factory()
+    assets = [factory.new_asset(symbol=symbol, start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                currency=Currency.RUB)
+              for symbol in _synthetic.symbols(assets_count)]
+    for a in assets:
+        a.get_return()
+
+    time_start = time.perf_counter()
+    for a in assets:
+        a.cagr(), a.risk()
+    time_looped = time.perf_counter() - time_start
+    for a in assets:
+        a.invalidate_metrics()
+
+    time_start = time.perf_counter()
+    panel = ReturnPanel.from_assets(assets)
+    metrics.masked(panel.values, 'cagr'), metrics.masked(panel.values, 'risk')
+    time_panel = time.perf_counter() - time_start
+
+    print('assets: {}, months: {}, per asset: {:.3f} s, panel: {:.3f} s'
+          .format(assets_count, panel.values.shape[1], time_looped, time_panel))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,31 @@
+"""
+Time of Monte Carlo simulation of a portfolio in this process and in a process pool
+
+Usage: python benchmarks/simulation.py [paths count] [horizon months]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cifrum._portfolio.simulation import simulate  # noqa: E402
+
+
+def main(paths_count: int, horizon_months: int):
+    ror = np.random.RandomState(0).normal(.008, .05, size=300)
+    for method in ['bootstrap', 'parametric']:
+        for max_workers in [1, max(os.cpu_count() or 1, 2)]:
+            time_start = time.perf_counter()
+            result = simulate(ror, paths_count=paths_count, horizon_months=horizon_months, method=method,
+                              max_workers=max_workers)
+            print('{} paths x {} months  {:<10} workers: {:<5} {:6.2f} s, median CAGR: {:.4f}'.format(
+                paths_count, horizon_months, method, max_workers,
+                time.perf_counter() - time_start, result.cagr[2]))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 360)
@@ -0,0 +1,52 @@
+"""
+Per-operation overhead of `TimeSeries` arithmetic on short and long series
+
+Usage: python benchmarks/time_series_ops.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cifrum.common.time_series import TimeSeries, TimeSeriesKind  # noqa: E402
+
+
+def _series(size: int, kind: TimeSeriesKind) -> TimeSeries:
+    start_period = pd.Period('1920-1', freq='M')
+    return TimeSeries(values=np.linspace(.001, .01, num=size),
+                      start_period=start_period, end_period=start_period + size - 1,
+                      kind=kind)
+
+
+def main():
+    for size in [12, 1200]:
+        ts = _series(size, TimeSeriesKind.DIFF)
+        ts_other = _series(size, TimeSeriesKind.DIFF)
+        ops = [
+            ('ts + ts', lambda: ts + ts_other),
+            ('ts * ts', lambda: ts * ts_other),
+            ('ts / ts', lambda: ts / ts_other),
+            ('ts + 1.', lambda: ts + 1.),
+            ('1. - ts', lambda: 1. - ts),
+            ('ts ** 2', lambda: ts ** 2),
+            ('ts.sqrt()', lambda: ts.sqrt()),
+            ('ts.cumprod()', lambda: ts.cumprod()),
+            ('ts.prod()', lambda: ts.prod()),
+            ('ts.std()', lambda: ts.std()),
+            ('ts.pct_change()', lambda: ts.pct_change()),
+            ('ts[-12:]', lambda: ts[-12:]),
+            ('(ts + 1.).prod() - 1.', lambda: (ts + 1.).prod() - 1.),
+            ('ts.ytd()', lambda: ts.ytd()),
+        ]
+        for op_name, op in ops:
+            number = 2000
+            seconds = min(timeit.repeat(op, number=number, repeat=3)) / number
+            print('{:>5} points  {:<24} {:8.2f} us'.format(size, op_name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Time of a weights sweep over the same assets: a portfolio per weight vector against one batch
+
+Usage: python benchmarks/weight_sweep.py [portfolios count] [assets count]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import _synthetic  # noqa: E402
+from cifrum.common.enums import Currency  # noqa: E402
+
+
+def main(portfolios_count: int, assets_count: int):
+    factory = _synthetic.portfolio_items_factory()
+    assets = [factory.new_asset(symbol=symbol, start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                currency=Currency.RUB)
+              for symbol in _synthetic.symbols(assets_count)]
+    weights = np.random.RandomState(0).dirichlet(np.ones(assets_count), size=portfolios_count)
+
+    looped_count = min(portfolios_count, 100)
+    time_start = time.perf_counter()
+    for row in weights[:looped_count]:
+        p = factory.new_portfolio(assets_to_weight=dict(zip(assets, row)),
+                                  start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                  currency=Currency.RUB)
+        p.cagr(), p.risk(), p.get_return(kind='cumulative')
+    time_looped = (time.perf_counter() - time_start) / looped_count * portfolios_count
+
+    time_start = time.perf_counter()
+    batch = factory.new_portfolio_batch(assets=assets, weights=weights,
+                                        start_period=_synthetic.period_start, end_period=_synthetic.period_end,
+                                        currency=Currency.RUB)
+    batch.cagr(), batch.risk(), batch.get_return(kind='cumulative')
+    time_batch = time.perf_counter() - time_start
+
+    print('portfolios: {}, assets: {}, portfolio per weights (extrapolated): {:.2f} s, batch: {:.3f} s'
+          .format(portfolios_count, assets_count, time_looped, time_batch))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 30)
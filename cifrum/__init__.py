@@ -1,3 +1,8 @@
+import functools
+import sys
+import threading
+from typing import Optional
+
 import pinject
 
 import cifrum._index
@@ -7,12 +12,15 @@ import cifrum._portfolio.portfolio
 import cifrum._search
 import cifrum._sources.all_sources
 import cifrum._sources.base_classes
+import cifrum._sources.disk_cache
 import cifrum._sources.inflation_source
 import cifrum._sources.micex_stocks_source
 import cifrum._sources.moex_indexes_source
 import cifrum._sources.mutru_funds_source
 import cifrum._sources.okama_source
+import cifrum._sources.panel_store
 import cifrum._sources.registries
+import cifrum._sources.series_cache
 import cifrum._sources.single_financial_symbol_source
 import cifrum._sources.us_data_source
 import cifrum._sources.yahoo_indexes_source
@@ -26,29 +34,79 @@ class BindingSpec(pinject.BindingSpec):
         bind('symbol_sources', to_class=AllSymbolSources)
 
 
-obj_graph = pinject.new_object_graph(binding_specs=[BindingSpec()],
-                                     modules=[cifrum.common, cifrum._index, cifrum._portfolio,
-                                              cifrum._sources.registries,
-                                              cifrum._sources.all_sources,
-                                              cifrum._sources.base_classes,
-                                              cifrum._sources.inflation_source,
-                                              cifrum._sources.micex_stocks_source,
-                                              cifrum._sources.moex_indexes_source,
-                                              cifrum._sources.mutru_funds_source,
-                                              cifrum._sources.okama_source,
-                                              cifrum._sources.single_financial_symbol_source,
-                                              cifrum._sources.us_data_source,
-                                              cifrum._sources.yahoo_indexes_source,
-                                              cifrum._portfolio.currency,
-                                              cifrum._portfolio.portfolio,
-                                              cifrum._search,
-                                              ])
-cifrum_instance = obj_graph.provide(Cifrum)
-
-information = cifrum_instance.information
-portfolio = cifrum_instance.portfolio
-portfolio_asset = cifrum_instance.portfolio_asset
-available_names = cifrum_instance.available_names
-search = cifrum_instance.search
-inflation = cifrum_instance.inflation
-currency = cifrum_instance.currency
+_graph_modules = [
+    cifrum.common,
+    cifrum._index,
+    cifrum._portfolio,
+    cifrum._sources.registries,
+    cifrum._sources.all_sources,
+    cifrum._sources.base_classes,
+    cifrum._sources.disk_cache,
+    cifrum._sources.inflation_source,
+    cifrum._sources.micex_stocks_source,
+    cifrum._sources.moex_indexes_source,
+    cifrum._sources.mutru_funds_source,
+    cifrum._sources.okama_source,
+    cifrum._sources.panel_store,
+    cifrum._sources.series_cache,
+    cifrum._sources.single_financial_symbol_source,
+    cifrum._sources.us_data_source,
+    cifrum._sources.yahoo_indexes_source,
+    cifrum._portfolio.currency,
+    cifrum._portfolio.portfolio,
+    cifrum._search,
+]
+
+obj_graph = pinject.new_object_graph(binding_specs=[BindingSpec()], modules=_graph_modules)
+
+_cifrum_instance: Optional[Cifrum] = None
+_cifrum_instance_lock = threading.Lock()
+
+
+def _instance() -> Cifrum:
+    """
+    Provides the library instance. It is created on the first call, so that importing the library
+    does not construct the sources and touch the network
+    """
+    global _cifrum_instance
+    if _cifrum_instance is None:
+        with _cifrum_instance_lock:
+            if _cifrum_instance is None:
+                _cifrum_instance = obj_graph.provide(Cifrum)
+    return _cifrum_instance
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name: str):
+        # `cifrum_instance` is created on the first access to it (PEP 562)
+        if name == 'cifrum_instance':
+            return _instance()
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+else:
+    # modules do not have `__getattr__` before Python 3.7, the instance is created on import there,
+    # its construction does not load data
+    cifrum_instance: Cifrum = _instance()
+
+
+def _delegate(method_name: str):
+    method = getattr(Cifrum, method_name)
+
+    @functools.wraps(method)
+    def delegate(*args, **kwargs):
+        return getattr(_instance(), method_name)(*args, **kwargs)
+
+    return delegate
+
+
+information = _delegate('information')
+portfolio = _delegate('portfolio')
+portfolio_asset = _delegate('portfolio_asset')
+portfolio_batch = _delegate('portfolio_batch')
+efficient_frontier = _delegate('efficient_frontier')
+screen = _delegate('screen')
+correlation = _delegate('correlation')
+available_names = _delegate('available_names')
+search = _delegate('search')
+build_panel = _delegate('build_panel')
+inflation = _delegate('inflation')
+currency = _delegate('currency')
@@ -1,17 +1,28 @@
-from typing import List, Dict, Union, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Union, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-from contracts import contract
+from contracts import ContractNotRespected, contract
 
 from ._portfolio.currency import PortfolioCurrencyFactory, PortfolioCurrency
-from ._portfolio.portfolio import Portfolio, PortfolioAsset, PortfolioItemsFactory
+from ._portfolio.frontier import EfficientFrontier
+from ._portfolio.metrics import masked, pairwise
+from ._portfolio.metrics_cache import MetricsCache
+from ._portfolio.portfolio import Portfolio, PortfolioAsset, PortfolioBatch, PortfolioItemsFactory
+from ._portfolio.return_panel import ReturnPanel
 from ._search import _Search
+from ._settings import correlation_cache_size, resolve_workers, screen_batch_size
 from ._sources.registries import FinancialSymbolsRegistry
 from .common.enums import Currency, SecurityType
 from .common.financial_symbol import FinancialSymbol
 from .common.financial_symbol_id import FinancialSymbolId
 
+_asset_security_types = {SecurityType.STOCK_ETF, SecurityType.MUT,
+                         SecurityType.CURRENCY, SecurityType.INDEX}
+# the values of a symbol are not available: HTTP, network and file errors, malformed values
+_symbol_errors = (OSError, ContractNotRespected)
+
 
 class Cifrum:
 
@@ -24,6 +35,7 @@ class Cifrum:
         self.portfolio_items_factory = portfolio_items_factory
         self.financial_symbols_registry = financial_symbols_registry
         self.__search = search
+        self.__statistics_cache = MetricsCache(max_entries=correlation_cache_size)
         self.__period_lowest = '1900-1'
         self.__period_highest = lambda: str(pd.Period.now(freq='M'))
 
@@ -49,12 +61,9 @@ class Cifrum:
             return finsym_info
         elif 'names' in kwargs:
             names = kwargs['names']
-            finsym_infos: List[Optional[FinancialSymbol]] = []
-            for name in names:
-                finsym_info1 = self.information(name=name)
-                if not (finsym_info1 is None or isinstance(finsym_info1, FinancialSymbol)):
-                    raise ValueError('Unexpected type of financial symbol information')
-                finsym_infos.append(finsym_info1)
+            financial_symbol_ids = [FinancialSymbolId.parse(name) for name in names]
+            finsym_infos: List[Optional[FinancialSymbol]] = \
+                self.financial_symbols_registry.get_many(financial_symbol_ids)
             return finsym_infos
         else:
             raise Exception('Unexpected state of kwargs')
@@ -68,10 +77,10 @@ class Cifrum:
         if end_period is None:
             end_period = self.__period_highest()
 
-        if 'name' in kwargs:
-            start_period = pd.Period(start_period, freq='M')
-            end_period = pd.Period(end_period, freq='M')
+        start_period = pd.Period(start_period, freq='M')
+        end_period = pd.Period(end_period, freq='M')
 
+        if 'name' in kwargs:
             name: str = kwargs['name']
             finsym_info = self.information(name=name)
 
@@ -79,35 +88,41 @@ class Cifrum:
                 return None
             if not isinstance(finsym_info, FinancialSymbol):
                 raise ValueError('Unexpected type of financial symbol information')
-
-            if currency is None:
-                currency_enum: Currency = finsym_info.currency
-            else:
-                currency_enum = Currency.__dict__[currency.upper()]  # type: ignore
-
-            allowed_security_types = {SecurityType.STOCK_ETF, SecurityType.MUT,
-                                      SecurityType.CURRENCY, SecurityType.INDEX}
-            assert finsym_info.security_type in allowed_security_types
-            a = self.portfolio_items_factory.new_asset(symbol=finsym_info,
-                                                       start_period=start_period, end_period=end_period,
-                                                       currency=currency_enum)
-            return a
+            return self.__new_asset(finsym_info, start_period=start_period, end_period=end_period, currency=currency)
         elif 'names' in kwargs:
             names: List[str] = kwargs['names']
-            assets: List[PortfolioAsset] = []
-            for name in names:
-                pa = self.portfolio_asset(name=name,
-                                          start_period=start_period, end_period=end_period,
-                                          currency=currency)
-                if pa is None:
-                    continue
-                if not isinstance(pa, PortfolioAsset):
-                    raise ValueError('Unexpected type of portfolio asset')
-                assets.append(pa)
-            return assets
+            unique_names = list(dict.fromkeys(names))
+            finsym_infos = self.information(names=unique_names)
+            if not isinstance(finsym_infos, list):
+                raise ValueError('Unexpected type of financial symbol information')
+            name2finsym_info = {name: finsym_info
+                                for name, finsym_info in zip(unique_names, finsym_infos)
+                                if finsym_info is not None}
+
+            def new_asset(finsym_info: FinancialSymbol) -> PortfolioAsset:
+                return self.__new_asset(finsym_info, start_period=start_period, end_period=end_period,
+                                        currency=currency)
+
+            # symbols are resolved once per unique name, but each requested name gets its own asset
+            with ThreadPoolExecutor(max_workers=max(1, resolve_workers)) as pool:
+                return list(pool.map(new_asset, [name2finsym_info[name] for name in names
+                                                 if name in name2finsym_info]))
         else:
             raise ValueError('Unexpected state of `kwargs`. Either `name`, or `names` should be given')
-        pass
+
+    def __new_asset(self, finsym_info: FinancialSymbol,
+                    start_period: pd.Period, end_period: pd.Period,
+                    currency: Optional[str]) -> PortfolioAsset:
+        if currency is None:
+            currency_enum: Currency = finsym_info.currency
+        else:
+            currency_enum = Currency.__dict__[currency.upper()]  # type: ignore
+
+        assert finsym_info.security_type in _asset_security_types
+        a = self.portfolio_items_factory.new_asset(symbol=finsym_info,
+                                                   start_period=start_period, end_period=end_period,
+                                                   currency=currency_enum)
+        return a
 
     @contract(
         assets='dict[N](str: float|int,>0), N>0',
@@ -154,6 +169,190 @@ class Cifrum:
                                                        currency=currency_enum)
         return portfolio_instance
 
+    def portfolio_batch(self,
+                        names: List[str],
+                        weights,
+                        currency: str,
+                        start_period: str = None, end_period: str = None) -> PortfolioBatch:
+        """
+        Evaluates many weight vectors over the same assets at once
+
+        :param names: names of financial symbols, all of them should be found
+        :param weights: (portfolios, assets) matrix, a row of weights per portfolio in the order of `names`.
+            Rows not summing up to 1 are normalized
+        :param start_period: preferred period to start
+        :param end_period: preferred period to end
+        :param currency: common currency for all assets
+        :return: portfolios whose `cagr`, `risk` and `get_return` give arrays with a row per portfolio
+        """
+        weights = np.array(weights, dtype=np.float64)
+        if weights.ndim != 2 or weights.shape[1] != len(names):
+            raise ValueError('`weights` should be (portfolios, assets) matrix')
+
+        assets_resolved, start_period, end_period = self.__all_assets(names, currency, start_period, end_period)
+
+        weights_sum = np.abs(weights.sum(axis=1, keepdims=True))
+        weights = np.where(np.abs(weights_sum - 1.) > 1e-3, weights / weights_sum, weights)
+
+        currency_enum: Currency = Currency.__dict__[currency.upper()]  # type: ignore
+        return self.portfolio_items_factory.new_portfolio_batch(assets=assets_resolved,
+                                                                weights=weights,
+                                                                start_period=start_period,
+                                                                end_period=end_period,
+                                                                currency=currency_enum)
+
+    def efficient_frontier(self,
+                           names: List[str],
+                           currency: str,
+                           start_period: str = None, end_period: str = None,
+                           lower=0., upper=1.) -> EfficientFrontier:
+        """
+        Mean-variance optimizer over the monthly rates of return of the assets
+
+        :param names: names of financial symbols, all of them should be found
+        :param currency: common currency for all assets
+        :param start_period: preferred period to start
+        :param end_period: preferred period to end
+        :param lower: lower bound of weights, either a number for all assets or a list in the order of `names`
+        :param upper: upper bound of weights, either a number for all assets or a list in the order of `names`
+        :return: the optimizer giving minimum variance, maximum Sharpe ratio and target return portfolios
+        """
+        assets_resolved, start_period, end_period = self.__all_assets(names, currency, start_period, end_period)
+        currency_enum: Currency = Currency.__dict__[currency.upper()]  # type: ignore
+        p = self.portfolio_items_factory.new_portfolio(assets_to_weight={a: 1. / len(names) for a in assets_resolved},
+                                                       start_period=start_period, end_period=end_period,
+                                                       currency=currency_enum)
+        return EfficientFrontier(portfolio=p, lower=lower, upper=upper)
+
+    def correlation(self,
+                    names: List[str],
+                    currency: str,
+                    kind: str = 'corr',
+                    start_period: str = None, end_period: str = None,
+                    min_periods: int = 12) -> pd.DataFrame:
+        """
+        Pairwise covariance or correlation of monthly rates of return of the assets.
+        Each pair uses the months when both assets have values. The `CIFRUM_CORRELATION_CACHE_SIZE` most recent
+        results are cached per instance and handed out as read-only frames, `copy` them to modify
+
+        :param names: names of financial symbols, all of them should be found
+        :param currency: common currency for all assets
+        :param kind: `corr` for correlation or `cov` for covariance
+        :param start_period: preferred period to start
+        :param end_period: preferred period to end
+        :param min_periods: pairs having fewer common months are NaN
+        :returns: (assets, assets) matrix indexed by `names`
+        """
+        # the key holds the concrete periods, so the default end period moves with the current month
+        start_period = pd.Period(self.__period_lowest if start_period is None else start_period, freq='M')
+        end_period = pd.Period(self.__period_highest() if end_period is None else end_period, freq='M')
+
+        def compute():
+            assets_resolved, _, _ = self.__all_assets(names, currency, str(start_period), str(end_period))
+            values = pairwise(ReturnPanel.from_assets(assets_resolved).values, kind=kind, min_periods=min_periods)
+            values.flags.writeable = False
+            return values
+
+        key = ('correlation', kind, tuple(names), currency.upper(), start_period, end_period, min_periods)
+        return pd.DataFrame(self.__statistics_cache.get(key, compute), index=list(names), columns=list(names),
+                            copy=False)
+
+    def __all_assets(self, names: List[str], currency: str,
+                     start_period: Optional[str], end_period: Optional[str]):
+        """
+        Resolves the assets of all names for a portfolio, in the order of names
+
+        :returns: assets, start and end periods of the portfolio
+        """
+        if start_period is None:
+            start_period = self.__period_lowest
+        if end_period is None:
+            end_period = self.__period_highest()
+        if len(set(names)) != len(names):
+            raise ValueError('`names` should be unique')
+
+        assets_resolved = \
+            self.portfolio_asset(names=names,
+                                 start_period=str(pd.Period(start_period, freq='M') - 1),
+                                 end_period=end_period,
+                                 currency=currency)
+        if not isinstance(assets_resolved, list):
+            raise ValueError('`assets_resolved` should be list')
+        if len(assets_resolved) != len(names):
+            raise ValueError('financial symbols are not found: {}'.format(
+                set(names) - {a.symbol.identifier.format() for a in assets_resolved}))
+        return assets_resolved, pd.Period(start_period, freq='M'), pd.Period(end_period, freq='M')
+
+    def screen(self,
+               namespace: str,
+               currency: str,
+               metrics: Sequence[str] = ('cagr', 'risk', 'max_drawdown'),
+               start_period: str = None, end_period: str = None,
+               min_months: int = 12,
+               batch_size: int = None) -> pd.DataFrame:
+        """
+        Computes metrics of all financial symbols of the namespace over their monthly rates of return.
+        The symbols are loaded concurrently and evaluated in batches, so memory is bounded by the batch size
+
+        :param namespace: namespace of financial symbols, e.g. `micex` or `us`
+        :param currency: common currency for all assets
+        :param metrics: any of `cagr`, `risk`, `max_drawdown`, `months`
+        :param start_period: preferred period to start
+        :param end_period: preferred period to end
+        :param min_months: symbols having fewer monthly rates of return are skipped
+        :param batch_size: symbols per batch, `CIFRUM_SCREEN_BATCH_SIZE` by default
+        :returns: metrics of the symbols, a row per symbol indexed by its name,
+            NaN metrics for the symbols which values failed to load
+        """
+        if start_period is None:
+            start_period = self.__period_lowest
+        if end_period is None:
+            end_period = self.__period_highest()
+        start_period = pd.Period(start_period, freq='M')
+        end_period = pd.Period(end_period, freq='M')
+        batch_size = screen_batch_size if batch_size is None else batch_size
+
+        financial_symbol_ids = [info.fin_sym_id for info in self.available_names(namespace=namespace)]
+
+        def new_asset(finsym_info: Optional[FinancialSymbol]) -> Optional[Tuple[str, Optional[PortfolioAsset]]]:
+            """
+            :returns: the name and the asset, `None` asset if its values failed to load, `None` for skipped symbols
+            """
+            if finsym_info is None or finsym_info.security_type not in _asset_security_types:
+                return None
+            try:
+                a = self.__new_asset(finsym_info, start_period=start_period - 1, end_period=end_period,
+                                     currency=currency)
+                if a.get_return().size < min_months:
+                    return None
+            except ValueError:
+                # the history is too short or out of the period range
+                return None
+            except _symbol_errors:
+                return finsym_info.identifier_str, None
+            return finsym_info.identifier_str, a
+
+        frames = []
+        with ThreadPoolExecutor(max_workers=max(1, resolve_workers)) as pool:
+            for idx in range(0, len(financial_symbol_ids), batch_size):
+                finsym_infos = self.financial_symbols_registry.get_many(financial_symbol_ids[idx:idx + batch_size])
+                rows = [row for row in pool.map(new_asset, finsym_infos) if row is not None]
+                if len(rows) == 0:
+                    continue
+                assets = [a for _, a in rows if a is not None]
+                if len(assets) == 0:
+                    frame = pd.DataFrame(columns=list(metrics), dtype=np.float64)
+                else:
+                    panel = ReturnPanel.from_assets(assets)
+                    frame = pd.DataFrame({metric: masked(panel.values, metric) for metric in metrics},
+                                         index=panel.names, columns=list(metrics))
+                # the symbols failed to load get NaN metrics
+                frames.append(frame.reindex([name for name, _ in rows]))
+
+        if len(frames) == 0:
+            return pd.DataFrame(columns=list(metrics))
+        return pd.concat(frames)
+
     def available_names(self, **kwargs):
         """
         Returns the list of registered financial symbols names
@@ -181,6 +380,17 @@ class Cifrum:
         else:
             return self.financial_symbols_registry.namespaces()
 
+    def build_panel(self, namespace: str):
+        """
+        Stores monthly values of all financial symbols of the namespace as a single memory-mapped
+        `assets x months` matrix under `CIFRUM_PANEL_DIR`. The symbols of the namespace are read from
+        the panel afterwards, also by other processes
+
+        :param namespace: namespace of financial symbols, e.g. `micex` or `us`
+        :returns: the built panel
+        """
+        return self.financial_symbols_registry.build_panel(namespace)
+
     def search(self, query: str, top=10):
         return self.__search.perform(query, top)
 
@@ -1,9 +1,12 @@
-from typing import Optional
+import threading
+import time
+from typing import Optional, Dict, Tuple
 
+import numpy as np
 import pandas as pd
 from contracts import contract
 
-from .._settings import _MONTHS_PER_YEAR
+from .._settings import _MONTHS_PER_YEAR, cache_ttl_seconds as default_cache_ttl_seconds
 from .._sources.inflation_source import InflationSource
 from .._sources.single_financial_symbol_source import CbrCurrenciesSource
 from ..common.enums import Currency
@@ -12,6 +15,9 @@ from ..common.time_series import TimeSeries, TimeSeriesKind
 
 
 class PortfolioCurrency:
+    """
+    Immutable currency of portfolios and assets, shared via `PortfolioCurrencyFactory`
+    """
 
     def __init__(self,
                  inflation_source: InflationSource,
@@ -40,6 +46,8 @@ class PortfolioCurrency:
             self.inflation_end_period,
             self._currency_symbol.end_period.asfreq(freq='M'),
         )
+        self.__inflation_values: Optional[Tuple[pd.Period, np.ndarray]] = None
+        self.__inflation_values_lock = threading.Lock()
 
     @property
     def period_min(self) -> pd.Period:
@@ -61,6 +69,26 @@ class PortfolioCurrency:
     def value(self) -> Currency:
         return self._currency
 
+    def __inflation_time_series(self, start_period: pd.Period, end_period: pd.Period) -> TimeSeries:
+        if self.__inflation_values is None:
+            with self.__inflation_values_lock:
+                if self.__inflation_values is None:
+                    period_start, values = self._inflation_symbol.monthly_values(
+                        start_period=self.inflation_start_period, end_period=self.inflation_end_period)
+                    values = np.array(values, dtype=np.float64)
+                    values.flags.writeable = False
+                    self.__inflation_values = period_start, values
+        period_start, values = self.__inflation_values
+
+        idx_start = max(0, (start_period - period_start).n)
+        idx_end = min(values.size, (end_period - period_start).n + 1)
+        if idx_start >= idx_end:
+            raise ValueError('inflation values are not available for the period range')
+        return TimeSeries(values=values[idx_start:idx_end],
+                          start_period=period_start + idx_start,
+                          end_period=period_start + idx_end - 1,
+                          kind=TimeSeriesKind.DIFF)
+
     @contract(
         kind='str',
         years_ago='int,>0|None',
@@ -98,13 +126,7 @@ class PortfolioCurrency:
         if years_ago is not None:
             start_period = end_period - years_ago * _MONTHS_PER_YEAR + 1
 
-        inflation_values = self._inflation_symbol.values(start_period=start_period,
-                                                         end_period=end_period)
-
-        inflation_ts = TimeSeries(values=inflation_values.value.values,
-                                  start_period=inflation_values.period.min(),
-                                  end_period=inflation_values.period.max(),
-                                  kind=TimeSeriesKind.DIFF)
+        inflation_ts = self.__inflation_time_series(start_period=start_period, end_period=end_period)
 
         def __cumulative():
             return (inflation_ts + 1.).prod() - 1.
@@ -135,14 +157,39 @@ class PortfolioCurrency:
 
 
 class PortfolioCurrencyFactory:
+    """
+    Shares a `PortfolioCurrency` per currency. The shared instance is replaced by a new one, built from
+    the current inflation and currency symbols, once `ttl_seconds` have passed.
+    The portfolios keep the instance they are created with
+    """
 
     def __init__(self,
                  inflation_source: InflationSource,
-                 cbr_currencies_source: CbrCurrenciesSource):
+                 cbr_currencies_source: CbrCurrenciesSource,
+                 ttl_seconds: Optional[int] = None):
         self.inflation_source = inflation_source
         self.cbr_currencies_source = cbr_currencies_source
+        self.ttl_seconds = default_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.__currencies: Dict[Currency, Tuple[float, PortfolioCurrency]] = {}
+        self.__lock = threading.Lock()
+
+    def __shared(self, currency: Currency) -> Optional[PortfolioCurrency]:
+        created_at, pc = self.__currencies.get(currency, (None, None))
+        if created_at is None or time.time() - created_at >= self.ttl_seconds:
+            return None
+        return pc
 
     def new(self, currency: Currency) -> PortfolioCurrency:
-        return PortfolioCurrency(inflation_source=self.inflation_source,
-                                 cbr_currencies_source=self.cbr_currencies_source,
-                                 currency=currency)
+        """
+        Returns the shared instance of `PortfolioCurrency` for the currency
+        """
+        pc = self.__shared(currency)
+        if pc is None:
+            with self.__lock:
+                pc = self.__shared(currency)
+                if pc is None:
+                    pc = PortfolioCurrency(inflation_source=self.inflation_source,
+                                           cbr_currencies_source=self.cbr_currencies_source,
+                                           currency=currency)
+                    self.__currencies[currency] = (time.time(), pc)
+        return pc
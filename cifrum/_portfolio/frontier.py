@@ -0,0 +1,262 @@
+"""
+Mean-variance optimization over the aligned monthly rates of return of the assets.
+
+Weights sum up to 1 and are bounded per asset, long-only by default. The quadratic programs are solved
+by the accelerated projected gradient method, the projection onto the bounded simplex is exact
+"""
+from textwrap import dedent
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from .._portfolio import metrics
+from .._portfolio.portfolio import Portfolio
+
+_tolerance = 1e-10
+_weights_tolerance = 1e-8
+_max_iterations = 20000
+_search_iterations = 60
+_search_log_tolerance = 1e-3
+_mean_tolerance = 1e-9
+
+
+def _project(v: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Euclidean projection of `v` onto `{w: sum(w) == 1, lower <= w <= upper}`
+
+    `sum(clip(v - tau, lower, upper))` is piecewise linear and non-increasing in `tau`,
+    the breakpoints are sorted once and the root is interpolated on its interval
+    """
+    breakpoints = np.concatenate([v - upper, v - lower])
+    # a weight leaves its upper bound at `v - upper` and reaches its lower bound at `v - lower`
+    events = np.concatenate([np.ones(v.size), -np.ones(v.size)])
+    order = np.argsort(breakpoints, kind='mergesort')
+    taus = breakpoints[order]
+    slopes = np.cumsum(events[order])
+    sums = upper.sum() - np.concatenate([[0.], np.cumsum(slopes[:-1] * np.diff(taus))])
+
+    idx = min(int(np.searchsorted(-sums, -1.)), taus.size - 1)
+    if idx == 0:
+        tau = taus[0]
+    else:
+        tau = taus[idx - 1] + (sums[idx - 1] - 1.) / slopes[idx - 1]
+    return np.clip(v - tau, lower, upper)
+
+
+class FrontierPoint:
+    """
+    Weights of the portfolio and its statistics. `cagr` and `risk` have the definitions of `Portfolio`
+    """
+
+    def __init__(self, names: List[str], weights: np.ndarray, ror: np.ndarray):
+        self.names = names
+        self.weights = weights
+        self.mean = ror.mean()
+        self.std = ror.std()
+        self.cagr = metrics.cagr(ror)
+        self.risk = metrics.risk(ror)
+
+    @property
+    def assets_to_weight(self) -> Dict[str, float]:
+        return dict(zip(self.names, self.weights.tolist()))
+
+    def __repr__(self):
+        point_repr = """\
+            FrontierPoint(
+                 cagr: {},
+                 risk: {},
+                 weights: {},
+            )""".format(self.cagr, self.risk,
+                        {name: round(w, 6) for name, w in self.assets_to_weight.items() if abs(w) > 1e-6})
+        return dedent(point_repr)
+
+
+class EfficientFrontier:
+    """
+    Mean-variance optimizer for the assets of the portfolio over the period range of its rates of return.
+    The mean vector and the covariance matrix of monthly rates of return are computed once.
+    Each call starts from the same weights, so the results do not depend on the calls before.
+    With more assets than months the covariance matrix is singular and the solver converges slowly,
+    hundreds of assets take seconds
+    """
+
+    def __init__(self, portfolio: Portfolio,
+                 lower: Union[float, np.ndarray] = 0., upper: Union[float, np.ndarray] = 1.):
+        """
+        :param portfolio: portfolio of the assets, its weights are not used
+        :param lower: lower bound of weights, either for all assets or per asset
+        :param upper: upper bound of weights, either for all assets or per asset
+        """
+        ror_assets = portfolio._assets_return()
+        self.names = [a.symbol.identifier_str for a in portfolio._assets]
+        self.currency = portfolio.currency
+        self.start_period: pd.Period = ror_assets.start_period
+        self.end_period: pd.Period = ror_assets.end_period
+
+        self._ror_assets = ror_assets.values
+        self._lower = np.broadcast_to(np.asarray(lower, dtype=np.float64), (len(self.names),))
+        self._upper = np.broadcast_to(np.asarray(upper, dtype=np.float64), (len(self.names),))
+        if np.any(self._lower > self._upper) or self._lower.sum() > 1. or self._upper.sum() < 1.:
+            raise ValueError('weights bounds are infeasible')
+
+        self.mean = self._ror_assets.mean(axis=1)
+        self.cov = np.cov(self._ror_assets, bias=True)
+        if self.cov.ndim == 0:
+            self.cov = self.cov.reshape(1, 1)
+        # the Lipschitz constant of the gradient is computed once
+        self.__step = .5 / max(np.linalg.eigvalsh(self.cov)[-1], _tolerance)
+        self.__weights_start = _project(np.full(len(self.names), 1. / len(self.names)), self._lower, self._upper)
+        self.__min_variance_weights = None
+        self.__return_weight_max = None
+
+    def __solve(self, return_weight: float, weights_start: np.ndarray) -> np.ndarray:
+        """
+        Minimizes `w' cov w - return_weight * mean' w` starting from `weights_start`
+        """
+        w = weights_start
+        y = w
+        t = 1.
+        for _ in range(_max_iterations):
+            grad = 2. * (self.cov @ y) - return_weight * self.mean
+            w_next = _project(y - self.__step * grad, self._lower, self._upper)
+            if np.max(np.abs(w_next - w)) < _weights_tolerance:
+                w = w_next
+                break
+            if np.dot(y - w_next, w_next - w) > 0.:
+                # the momentum points uphill, restart it
+                t = 1.
+                y = w_next
+            else:
+                t_next = (1. + np.sqrt(1. + 4. * t * t)) / 2.
+                y = w_next + (t - 1.) / t_next * (w_next - w)
+                t = t_next
+            w = w_next
+        return w
+
+    def __max_return_weights(self) -> np.ndarray:
+        w = self._lower.copy()
+        remainder = 1. - w.sum()
+        for idx in np.argsort(-self.mean, kind='mergesort'):
+            w[idx] += min(remainder, self._upper[idx] - self._lower[idx])
+            remainder = 1. - w.sum()
+            if remainder <= 0.:
+                break
+        return w
+
+    def __max_return_weight(self) -> float:
+        """
+        Returns the weight of mean in the objective giving the portfolio of the highest mean
+        """
+        if self.__return_weight_max is None:
+            mean_max = self.mean @ self.__max_return_weights()
+            return_weight = 1e-4
+            w = self.__solve(return_weight, self.__weights_start)
+            while self.mean @ w < mean_max - _tolerance and return_weight < 1e12:
+                return_weight *= 2.
+                w = self.__solve(return_weight, w)
+            self.__return_weight_max = return_weight
+        return self.__return_weight_max
+
+    def __min_variance(self) -> np.ndarray:
+        if self.__min_variance_weights is None:
+            self.__min_variance_weights = self.__solve(0., self.__weights_start)
+        return self.__min_variance_weights
+
+    def __point(self, weights: np.ndarray) -> FrontierPoint:
+        return FrontierPoint(names=self.names, weights=weights.copy(), ror=weights @ self._ror_assets)
+
+    def min_variance(self) -> FrontierPoint:
+        return self.__point(self.__min_variance())
+
+    def target_return(self, mean: float) -> FrontierPoint:
+        """
+        Returns the portfolio of the lowest variance with the monthly arithmetic mean rate of return of `mean`.
+        Targets below the mean of the minimum variance portfolio give the minimum variance portfolio
+
+        :param mean: monthly arithmetic mean rate of return
+        """
+        weights, _ = self.__target_return(mean, self.__weights_start, 0.)
+        return self.__point(weights)
+
+    def __target_return(self, mean: float, weights_start: np.ndarray, return_weight_lo: float):
+        """
+        Bisects the log of the weight of mean in the objective above `return_weight_lo`,
+        each solve starts from the last one
+
+        :returns: the weights and the weight of mean giving them
+        """
+        if mean > self.mean @ self.__max_return_weights() + _tolerance:
+            raise ValueError('target return is not attainable within the weights bounds')
+        if self.mean @ self.__min_variance() >= mean:
+            return self.__min_variance(), 0.
+
+        lo, hi = np.log(max(return_weight_lo, _tolerance)), np.log(self.__max_return_weight())
+        w = weights_start
+        log_return_weight = lo
+        for _ in range(_search_iterations):
+            log_return_weight = (lo + hi) / 2.
+            w = self.__solve(np.exp(log_return_weight), w)
+            achieved = self.mean @ w
+            if abs(achieved - mean) < _mean_tolerance:
+                break
+            if achieved < mean:
+                lo = log_return_weight
+            else:
+                hi = log_return_weight
+        return w, np.exp(log_return_weight)
+
+    def max_sharpe(self, risk_free_rate: float = 0.) -> FrontierPoint:
+        """
+        Returns the portfolio of the highest ratio of monthly mean excess rate of return to monthly std
+
+        :param risk_free_rate: monthly risk-free rate of return
+        """
+        # along the frontier of the weight of mean `t` the ratio grows while `t < 2 var / (mean - risk_free_rate)`,
+        # the root of the difference is searched by the fixed-point iteration safeguarded by bisection of log(t)
+        w = self.__weights_start
+        lo, hi = np.log(_tolerance), np.log(self.__max_return_weight())
+        log_return_weight = hi
+        for _ in range(_search_iterations):
+            w = self.__solve(np.exp(log_return_weight), w)
+            excess_mean = self.mean @ w - risk_free_rate
+            variance = max(w @ self.cov @ w, 0.)
+            if excess_mean <= 0.:
+                lo, log_return_weight_next = log_return_weight, (log_return_weight + hi) / 2.
+            else:
+                log_return_weight_next = np.log(max(2. * variance / excess_mean, _tolerance))
+                if log_return_weight_next > log_return_weight:
+                    lo = log_return_weight
+                else:
+                    hi = log_return_weight
+            if min(hi - lo, abs(log_return_weight_next - log_return_weight)) < _search_log_tolerance:
+                break
+            if not lo < log_return_weight_next < hi:
+                log_return_weight_next = (lo + hi) / 2.
+            log_return_weight = log_return_weight_next
+        return self.__point(w)
+
+    def frontier(self, points: int = 20) -> List[FrontierPoint]:
+        """
+        Returns portfolios from the minimum variance one to the one of the highest mean,
+        with evenly spaced monthly means
+        """
+        mean_min = self.mean @ self.__min_variance()
+        mean_max = self.mean @ self.__max_return_weights()
+        frontier_points = []
+        # the weight of mean grows with the target, so each target starts from the previous solution
+        w, return_weight = self.__weights_start, 0.
+        for mean in np.linspace(mean_min, mean_max, num=points):
+            w, return_weight = self.__target_return(mean, w, return_weight)
+            frontier_points.append(self.__point(w))
+        return frontier_points
+
+    def __repr__(self):
+        frontier_repr = """\
+            EfficientFrontier(
+                 assets: {},
+                 currency: {},
+                 start_period: {},
+                 end_period: {},
+            )""".format(', '.join(self.names), self.currency, self.start_period, self.end_period)
+        return dedent(frontier_repr)
@@ -0,0 +1,220 @@
+"""
+Statistics of monthly rates of return given as numpy arrays, a row per portfolio, or as `TimeSeries`.
+`Portfolio`, `PortfolioAsset` and the batch computations share the definitions
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .._settings import _MONTHS_PER_YEAR
+from ..common.time_series import TimeSeries
+
+_pairwise_chunk_rows = 256
+
+
+def cumulative(ror: np.ndarray) -> np.ndarray:
+    return np.cumprod(ror + 1., axis=-1) - 1.
+
+
+def cagr(ror: np.ndarray, inflation: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    :param ror: monthly rates of return over the last axis
+    :param inflation: monthly inflation over the same periods, computes real CAGR if given
+    """
+    years_total = ror.shape[-1] / _MONTHS_PER_YEAR
+    ror_cagr = np.prod(ror + 1., axis=-1) ** (1 / years_total) - 1.
+    if inflation is not None:
+        inflation_cumulative = np.prod(inflation + 1.) - 1.
+        ror_cagr = (ror_cagr + 1.) / (inflation_cumulative + 1.) ** (1 / years_total) - 1.
+    return ror_cagr
+
+
+def risk(ror: np.ndarray, period='year') -> np.ndarray:
+    """
+    :param ror: monthly rates of return over the last axis
+    :param period:
+        month - returns monthly risk
+
+        year - returns risk approximated to yearly value
+    """
+    if period == 'year' and ror.shape[-1] < _MONTHS_PER_YEAR:
+        raise Exception('year risk is requested for less than 12 months')
+    return _risk_from_moments(ror.mean(axis=-1), ror.var(axis=-1), period=period)
+
+
+def series_risk(ror: TimeSeries, period='year') -> TimeSeries:
+    """
+    Returns risk of monthly rates of return as the reduced value, see `risk`
+    """
+    return ror.reduce(lambda values: risk(values, period=period))
+
+
+def series_cagr(ror: TimeSeries, years_ago=None, inflation: Optional[TimeSeries] = None):
+    """
+    Returns CAGR of monthly rates of return as the reduced value
+
+    :param years_ago:
+        None - CAGR over the whole period range
+
+        int - CAGR over the last years, over the whole period range if it is shorter
+
+        list - mapping from each count of years to CAGR over the last years, computed in one pass
+    :param inflation: monthly inflation over the period range of `ror`, computes real CAGR if given
+    """
+    if years_ago is None or isinstance(years_ago, int):
+        return _series_cagr_horizons(ror, [years_ago], inflation)[years_ago]
+    elif isinstance(years_ago, list):
+        return _series_cagr_horizons(ror, years_ago, inflation)
+    else:
+        raise Exception('unexpected type of `years_ago`: {}'.format(years_ago))
+
+
+def _series_cagr_horizons(ror: TimeSeries, horizons: List[Optional[int]],
+                          inflation: Optional[TimeSeries]) -> Dict[Optional[int], TimeSeries]:
+    """
+    Computes CAGR over the last years for every horizon from prefix sums of log growth
+    """
+    log_growth = _prefix_sums(np.log1p(ror.values))
+    if inflation is not None:
+        inflation_log_growth = _prefix_sums(np.log1p(inflation.values))
+        inflation_offset = (inflation.start_period - ror.start_period).n
+
+    cagr_horizons: Dict[Optional[int], TimeSeries] = {}
+    for years_ago in horizons:
+        months_count = ror.period_size
+        if years_ago is not None and ror.period_size >= years_ago * _MONTHS_PER_YEAR:
+            months_count = years_ago * _MONTHS_PER_YEAR
+        years_total = months_count / _MONTHS_PER_YEAR
+        idx_start = ror.size - months_count
+
+        log_growth_total = log_growth[-1] - log_growth[idx_start]
+        if inflation is not None:
+            inflation_idx_start = max(0, idx_start - inflation_offset)
+            if inflation_idx_start >= inflation.size:
+                raise ValueError('inflation values are not available for the period range')
+            log_growth_total -= inflation_log_growth[-1] - inflation_log_growth[inflation_idx_start]
+        cagr_value = np.expm1(log_growth_total / years_total)
+        cagr_horizons[years_ago] = ror[idx_start:].reduce(lambda _: cagr_value)
+    return cagr_horizons
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+    return np.concatenate([[0.], np.cumsum(values)])
+
+
+def _window_sums(prefix_sums: np.ndarray, starts: np.ndarray, months: np.ndarray) -> np.ndarray:
+    return prefix_sums[starts + months] - prefix_sums[starts]
+
+
+def _risk_from_moments(ror_mean: np.ndarray, ror_var: np.ndarray, period: str) -> np.ndarray:
+    risk_monthly = np.sqrt(np.maximum(ror_var, 0.))
+    if period == 'month':
+        return risk_monthly
+    elif period == 'year':
+        mean = ror_mean + 1.
+        return np.sqrt((risk_monthly ** 2 + mean ** 2) ** 12 - mean ** 24)
+    else:
+        raise Exception('unexpected value of `period` {}'.format(period))
+
+
+def windows(ror: np.ndarray, starts: np.ndarray, months: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Computes the metric over the windows of `ror` from prefix sums, for any count of windows in O(1) each
+
+    :param ror: 1-dimensional monthly rates of return
+    :param starts: index of the first month of each window
+    :param months: length of each window in months, broadcast with `starts`
+    :param metric:
+        cagr - CAGR
+
+        cumulative - cumulative rate of return
+
+        risk - yearly risk
+    """
+    if metric in ['cagr', 'cumulative']:
+        log_growth = _window_sums(_prefix_sums(np.log1p(ror)), starts, months)
+        if metric == 'cagr':
+            return np.expm1(log_growth * _MONTHS_PER_YEAR / months)
+        return np.expm1(log_growth)
+    elif metric == 'risk':
+        ror_mean = _window_sums(_prefix_sums(ror), starts, months) / months
+        ror_var = _window_sums(_prefix_sums(ror ** 2), starts, months) / months - ror_mean ** 2
+        return _risk_from_moments(ror_mean, ror_var, period='year')
+    else:
+        raise ValueError('unexpected value of `metric` {}'.format(metric))
+
+
+def masked(ror: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Computes the metric per row over the months that are not NaN
+
+    :param ror: (assets, months) monthly rates of return, NaN out of the period range of an asset
+    :param metric:
+        cagr - CAGR
+
+        risk - yearly risk
+
+        max_drawdown - the largest relative decline of wealth from its running maximum
+
+        months - count of months
+    """
+    valid = ~np.isnan(ror)
+    months = valid.sum(axis=-1)
+    if metric == 'months':
+        return months
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if metric == 'cagr':
+            return np.expm1(np.nansum(np.log1p(ror), axis=-1) * _MONTHS_PER_YEAR / months)
+        elif metric == 'risk':
+            ror_mean = np.nansum(ror, axis=-1) / months
+            ror_var = np.nansum(ror ** 2, axis=-1) / months - ror_mean ** 2
+            return _risk_from_moments(ror_mean, ror_var, period='year')
+        elif metric == 'max_drawdown':
+            log_wealth = np.cumsum(np.where(valid, np.log1p(ror), 0.), axis=-1)
+            log_wealth_max = np.maximum.accumulate(np.maximum(log_wealth, 0.), axis=-1)
+            return -np.expm1(log_wealth - log_wealth_max).min(axis=-1)
+        else:
+            raise ValueError('unexpected value of `metric` {}'.format(metric))
+
+
+def pairwise(ror: np.ndarray, kind: str = 'corr', min_periods: int = 2,
+             chunk_rows: int = _pairwise_chunk_rows) -> np.ndarray:
+    """
+    Computes covariance or correlation of every pair of rows over the months when both of them are not NaN.
+    The sums over the common months are matrix products of the rows of a chunk with all the following rows,
+    so memory besides the result is bounded by `chunk_rows`
+
+    :param ror: (assets, months) monthly rates of return, NaN out of the period range of an asset
+    :param kind:
+        cov - covariance
+
+        corr - correlation
+    :param min_periods: pairs having fewer common months are NaN
+    """
+    if kind not in ['cov', 'corr']:
+        raise ValueError('unexpected value of `kind` {}'.format(kind))
+    valid = ~np.isnan(ror)
+    mask = valid.astype(np.float64)
+    x = np.where(valid, ror, 0.)
+
+    n = ror.shape[0]
+    result = np.empty((n, n))
+    for start in range(0, n, chunk_rows):
+        rows, cols = slice(start, start + chunk_rows), slice(start, n)
+        count = mask[rows] @ mask[cols].T
+        sum_x = x[rows] @ mask[cols].T
+        sum_y = mask[rows] @ x[cols].T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block = (x[rows] @ x[cols].T - sum_x * sum_y / count) / (count - 1.)
+            if kind == 'corr':
+                var_x = ((x[rows] ** 2) @ mask[cols].T - sum_x ** 2 / count) / (count - 1.)
+                var_y = (mask[rows] @ (x[cols] ** 2).T - sum_y ** 2 / count) / (count - 1.)
+                block = np.clip(block / np.sqrt(var_x * var_y), -1., 1.)
+        block[count < max(min_periods, 2)] = np.nan
+        # the square of the chunk rows is made exactly symmetric, the rest is mirrored
+        rows_count = count.shape[0]
+        block[:, :rows_count] = (block[:, :rows_count] + block[:, :rows_count].T) / 2.
+        result[rows, cols] = block
+        result[start + rows_count:, rows] = block[:, rows_count:].T
+    return result
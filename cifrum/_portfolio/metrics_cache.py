@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ..common.time_series import TimeSeries
+
+
+def _shared(value):
+    # cached series are handed out as views, so that item assignment by the caller copies the values
+    if isinstance(value, TimeSeries):
+        return value.view()
+    if isinstance(value, dict):
+        return {k: _shared(v) for k, v in value.items()}
+    return value
+
+
+class MetricsCache:
+    """
+    Per-instance cache of metrics of a portfolio or an asset, keyed by `(metric, kind, real, horizon)`.
+    The instances do not change after construction, `clear` drops the results otherwise
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        :param max_entries: the least recently used results are dropped above it, unbounded by default
+        """
+        self.max_entries = max_entries
+        self.__values: Dict[Hashable, Any] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]):
+        """
+        Returns the cached result for the `key`, the `compute` is called on cache miss
+        """
+        with self.__lock:
+            if key in self.__values:
+                self.__hits += 1
+                self.__values.move_to_end(key)
+                return _shared(self.__values[key])
+            self.__misses += 1
+
+        value = compute()
+        with self.__lock:
+            self.__values[key] = value
+            self.__values.move_to_end(key)
+            while self.max_entries is not None and len(self.__values) > self.max_entries:
+                self.__values.popitem(last=False)
+        return _shared(value)
+
+    def clear(self):
+        with self.__lock:
+            self.__values.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'entries': len(self.__values),
+            }
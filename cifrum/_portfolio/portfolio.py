@@ -8,12 +8,16 @@ import numpy as np
 import pandas as pd
 from contracts import contract
 
+from .._portfolio import metrics
+from .._portfolio.simulation import SimulationResult, simulate
 from .._portfolio.currency import PortfolioCurrency, PortfolioCurrencyFactory
+from .._portfolio.metrics_cache import MetricsCache
 from .._settings import _MONTHS_PER_YEAR
 from .._sources.registries import CurrencySymbolsRegistry
 from ..common.enums import Currency, Period
 from ..common.financial_symbol import FinancialSymbol
 from ..common.time_series import TimeSeries, TimeSeriesKind
+from ..common.time_series_frame import TimeSeriesFrame
 
 
 class PortfolioAsset:
@@ -34,6 +38,7 @@ class PortfolioAsset:
         self.currency_symbols_registry = currency_symbols_registry
         self._portfolio = portfolio
         self._weight = weight
+        self.metrics_cache = MetricsCache()
 
         datetime_now = dtm.datetime.now()
         if (datetime_now + dtm.timedelta(days=1)).month == datetime_now.month:
@@ -69,17 +74,22 @@ class PortfolioAsset:
         return self._weight
 
     def __transform_values_according_to_period(self):
-        vals = self.symbol.values(start_period=self._period_min, end_period=self._period_max)
-        if len(vals['period']) > 0:
-            self._period_min = max(self._period_min, vals['period'].min())
-            self._period_max = min(self._period_max, vals['period'].max())
+        vals_period_start, vals = self.symbol.monthly_values(start_period=self._period_min,
+                                                             end_period=self._period_max)
+        gaps = np.flatnonzero(np.isnan(vals))
+        if gaps.size > 0:
+            raise ValueError('values of {} are missing for {}'.format(self.symbol.identifier_str,
+                                                                      vals_period_start + int(gaps[0])))
+        if len(vals) > 0:
+            self._period_min = max(self._period_min, vals_period_start)
+            self._period_max = min(self._period_max, vals_period_start + len(vals) - 1)
         # TODO: okama_dev-98
         if self.symbol.period == Period.DECADE:
-            ts = TimeSeries(values=vals['rate'].values,
+            ts = TimeSeries(values=vals,
                             start_period=self._period_min, end_period=self._period_max,
                             kind=TimeSeriesKind.DIFF)
         else:
-            ts = TimeSeries(values=vals['close'].values,
+            ts = TimeSeries(values=vals,
                             start_period=self._period_min, end_period=self._period_max,
                             kind=TimeSeriesKind.VALUES)
         currency_conversion_rate = self.__currency_conversion_rate(currency_to=self.currency.value)
@@ -88,24 +98,47 @@ class PortfolioAsset:
 
     def __currency_conversion_rate(self, currency_to: Currency):
         currency_from = self.symbol.currency
-        currency_rate = self.currency_symbols_registry \
-            .convert(currency_from=currency_from,
-                     currency_to=currency_to,
-                     start_period=self._period_min,
-                     end_period=self._period_max)
-        currency_rate = TimeSeries(values=currency_rate['close'].values,
-                                   start_period=currency_rate['period'].min(),
-                                   end_period=currency_rate['period'].max(),
-                                   kind=TimeSeriesKind.CURRENCY_RATE)
-        return currency_rate
+        return self.currency_symbols_registry.rate(currency_from=currency_from,
+                                                   currency_to=currency_to,
+                                                   start_period=self._period_min,
+                                                   end_period=self._period_max)
 
     def close(self):
-        return copy.deepcopy(self.__values)
+        return self.__values.view()
+
+    def _with_period_range(self, start_period: pd.Period, end_period: pd.Period,
+                           portfolio: Optional['Portfolio'], weight: Optional[int]) -> 'PortfolioAsset':
+        """
+        Returns the asset narrowed to the period range that is within the one of the asset.
+        The values are not fetched and converted again, but shared with this asset
+        """
+        if (end_period - start_period).n < 2:
+            raise ValueError('period range should be at least 2 months')
+        if start_period < self._period_min or end_period > self._period_max:
+            raise ValueError('period range should be within the one of the asset')
+
+        asset = copy.copy(self)
+        asset._portfolio = portfolio
+        asset._weight = weight
+        asset.metrics_cache = MetricsCache()
+        asset._period_min = start_period
+        asset._period_max = end_period
+        offset = (start_period - self.__values.start_period).n
+        asset.__values = self.__values[offset:offset + (end_period - start_period).n + 1]
+        return asset
+
+    def invalidate_metrics(self):
+        """
+        Drops the cached metrics of the asset
+        """
+        self.metrics_cache.clear()
 
     def get_return(self, kind='values', real=False):
         if kind not in ['values', 'cumulative', 'ytd']:
             raise ValueError('`kind` is not in expected values')
+        return self.metrics_cache.get(('get_return', kind, real, None), lambda: self.__get_return(kind, real))
 
+    def __get_return(self, kind: str, real: bool):
         if kind == 'ytd':
             ror = self.get_return(kind='values', real=real)
             ror_ytd = ror.ytd()
@@ -131,24 +164,30 @@ class PortfolioAsset:
 
             year - returns risk approximated to yearly value
         """
-        p = self.portfolio_items_factory.new_portfolio(assets_to_weight={self: 1.},
-                                                       start_period=self._period_min,
-                                                       end_period=self._period_max,
-                                                       currency=self.currency.value)
-        return p.risk(period=period)
+        return self.metrics_cache.get(('risk', period, False, None), lambda: self.__risk(period))
+
+    def __risk(self, period: str):
+        return metrics.series_risk(self.get_return(), period=period)
 
     @contract(
         years_ago='int,>0|None|list[int,>0]',
         real='bool',
     )
     def cagr(self, years_ago=None, real=False):
-        p = self.portfolio_items_factory.new_portfolio(assets_to_weight={self: 1.},
-                                                       start_period=self._period_min,
-                                                       end_period=self._period_max,
-                                                       currency=self.currency.value)
-        return p.cagr(years_ago=years_ago, real=real)
+        horizon = tuple(years_ago) if isinstance(years_ago, list) else years_ago
+        return self.metrics_cache.get(('cagr', None, real, horizon), lambda: self.__cagr(years_ago, real))
+
+    def __cagr(self, years_ago, real: bool):
+        ror = self.get_return()
+        inflation = self.currency.inflation(kind='values', start_period=ror.start_period, end_period=ror.end_period) \
+            if real else None
+        return metrics.series_cagr(ror, years_ago=years_ago, inflation=inflation)
 
     def inflation(self, kind: str, years_ago: int = None):
+        return self.metrics_cache.get(('inflation', kind, False, years_ago),
+                                      lambda: self.__inflation(kind, years_ago))
+
+    def __inflation(self, kind: str, years_ago: Optional[int]):
         ror = self.get_return()
         start_period = None if years_ago else ror.start_period
         return self.currency.inflation(kind=kind,
@@ -185,6 +224,7 @@ class Portfolio:
 
         self.weights = weights
         self.currency = currency
+        self.metrics_cache = MetricsCache()
         self._period_min = max(
             self.currency.period_min,
             *[a._period_min for a in assets],
@@ -196,12 +236,18 @@ class Portfolio:
             end_period,
         )
 
-        self._assets = [portfolio_items_factory.new_asset(symbol=a.symbol,
-                                                          start_period=self._period_min,
-                                                          end_period=self._period_max,
-                                                          currency=currency.value,
-                                                          portfolio=self,
-                                                          weight=w) for a, w in zip(assets, weights)]
+        def portfolio_asset(a: PortfolioAsset, w) -> PortfolioAsset:
+            if a.currency.value == currency.value:
+                return a._with_period_range(start_period=self._period_min, end_period=self._period_max,
+                                            portfolio=self, weight=w)
+            return portfolio_items_factory.new_asset(symbol=a.symbol,
+                                                     start_period=self._period_min,
+                                                     end_period=self._period_max,
+                                                     currency=currency.value,
+                                                     portfolio=self,
+                                                     weight=w)
+
+        self._assets = [portfolio_asset(a, w) for a, w in zip(assets, weights)]
         assert(len(self._assets) > 0)
 
     @property
@@ -209,6 +255,12 @@ class Portfolio:
         assets_dict = {a.symbol.identifier_str: a for a in self._assets}
         return assets_dict
 
+    def invalidate_metrics(self):
+        """
+        Drops the cached metrics of the portfolio, e.g. once `weights` are changed
+        """
+        self.metrics_cache.clear()
+
     def risk(self, period='year'):
         """
         Returns risk of the asset
@@ -218,66 +270,111 @@ class Portfolio:
 
             year - returns risk approximated to yearly value
         """
-        if period == 'month':
-            ror = self.get_return()
-            return ror.std()
-        elif period == 'year':
-            ror = self.get_return()
-            if ror.period_size < 12:
-                raise Exception('year risk is requested for less than 12 months')
-
-            mean = (1. + ror).mean()
-            risk_monthly = self.risk(period='month')
-            risk_yearly = ((risk_monthly ** 2 + mean ** 2) ** 12 - mean ** 24).sqrt()
-            return risk_yearly
-        else:
-            raise Exception('unexpected value of `period` {}'.format(period))
+        return self.metrics_cache.get(('risk', period, False, None), lambda: self.__risk(period))
+
+    def __risk(self, period: str):
+        return metrics.series_risk(self.get_return(), period=period)
 
     @contract(
         years_ago='int,>0|None|list[int,>0]',
         real='bool',
     )
     def cagr(self, years_ago=None, real=False):
-        if years_ago is None:
-            ror = self.get_return()
-            years_total = ror.period_size / _MONTHS_PER_YEAR
-            ror_c = (ror + 1.).prod()
-            cagr = ror_c ** (1 / years_total) - 1.
-            if real:
-                inflation_cumulative = self.inflation(kind='cumulative')
-                cagr = (cagr + 1.) / (inflation_cumulative + 1.) ** (1 / years_total) - 1.
-            return cagr
-        elif isinstance(years_ago, int):
-            ror = self.get_return()
-            months_count = years_ago * _MONTHS_PER_YEAR
-            if ror.period_size < months_count:
-                return self.cagr(years_ago=None, real=real)
-
-            ror_slice = self.get_return()[-months_count:]
-            ror_slice_c = (ror_slice + 1.).prod()
-            cagr = ror_slice_c ** (1 / years_ago) - 1.
-            if real:
-                inflation_cumulative = self.inflation(kind='cumulative',
-                                                      years_ago=years_ago)
-                cagr = (cagr + 1.) / (inflation_cumulative + 1.) ** (1 / years_ago) - 1.
-            return cagr
-        else:
-            raise Exception('unexpected type of `years_ago`: {}'.format(years_ago))
+        """
+        Returns CAGR of the portfolio
+
+        :param years_ago:
+            None - CAGR over the whole period range
+
+            int - CAGR over the last years, over the whole period range if it is shorter
+
+            list - mapping from each count of years to CAGR over the last years, computed in one pass
+        :param real: adjusts CAGR by inflation
+        """
+        horizon = tuple(years_ago) if isinstance(years_ago, list) else years_ago
+        return self.metrics_cache.get(('cagr', None, real, horizon), lambda: self.__cagr(years_ago, real))
+
+    def __cagr(self, years_ago, real: bool):
+        ror = self.get_return()
+        inflation = self.currency.inflation(kind='values', start_period=ror.start_period, end_period=ror.end_period) \
+            if real else None
+        return metrics.series_cagr(ror, years_ago=years_ago, inflation=inflation)
+
+    def rolling(self, window_months: int, metric='cagr', real=False) -> TimeSeries:
+        """
+        Computes the metric over every window of the period range at once
+
+        :param window_months: length of windows in months
+        :param metric:
+            cagr - CAGR
+
+            cumulative - cumulative rate of return
+
+            risk - yearly risk
+        :param real: uses the rates of return adjusted by inflation
+        :returns: values of the metric by the last period of the window
+        """
+        ror = self.get_return(real=real)
+        if not 0 < window_months <= ror.size:
+            raise ValueError('window should be within the period range')
+        windows_count = ror.size - window_months + 1
+        values = metrics.windows(ror.values, starts=np.arange(windows_count), months=window_months, metric=metric)
+        return TimeSeries(values=values,
+                          start_period=ror.start_period + window_months - 1, end_period=ror.end_period,
+                          kind=TimeSeriesKind.VALUES)
+
+    def heatmap(self, metric='cagr', real=False) -> pd.DataFrame:
+        """
+        Computes the metric for every start period and every whole count of years at once
+
+        :param metric: see `rolling`
+        :param real: uses the rates of return adjusted by inflation
+        :returns: frame with a row per start period and a column per count of years,
+            NaN for the windows beyond the period range
+        """
+        ror = self.get_return(real=real)
+        years = np.arange(1, ror.size // _MONTHS_PER_YEAR + 1)
+        if years.size == 0:
+            raise ValueError('period range should be at least 1 year')
+        starts = np.arange(ror.size)[:, np.newaxis]
+        months = years[np.newaxis, :] * _MONTHS_PER_YEAR
+        valid = starts + months <= ror.size
+        values = metrics.windows(ror.values, starts=np.where(valid, starts, 0), months=months, metric=metric)
+        return pd.DataFrame(np.where(valid, values, np.nan),
+                            index=pd.PeriodIndex(ror.period_range(), freq='M'),
+                            columns=years)
+
+    def _assets_return(self) -> TimeSeriesFrame:
+        """
+        Returns rates of return of the assets, a row per asset in the order of weights
+        """
+        closes = [a.close() for a in self._assets]
+        if len({c.kind for c in closes}) == 1:
+            return TimeSeriesFrame.from_series(closes).pct_change()
+        return TimeSeriesFrame.from_series([c.pct_change() for c in closes])
 
     def get_return(self, kind='values', real=False) -> TimeSeries:
         if kind not in ['values', 'cumulative', 'ytd']:
             raise ValueError('`kind` is not in expected values')
+        return self.metrics_cache.get(('get_return', kind, real, None), lambda: self.__get_return(kind, real))
+
+    def __get_return(self, kind: str, real: bool) -> TimeSeries:
+        ror_assets = self._assets_return()
 
         if kind == 'ytd':
-            ror_assets = np.array([a.get_return(kind=kind, real=real) for a in self._assets])
-            ror = (ror_assets * self.weights).sum()
-            return ror
+            if real:
+                inflation = self.currency.inflation(kind='values',
+                                                    start_period=ror_assets.start_period,
+                                                    end_period=ror_assets.end_period)
+                ror_assets = (ror_assets + 1.) / (inflation + 1.) - 1.
+            return ror_assets.ytd().dot(self.weights)
 
-        ror_assets = np.array([a.get_return() for a in self._assets])
-        ror = (ror_assets * self.weights).sum()
+        ror = ror_assets.dot(self.weights)
 
         if real:
-            inflation = self.inflation(kind='values')
+            inflation = self.currency.inflation(kind='values',
+                                                start_period=ror.start_period,
+                                                end_period=ror.end_period)
             ror = (ror + 1.) / (inflation + 1.) - 1.
 
         if kind == 'cumulative':
@@ -286,6 +383,10 @@ class Portfolio:
         return ror
 
     def inflation(self, kind: str, years_ago: int = None):
+        return self.metrics_cache.get(('inflation', kind, False, years_ago),
+                                      lambda: self.__inflation(kind, years_ago))
+
+    def __inflation(self, kind: str, years_ago: Optional[int]):
         ror = self.get_return()
         start_period = None if years_ago else ror.start_period
         return self.currency.inflation(kind=kind,
@@ -293,6 +394,26 @@ class Portfolio:
                                        end_period=ror.end_period,
                                        years_ago=years_ago)
 
+    def simulate(self, n_paths: int, horizon_months: int, method='bootstrap', real=False,
+                 seed=0, percentiles=(5, 25, 50, 75, 95), max_workers: int = None) -> SimulationResult:
+        """
+        Simulates wealth paths of the portfolio from its historical monthly rates of return
+
+        :param n_paths: count of paths
+        :param horizon_months: length of paths in months
+        :param method:
+            bootstrap - monthly rates of return are drawn from the historical ones with replacement
+
+            parametric - monthly growth is log-normal with the mean and std of the historical log growth
+        :param real: simulates from the rates of return adjusted by inflation
+        :param seed: the results are the same for the same seed
+        :param max_workers: processes to run the paths in, `CIFRUM_SIMULATION_WORKERS` by default,
+            the paths are simulated in this process for 1
+        :returns: percentile bands of wealth, CAGR and max drawdown
+        """
+        return simulate(self.get_return(real=real).values, paths_count=n_paths, horizon_months=horizon_months,
+                        method=method, seed=seed, percentiles=percentiles, max_workers=max_workers)
+
     def __repr__(self):
         assets_repr = ', '.join(asset.symbol.identifier.__repr__() for asset in self._assets)
         portfolio_repr = """\
@@ -303,6 +424,77 @@ class Portfolio:
         return dedent(portfolio_repr)
 
 
+class PortfolioBatch:
+    """
+    Many portfolios over the same assets, currency and period range, a row of `weights` per portfolio.
+    Rates of return of the assets are aligned once, the statistics of all portfolios are computed together
+    """
+
+    def __init__(self, portfolio: Portfolio, weights: np.ndarray):
+        """
+        :param portfolio: portfolio of the assets, its weights are not used
+        :param weights: (portfolios, assets) matrix, the columns are in the order of the portfolio assets
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 2 or weights.shape[1] != len(portfolio._assets):
+            raise ValueError('weights should be (portfolios, assets) matrix')
+
+        self.weights = weights
+        self.currency = portfolio.currency
+        self._portfolio = portfolio
+        self.__ror_assets = portfolio._assets_return()
+
+    @property
+    def assets(self) -> Dict[str, PortfolioAsset]:
+        return self._portfolio.assets
+
+    @property
+    def start_period(self) -> pd.Period:
+        return self.__ror_assets.start_period
+
+    @property
+    def end_period(self) -> pd.Period:
+        return self.__ror_assets.end_period
+
+    def __len__(self):
+        return self.weights.shape[0]
+
+    def __inflation_values(self) -> np.ndarray:
+        return self.currency.inflation(kind='values',
+                                       start_period=self.start_period,
+                                       end_period=self.end_period).values
+
+    def get_return(self, kind='values', real=False) -> np.ndarray:
+        """
+        :returns: (portfolios, periods) matrix of monthly rates of return
+        """
+        if kind not in ['values', 'cumulative']:
+            raise ValueError('`kind` is not in expected values')
+
+        ror = self.weights @ self.__ror_assets.values
+        if real:
+            ror = (ror + 1.) / (self.__inflation_values() + 1.) - 1.
+        if kind == 'cumulative':
+            ror = metrics.cumulative(ror)
+        return ror
+
+    def risk(self, period='year') -> np.ndarray:
+        return metrics.risk(self.get_return(), period=period)
+
+    def cagr(self, real=False) -> np.ndarray:
+        inflation = self.__inflation_values() if real else None
+        return metrics.cagr(self.get_return(), inflation=inflation)
+
+    def __repr__(self):
+        batch_repr = """\
+            PortfolioBatch(
+                 assets: {},
+                 portfolios: {},
+                 currency: {},
+            )""".format(', '.join(self.assets.keys()), len(self), self.currency)
+        return dedent(batch_repr)
+
+
 class PortfolioItemsFactory:
 
     def __init__(self, portfolio_currency_factory: PortfolioCurrencyFactory,
@@ -335,3 +527,13 @@ class PortfolioItemsFactory:
                       start_period=start_period, end_period=end_period,
                       currency=pc)
         return p
+
+    def new_portfolio_batch(self,
+                            assets: List[PortfolioAsset],
+                            weights: np.ndarray,
+                            start_period: pd.Period, end_period: pd.Period,
+                            currency: Currency) -> PortfolioBatch:
+        p = self.new_portfolio(assets_to_weight={a: 1. / len(assets) for a in assets},
+                               start_period=start_period, end_period=end_period,
+                               currency=currency)
+        return PortfolioBatch(portfolio=p, weights=weights)
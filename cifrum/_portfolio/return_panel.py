@@ -0,0 +1,82 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .._portfolio import metrics
+from .._portfolio.portfolio import PortfolioAsset
+
+
+class ReturnPanel:
+    """
+    Monthly rates of return of many assets over the union of their period ranges, a row per asset.
+    The months out of the period range of an asset are NaN
+    """
+
+    def __init__(self, names: List[str], values: np.ndarray, start_period: pd.Period):
+        if values.ndim != 2 or values.shape[0] != len(names):
+            raise ValueError('values should be (assets, months) matrix')
+        self.names = names
+        self.values = values
+        self.start_period = start_period
+
+    @classmethod
+    def from_assets(cls, assets: List[PortfolioAsset], names: List[str] = None) -> 'ReturnPanel':
+        """
+        :param names: names of the rows, the identifiers of the assets by default
+        """
+        if len(assets) == 0:
+            raise ValueError('at least one asset is expected')
+        rors = [a.get_return() for a in assets]
+        start_period = min(ror.start_period for ror in rors)
+        end_period = max(ror.end_period for ror in rors)
+
+        values = np.full((len(rors), (end_period - start_period).n + 1), np.nan)
+        for row, ror in zip(values, rors):
+            offset = (ror.start_period - start_period).n
+            row[offset:offset + ror.size] = ror.values
+        if names is None:
+            names = [a.symbol.identifier_str for a in assets]
+        return cls(names=names, values=values, start_period=start_period)
+
+    @property
+    def end_period(self) -> pd.Period:
+        return self.start_period + self.values.shape[1] - 1
+
+    def period_range(self) -> List[pd.Period]:
+        return list(pd.period_range(self.start_period, periods=self.values.shape[1], freq='M'))
+
+    def __len__(self):
+        return len(self.names)
+
+    def observations(self) -> np.ndarray:
+        """
+        Returns the count of months with values per asset
+        """
+        return (~np.isnan(self.values)).sum(axis=1)
+
+    def window(self, start_period: pd.Period, end_period: pd.Period) -> 'ReturnPanel':
+        """
+        Returns the panel narrowed to the period range, sharing the values
+        """
+        start_period = max(start_period, self.start_period)
+        end_period = min(end_period, self.end_period)
+        if start_period > end_period:
+            raise ValueError('period range is out of the panel')
+        offset = (start_period - self.start_period).n
+        return ReturnPanel(names=self.names,
+                           values=self.values[:, offset:offset + (end_period - start_period).n + 1],
+                           start_period=start_period)
+
+    def pairwise(self, kind: str = 'corr', min_periods: int = 2) -> pd.DataFrame:
+        """
+        Returns covariance or correlation of monthly rates of return of the assets over pairwise-complete months,
+        see `metrics.pairwise`
+        """
+        return pd.DataFrame(metrics.pairwise(self.values, kind=kind, min_periods=min_periods),
+                            index=self.names, columns=self.names)
+
+    def __repr__(self):
+        return 'ReturnPanel(assets={}, start_period={}, end_period={})'.format(
+            len(self), self.start_period, self.end_period
+        )
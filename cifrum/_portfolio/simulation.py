@@ -0,0 +1,115 @@
+"""
+Monte Carlo simulation of the wealth of a portfolio from its monthly rates of return.
+
+Paths are generated in chunks of a fixed size, the random state of a chunk is seeded by `[seed, chunk index]`.
+So the results depend on the seed only, whether the chunks run in this process or in a process pool.
+The chunks run in this process by default: the percentiles need the wealth of every path,
+so a process pool sends all of it back and pays off only when generating the paths dominates
+"""
+from concurrent.futures import ProcessPoolExecutor
+from textwrap import dedent
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .._settings import _MONTHS_PER_YEAR, simulation_workers
+
+_paths_per_chunk = 10000
+
+
+def _paths_ror(ror: np.ndarray, paths_count: int, horizon_months: int, method: str,
+               random_state: np.random.RandomState) -> np.ndarray:
+    if method == 'bootstrap':
+        return ror[random_state.randint(0, ror.size, size=(paths_count, horizon_months))]
+    elif method == 'parametric':
+        # log-normal monthly growth with the moments of the historical log growth
+        log_growth = np.log1p(ror)
+        return np.expm1(random_state.normal(log_growth.mean(), log_growth.std(), size=(paths_count, horizon_months)))
+    else:
+        raise ValueError('unexpected value of `method` {}'.format(method))
+
+
+def _simulate_chunk(ror: np.ndarray, paths_count: int, horizon_months: int, method: str,
+                    seed: int, chunk_idx: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :returns: wealth (paths, months) starting from 1, CAGR and max drawdown per path
+    """
+    random_state = np.random.RandomState([seed, chunk_idx])
+    wealth = np.cumprod(_paths_ror(ror, paths_count, horizon_months, method, random_state) + 1., axis=1)
+    cagr = wealth[:, -1] ** (_MONTHS_PER_YEAR / horizon_months) - 1.
+    wealth_max = np.maximum(np.maximum.accumulate(wealth, axis=1), 1.)
+    max_drawdown = (1. - wealth / wealth_max).max(axis=1)
+    return wealth, cagr, max_drawdown
+
+
+class SimulationResult:
+    """
+    Percentile bands of the simulated paths, a row per percentile
+
+    wealth - (percentiles, months) wealth at the end of each month, the initial wealth is 1
+
+    cagr - CAGR over the horizon
+
+    max_drawdown - the largest relative decline of wealth from its running maximum
+    """
+
+    def __init__(self, percentiles: Sequence[float], paths_count: int,
+                 wealth: np.ndarray, cagr: np.ndarray, max_drawdown: np.ndarray):
+        self.percentiles = list(percentiles)
+        self.paths_count = paths_count
+        self.wealth = wealth
+        self.cagr = cagr
+        self.max_drawdown = max_drawdown
+
+    def __repr__(self):
+        result_repr = """\
+            SimulationResult(
+                 paths: {},
+                 horizon: {} months,
+                 percentiles: {},
+                 cagr: {},
+                 max_drawdown: {},
+            )""".format(self.paths_count, self.wealth.shape[1], self.percentiles, self.cagr, self.max_drawdown)
+        return dedent(result_repr)
+
+
+def simulate(ror: np.ndarray, paths_count: int, horizon_months: int, method: str = 'bootstrap',
+             seed: int = 0, percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+             max_workers: int = None, paths_per_chunk: int = _paths_per_chunk) -> SimulationResult:
+    """
+    :param ror: historical monthly rates of return
+    :param method:
+        bootstrap - monthly rates of return are drawn from the historical ones with replacement
+
+        parametric - monthly growth is log-normal with the mean and std of the historical log growth
+    :param max_workers: processes to run the chunks in, `CIFRUM_SIMULATION_WORKERS` by default,
+        the chunks run in this process for 1
+    """
+    if paths_count <= 0 or horizon_months <= 0:
+        raise ValueError('paths count and horizon should be positive')
+    if method not in ['bootstrap', 'parametric']:
+        raise ValueError('unexpected value of `method` {}'.format(method))
+    ror = np.asarray(ror, dtype=np.float64)
+
+    starts = range(0, paths_count, paths_per_chunk)
+    chunks = [(ror, min(paths_per_chunk, paths_count - start), horizon_months, method, seed, chunk_idx)
+              for chunk_idx, start in enumerate(starts)]
+    # the chunks are stored as they come, not concatenated at the end
+    wealth = np.empty((paths_count, horizon_months))
+    cagr = np.empty(paths_count)
+    max_drawdown = np.empty(paths_count)
+    max_workers = simulation_workers if max_workers is None else max_workers
+    if len(chunks) == 1 or max_workers <= 1:
+        for start, chunk in zip(starts, chunks):
+            paths = slice(start, start + chunk[1])
+            wealth[paths], cagr[paths], max_drawdown[paths] = _simulate_chunk(*chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            for start, chunk, result in zip(starts, chunks, pool.map(_simulate_chunk, *zip(*chunks))):
+                paths = slice(start, start + chunk[1])
+                wealth[paths], cagr[paths], max_drawdown[paths] = result
+
+    return SimulationResult(percentiles=percentiles, paths_count=paths_count,
+                            wealth=np.percentile(wealth, percentiles, axis=0),
+                            cagr=np.percentile(cagr, percentiles),
+                            max_drawdown=np.percentile(max_drawdown, percentiles))
@@ -1,4 +1,5 @@
 import re
+import threading
 from concurrent import futures
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple, Iterator, Dict
@@ -84,6 +85,20 @@ class _Search:
 
         self.id2sym: Dict[str, FinancialSymbol] = {}
 
+        self.__lines_future: Optional[futures.Future] = None
+        self.__lines_future_lock = threading.Lock()
+
+    @property
+    def lines_future(self) -> 'futures.Future[List[str]]':
+        """
+        The search index is built in background on the first access
+        """
+        with self.__lines_future_lock:
+            if self.__lines_future is None:
+                self.__lines_future = self.__build_lines()
+            return self.__lines_future
+
+    def __build_lines(self) -> 'futures.Future[List[str]]':
         pool = ThreadPoolExecutor(3)
 
         us_data_source_lines_fut = pool.submit(self.__handle_us_data_info)
@@ -94,7 +109,9 @@ class _Search:
             result = us_data_source_lines_fut.result() + micex_stocks_lines_fut.result() + mutru_lines_fut.result()
             return result
 
-        self.lines_future: futures.Future[List[str]] = pool.submit(handle_all_lines)
+        lines_future: futures.Future[List[str]] = pool.submit(handle_all_lines)
+        pool.shutdown(wait=False)
+        return lines_future
 
     def _check_finsym_access(self, query: str) -> Optional[FinancialSymbol]:
         namespaces = self.financial_symbols_registry.namespaces()
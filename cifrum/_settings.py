@@ -4,3 +4,15 @@ _MONTHS_PER_YEAR = 12
 
 data_url = os.environ.get('DATA_URL', 'https://okama.io/api/data/')
 change_column_name = 'close_pctchange'
+
+cache_dir = os.environ.get('CIFRUM_CACHE_DIR',
+                           os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'cifrum'))
+cache_ttl_seconds = int(os.environ.get('CIFRUM_CACHE_TTL', 24 * 60 * 60))
+cache_max_bytes = int(os.environ.get('CIFRUM_CACHE_MAX_BYTES', 1024 ** 3))
+series_cache_max_bytes = int(os.environ.get('CIFRUM_SERIES_CACHE_MAX_BYTES', 256 * 1024 ** 2))
+panel_dir = os.environ.get('CIFRUM_PANEL_DIR', os.path.join(cache_dir, 'panels') if cache_dir else '')
+symbol_cache_size = int(os.environ.get('CIFRUM_SYMBOL_CACHE_SIZE', 512))
+resolve_workers = int(os.environ.get('CIFRUM_RESOLVE_WORKERS', 8))
+screen_batch_size = int(os.environ.get('CIFRUM_SCREEN_BATCH_SIZE', 500))
+correlation_cache_size = int(os.environ.get('CIFRUM_CORRELATION_CACHE_SIZE', 16))
+simulation_workers = int(os.environ.get('CIFRUM_SIMULATION_WORKERS', 1))
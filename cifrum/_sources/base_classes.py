@@ -1,7 +1,9 @@
+import threading
 from typing import Optional
 
 import pandas as pd
 
+from .series_cache import SeriesCache
 from ..common.financial_symbol import FinancialSymbol
 from ..common.financial_symbol_id import FinancialSymbolId
 from ..common.financial_symbol_info import FinancialSymbolInfo
@@ -19,11 +21,14 @@ class FinancialSymbolsSource:
 
 
 class SingleFinancialSymbolSource(FinancialSymbolsSource):
-    def __extract_values(self, start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
+    def __load_values(self) -> pd.DataFrame:
         df = self.__values_fetcher()
         df['date'] = pd.to_datetime(df['date'])
-        return df[(df['date'].dt.to_period(freq='M') >= start_period) &
-                  (df['date'].dt.to_period(freq='M') <= end_period)].copy()
+        return df
+
+    def __extract_values(self, start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
+        series_key = FinancialSymbolId(namespace=self.namespace, name=self.name).format()
+        return self.__series_cache.get(series_key, self.__load_values).slice(start_period, end_period)
 
     def __init__(self, values_fetcher, namespace, name, start_period, end_period,
                  isin=None,
@@ -33,30 +38,51 @@ class SingleFinancialSymbolSource(FinancialSymbolsSource):
                  currency=None,
                  security_type=None,
                  period=None,
-                 adjusted_close=None):
+                 adjusted_close=None,
+                 series_cache: Optional[SeriesCache] = None):
+        """
+        :param start_period: start period of the symbol or a function that returns it, called on first use
+        :param end_period: end period of the symbol or a function that returns it, called on first use
+        """
         super().__init__(namespace)
         self.name = name
         self.__values_fetcher = values_fetcher
-        self.financial_symbol = \
-            FinancialSymbol(identifier=FinancialSymbolId(namespace=self.namespace, name=self.name),
-                            values=self.__extract_values,
-                            isin=isin,
-                            short_name=short_name,
-                            long_name=long_name,
-                            start_period=start_period,
-                            end_period=end_period,
-                            exchange=exchange,
-                            currency=currency,
-                            security_type=security_type,
-                            period=period,
-                            adjusted_close=adjusted_close)
+        self.__series_cache = SeriesCache() if series_cache is None else series_cache
+        self.__start_period = start_period
+        self.__end_period = end_period
+        self.__short_name = short_name
+        self.__symbol_kwargs = dict(isin=isin,
+                                    short_name=short_name,
+                                    long_name=long_name,
+                                    exchange=exchange,
+                                    currency=currency,
+                                    security_type=security_type,
+                                    period=period,
+                                    adjusted_close=adjusted_close)
+        self.__financial_symbol: Optional[FinancialSymbol] = None
+        self.__financial_symbol_lock = threading.Lock()
+
+    @property
+    def financial_symbol(self) -> FinancialSymbol:
+        if self.__financial_symbol is None:
+            with self.__financial_symbol_lock:
+                if self.__financial_symbol is None:
+                    start_period = self.__start_period() if callable(self.__start_period) else self.__start_period
+                    end_period = self.__end_period() if callable(self.__end_period) else self.__end_period
+                    self.__financial_symbol = \
+                        FinancialSymbol(identifier=FinancialSymbolId(namespace=self.namespace, name=self.name),
+                                        values=self.__extract_values,
+                                        start_period=start_period,
+                                        end_period=end_period,
+                                        **self.__symbol_kwargs)
+        return self.__financial_symbol
 
     def fetch_financial_symbol(self, name: str) -> Optional[FinancialSymbol]:
         return self.financial_symbol if name == self.name else None
 
     def get_all_infos(self):
         fin_sym_info = FinancialSymbolInfo(
-            fin_sym_id=self.financial_symbol.identifier,
-            short_name=self.financial_symbol.short_name
+            fin_sym_id=FinancialSymbolId(namespace=self.namespace, name=self.name),
+            short_name=self.__short_name
         )
         return [fin_sym_info]
@@ -0,0 +1,278 @@
+import contextlib
+import email.utils
+import hashlib
+import io
+import json
+import os
+import stat
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import warnings
+from typing import Optional, Dict, Any, List, Tuple
+
+import pandas as pd
+
+from .._settings import cache_dir as default_cache_dir, \
+    cache_ttl_seconds as default_cache_ttl_seconds, \
+    cache_max_bytes as default_cache_max_bytes
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class DiskCache:
+    """
+    Persistent on-disk cache of the downloads from `DATA_URL`
+
+    Raw responses are stored together with their `ETag`/`Last-Modified` validators and
+    are revalidated with a conditional request once `ttl_seconds` have passed. Frames are
+    parsed from the stored raw response, nothing executable is read from the cache.
+    The total size of the cache is bounded by `max_bytes`, least recently used entries
+    are evicted first.
+
+    The cache is safe to share between processes of the same user: files are replaced
+    atomically and downloads of the same URL are serialized with a file lock. The cache
+    directory is created private (0700), the cache is disabled with a warning if the
+    directory is owned by another user.
+    """
+
+    _body_suffix = '.body'
+    _meta_suffix = '.meta'
+    _lock_suffix = '.lock'
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 ttl_seconds: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.cache_dir = default_cache_dir if cache_dir is None else cache_dir
+        self.ttl_seconds = default_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_bytes = default_cache_max_bytes if max_bytes is None else max_bytes
+        self.__private_dir: Optional[bool] = None
+
+    @property
+    def enabled(self) -> bool:
+        if not self.cache_dir or self.max_bytes <= 0:
+            return False
+        if self.__private_dir is None:
+            self.__private_dir = self.__ensure_private_dir()
+        return self.__private_dir
+
+    def read_csv(self, url: str, **kwargs) -> pd.DataFrame:
+        """
+        Drop-in replacement of `pd.read_csv` for remote URLs
+
+        :param url: URL of the CSV file
+        :param kwargs: keyword arguments of `pd.read_csv`
+        :returns: freshly parsed data frame, safe to be modified by the caller
+        """
+        if not self.enabled or not self.__is_remote(url):
+            return pd.read_csv(url, **kwargs)
+        return pd.read_csv(io.BytesIO(self.fetch(url)), **kwargs)
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Returns the body of the `url` going through the cache
+        """
+        if not self.enabled or not self.__is_remote(url):
+            with urllib.request.urlopen(url) as response:
+                return response.read()
+
+        key = self.__key(url)
+        self.__ensure_fresh(url, key)
+        with open(self.__path(key, self._body_suffix), 'rb') as f:
+            return f.read()
+
+    def clear(self):
+        """
+        Removes all the cached entries
+        """
+        for path, _, _ in self.__entries():
+            self.__remove(path)
+
+    def _download(self, url: str, headers: Dict[str, str]) -> Tuple[Optional[bytes], Dict[str, Any]]:
+        """
+        Performs (conditional) HTTP request
+
+        :returns: body and response headers; body is `None` if the resource is not modified
+        """
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.read(), dict(response.headers.items())
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, dict(e.headers.items())
+            raise
+
+    def __ensure_fresh(self, url: str, key: str) -> Dict[str, Any]:
+        meta = self.__read_meta(key)
+        if meta is not None and time.time() - meta['fetched_at'] < self.ttl_seconds:
+            self.__touch(self.__path(key, self._body_suffix))
+            return meta
+
+        with self.__locked(key):
+            # another process may have refreshed the entry while we were waiting for the lock
+            meta = self.__read_meta(key)
+            if meta is not None and time.time() - meta['fetched_at'] < self.ttl_seconds:
+                return meta
+
+            headers = {}
+            if meta is not None:
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+
+            try:
+                body, response_headers = self._download(url, headers)
+            except (urllib.error.URLError, OSError):
+                if meta is None:
+                    raise
+                # serve the stale copy if the data server is unreachable
+                return meta
+
+            if body is None:
+                if meta is None:
+                    raise ValueError('Unexpected `304 Not Modified` for the uncached URL {}'.format(url))
+                meta['fetched_at'] = time.time()
+            else:
+                meta = {
+                    'url': url,
+                    'etag': response_headers.get('ETag'),
+                    'last_modified': response_headers.get('Last-Modified') or
+                    email.utils.formatdate(time.time(), usegmt=True),
+                    'digest': hashlib.sha1(body).hexdigest()[:16],
+                    'fetched_at': time.time(),
+                }
+                self.__write_atomically(self.__path(key, self._body_suffix), body)
+            self.__write_atomically(self.__path(key, self._meta_suffix), json.dumps(meta).encode('utf-8'))
+
+        self.__evict()
+        return meta
+
+    def __evict(self):
+        entries = self.__entries()
+        total_size = sum(size for _, size, _ in entries)
+        if total_size <= self.max_bytes:
+            return
+
+        with self.__locked('__eviction'):
+            key2size: Dict[str, int] = {}
+            key2atime: Dict[str, float] = {}
+            key2paths: Dict[str, List[str]] = {}
+            for path, size, atime in self.__entries():
+                key = os.path.basename(path).split('.')[0]
+                key2size[key] = key2size.get(key, 0) + size
+                key2atime[key] = max(key2atime.get(key, 0.), atime)
+                key2paths.setdefault(key, []).append(path)
+
+            total_size = sum(key2size.values())
+            for key in sorted(key2atime, key=key2atime.get):
+                if total_size <= self.max_bytes:
+                    break
+                for path in key2paths[key]:
+                    self.__remove(path)
+                total_size -= key2size[key]
+
+    def __entries(self) -> List[Tuple[str, int, float]]:
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.startswith('.') or name.endswith(self._lock_suffix):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def __ensure_private_dir(self) -> bool:
+        """
+        Creates the cache directory accessible by the current user only
+
+        :returns: whether the directory is safe to use
+        """
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            st = os.stat(self.cache_dir)
+            if hasattr(os, 'getuid'):
+                if st.st_uid != os.getuid():
+                    warnings.warn('cache directory {} is owned by another user, caching is disabled'
+                                  .format(self.cache_dir))
+                    return False
+                if st.st_mode & 0o077:
+                    os.chmod(self.cache_dir, 0o700)
+        except OSError as e:
+            warnings.warn('cache directory {} is not usable, caching is disabled: {}'.format(self.cache_dir, e))
+            return False
+        return True
+
+    def __read_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.__path(key, self._meta_suffix), 'rb') as f:
+                meta = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.__path(key, self._body_suffix)):
+            return None
+        return meta
+
+    @contextlib.contextmanager
+    def __locked(self, key: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.__path(key, self._lock_suffix), 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def __write_atomically(self, path: str, content: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self.__remove(tmp_path)
+            raise
+
+    def __path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    @staticmethod
+    def __touch(path: str):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def __key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __is_remote(url: str) -> bool:
+        return url.startswith('http://') or url.startswith('https://')
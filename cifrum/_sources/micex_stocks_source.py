@@ -1,9 +1,11 @@
-from functools import lru_cache
+import threading
 from typing import Optional, Callable
 
 import pandas as pd
 
 from .base_classes import FinancialSymbolsSource
+from .disk_cache import DiskCache
+from .series_cache import SeriesCache
 from .._settings import data_url
 from ..common.enums import Currency, SecurityType, Period
 from ..common.financial_symbol import FinancialSymbol
@@ -12,23 +14,38 @@ from ..common.financial_symbol_info import FinancialSymbolInfo
 
 
 class MicexStocksSource(FinancialSymbolsSource):
-    def __init__(self):
+    def __init__(self, disk_cache: DiskCache, series_cache: SeriesCache):
         super().__init__(namespace='micex')
+        self.disk_cache = disk_cache
+        self.series_cache = series_cache
         self.url_base = data_url + 'moex/stock_etf/'
-        self.index = pd.read_csv(self.url_base + '__index.csv', sep='\t',
-                                 index_col='name', parse_dates=['date_start', 'date_end'])
-        self.index['date_start'] = self.index['date_start'].dt.to_period(freq='D')
-        self.index['date_end'] = self.index['date_end'].dt.to_period(freq='D')
+        self.__index: Optional[pd.DataFrame] = None
+        self.__index_lock = threading.Lock()
+
+    @property
+    def index(self) -> pd.DataFrame:
+        if self.__index is None:
+            with self.__index_lock:
+                if self.__index is None:
+                    index = self.disk_cache.read_csv(self.url_base + '__index.csv', sep='\t',
+                                                     index_col='name', parse_dates=['date_start', 'date_end'])
+                    index['date_start'] = index['date_start'].dt.to_period(freq='D')
+                    index['date_end'] = index['date_end'].dt.to_period(freq='D')
+                    self.__index = index
+        return self.__index
 
-    @lru_cache(maxsize=512)
     def __extract_values(self, secid: str) -> Callable[[pd.Period, pd.Period], pd.DataFrame]:
-        def func(start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
-            df = pd.read_csv(self.url_base + secid + '.csv', sep='\t', usecols=['date', 'adjusted_close'])
+        url = self.url_base + secid + '.csv'
+
+        def load() -> pd.DataFrame:
+            df = self.disk_cache.read_csv(url, sep='\t', usecols=['date', 'adjusted_close'])
             df.rename(columns={'adjusted_close': 'close'}, inplace=True)
             df['date'] = pd.to_datetime(df['date'])
             df['period'] = df['date'].dt.to_period(freq='M')
-            df_new = df[(start_period <= df['period']) & (df['period'] <= end_period)].copy()
-            return df_new
+            return df
+
+        def func(start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
+            return self.series_cache.get(url, load).slice(start_period, end_period)
 
         return func
 
@@ -15,8 +15,20 @@ from ..common.financial_symbol_info import FinancialSymbolInfo
 class MutualFundsRuSource(FinancialSymbolsSource):
     def __init__(self):
         super().__init__(namespace='mut_ru')
-        self.infos_api = swagger_client.InfosApi()
-        self.adjusted_values_api = swagger_client.AdjustedValuesApi()
+        self.__infos_api: Optional[swagger_client.InfosApi] = None
+        self.__adjusted_values_api: Optional[swagger_client.AdjustedValuesApi] = None
+
+    @property
+    def infos_api(self) -> swagger_client.InfosApi:
+        if self.__infos_api is None:
+            self.__infos_api = swagger_client.InfosApi()
+        return self.__infos_api
+
+    @property
+    def adjusted_values_api(self) -> swagger_client.AdjustedValuesApi:
+        if self.__adjusted_values_api is None:
+            self.__adjusted_values_api = swagger_client.AdjustedValuesApi()
+        return self.__adjusted_values_api
 
     @lru_cache(maxsize=512)
     def __extract_values(self, row_id: str) -> Callable[[pd.Period, pd.Period], pd.DataFrame]:
@@ -14,13 +14,15 @@ from ..common.financial_symbol_info import FinancialSymbolInfo
 class OkamaSource(FinancialSymbolsSource):
     def __init__(self, cbr_top_rates_source: CbrTopRatesSource):
         super().__init__(namespace='index')
+        self.cbr_top_rates_source = cbr_top_rates_source
+        self.okid10_name = 'OKID10'
 
-        cbr_top10_sym = cbr_top_rates_source.fetch_financial_symbol('TOP_rates')
+    @property
+    def cbr_top10_sym(self) -> FinancialSymbol:
+        cbr_top10_sym = self.cbr_top_rates_source.fetch_financial_symbol('TOP_rates')
         if cbr_top10_sym is None:
             raise ValueError('TOP_rates financial symbol is not found')
-        self.cbr_top10_sym: FinancialSymbol = cbr_top10_sym
-
-        self.okid10_name = 'OKID10'
+        return cbr_top10_sym
 
     def fetch_financial_symbol(self, name: str) -> Optional[FinancialSymbol]:
         if name != self.okid10_name:
@@ -0,0 +1,212 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Optional, Dict, List, Tuple, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .._settings import panel_dir as default_panel_dir, cache_ttl_seconds as default_cache_ttl_seconds
+from ..common.financial_symbol import FinancialSymbol
+
+
+class Panel:
+    """
+    Monthly closes of all symbols of a namespace as a dense `assets x months` float64 matrix
+    opened via `numpy.memmap`. Missing values are `NaN`.
+
+    The matrix is read-only and its pages are shared between the processes that open it.
+    The time of the build and the end periods of the symbols reported by the source at that time
+    tell whether the panel is stale.
+    """
+
+    def __init__(self, namespace: str, symbols: List[str], period_start: pd.Period, values: np.ndarray,
+                 built_at: float = 0., end_periods: Optional[List[str]] = None):
+        self.namespace = namespace
+        self._symbols = symbols
+        self._symbol2row = {name: idx for idx, name in enumerate(symbols)}
+        self._period_start = period_start
+        self._values = values
+        self.built_at = built_at
+        self._end_periods = end_periods
+
+    @classmethod
+    def open(cls, meta_path: str) -> 'Panel':
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        symbols = meta['symbols']
+        data_path = os.path.join(os.path.dirname(meta_path), meta['data'])
+        if len(symbols) == 0 or meta['months'] == 0:
+            values = np.empty((len(symbols), meta['months']), dtype=np.float64)
+        else:
+            values = np.memmap(data_path, dtype=np.float64, mode='r', shape=(len(symbols), meta['months']))
+        return cls(namespace=meta['namespace'],
+                   symbols=symbols,
+                   period_start=pd.Period(meta['period_start'], freq='M'),
+                   values=values,
+                   built_at=meta.get('built_at', 0.),
+                   end_periods=meta.get('end_periods'))
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def period_start(self) -> pd.Period:
+        return self._period_start
+
+    @property
+    def period_end(self) -> pd.Period:
+        return self._period_start + self._values.shape[1] - 1
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._symbol2row
+
+    def end_period(self, name: str) -> Optional[str]:
+        """
+        Returns the end period of the symbol reported by its source when the panel was built
+        """
+        if self._end_periods is None:
+            return None
+        return self._end_periods[self._symbol2row[name]]
+
+    def monthly_values(self, name: str,
+                       start_period: pd.Period, end_period: pd.Period) -> Tuple[Optional[pd.Period], np.ndarray]:
+        """
+        Returns zero-copy slice of monthly closes of the symbol
+
+        :returns: the period of the first value and the values, leading and trailing `NaN`s are dropped
+        """
+        row = self._symbol2row[name]
+        idx_start = max(0, (pd.Period(start_period, freq='M') - self._period_start).n)
+        idx_end = min(self._values.shape[1], (pd.Period(end_period, freq='M') - self._period_start).n + 1)
+        if idx_start >= idx_end:
+            return None, self._values[row, 0:0]
+
+        vals = self._values[row, idx_start:idx_end]
+        not_nan = np.flatnonzero(~np.isnan(vals))
+        if not_nan.size == 0:
+            return None, self._values[row, 0:0]
+        return self._period_start + idx_start + int(not_nan[0]), vals[not_nan[0]:not_nan[-1] + 1]
+
+
+class PanelStore:
+    """
+    On-disk store of `Panel`s, one per namespace. Panels older than `ttl_seconds` are ignored
+    until they are built again
+    """
+
+    def __init__(self, panel_dir: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        self.panel_dir = default_panel_dir if panel_dir is None else panel_dir
+        self.ttl_seconds = default_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.__panels: Dict[str, Tuple[float, Optional[Panel]]] = {}
+        self.__lock = threading.Lock()
+
+    def open(self, namespace: str) -> Optional[Panel]:
+        """
+        Returns the panel of the namespace or `None` if it has not been built or is stale
+        """
+        if not self.panel_dir:
+            return None
+        meta_path = self.__meta_path(namespace)
+        try:
+            mtime = os.stat(meta_path).st_mtime
+        except FileNotFoundError:
+            return None
+
+        with self.__lock:
+            opened = self.__panels.get(namespace)
+            if opened is None or opened[0] != mtime:
+                opened = (mtime, Panel.open(meta_path))
+                self.__panels[namespace] = opened
+        if time.time() - opened[1].built_at > self.ttl_seconds:
+            return None
+        return opened[1]
+
+    def build(self, namespace: str, symbols: Iterable[FinancialSymbol]) -> Panel:
+        """
+        Builds the panel from monthly closes of the symbols and stores it replacing the previous one
+        """
+        if not self.panel_dir:
+            raise ValueError('panel directory is not configured, set `CIFRUM_PANEL_DIR`')
+
+        period_lowest = pd.Period('1900-1', freq='M')
+        period_highest = pd.Period.now(freq='M')
+        built_at = time.time()
+        name2values: Dict[str, Tuple[pd.Period, np.ndarray]] = {}
+        name2end_period: Dict[str, str] = {}
+        for symbol in symbols:
+            period_start, values = symbol.monthly_values(start_period=period_lowest, end_period=period_highest,
+                                                         use_panel=False)
+            if period_start is None or values.size == 0:
+                continue
+            name2values[symbol.name] = (period_start, np.asarray(values, dtype=np.float64))
+            name2end_period[symbol.name] = str(symbol.end_period)
+
+        symbol_names = sorted(name2values.keys())
+        if len(symbol_names) > 0:
+            panel_start = min(ps for ps, _ in name2values.values())
+            panel_end = max(ps + vs.size - 1 for ps, vs in name2values.values())
+            months = (panel_end - panel_start).n + 1
+        else:
+            panel_start = period_highest
+            months = 0
+
+        os.makedirs(self.panel_dir, exist_ok=True)
+        data_name = '{}.{}.f8'.format(namespace, uuid.uuid4().hex)
+        data_path = os.path.join(self.panel_dir, data_name)
+        if months > 0:
+            matrix = np.memmap(data_path, dtype=np.float64, mode='w+', shape=(len(symbol_names), months))
+            matrix[:] = np.nan
+            for row, name in enumerate(symbol_names):
+                period_start, values = name2values[name]
+                offset = (period_start - panel_start).n
+                matrix[row, offset:offset + values.size] = values
+            matrix.flush()
+            del matrix
+
+        meta = {
+            'namespace': namespace,
+            'symbols': symbol_names,
+            'period_start': str(panel_start),
+            'months': months,
+            'data': data_name,
+            'built_at': built_at,
+            'end_periods': [name2end_period[name] for name in symbol_names],
+        }
+        meta_path = self.__meta_path(namespace)
+        previous_data_name = self.__data_name(meta_path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.panel_dir, prefix='.tmp-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+        if previous_data_name is not None and previous_data_name != data_name:
+            # processes that have mapped the previous matrix keep their pages until they drop it
+            try:
+                os.remove(os.path.join(self.panel_dir, previous_data_name))
+            except FileNotFoundError:
+                pass
+
+        panel = Panel.open(meta_path)
+        with self.__lock:
+            self.__panels[namespace] = (os.stat(meta_path).st_mtime, panel)
+        return panel
+
+    def __meta_path(self, namespace: str) -> str:
+        return os.path.join(self.panel_dir, '{}.json'.format(namespace))
+
+    @staticmethod
+    def __data_name(meta_path: str) -> Optional[str]:
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)['data']
+        except (OSError, ValueError, KeyError):
+            return None
@@ -1,19 +1,53 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from itertools import groupby
 from typing import Optional, List, Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .._settings import data_url
+from .._settings import data_url, symbol_cache_size as default_symbol_cache_size, \
+    resolve_workers as default_resolve_workers, cache_ttl_seconds as default_cache_ttl_seconds
 from .._sources.base_classes import FinancialSymbolsSource
+from .._sources.disk_cache import DiskCache
+from .._sources.panel_store import PanelStore, Panel
 from .._sources.single_financial_symbol_source import CbrCurrenciesSource
 from ..common.enums import Currency
 from ..common.financial_symbol import FinancialSymbol
 from ..common.financial_symbol_id import FinancialSymbolId
+from ..common.time_series import TimeSeries, TimeSeriesKind
+
+
+_panel_check_seconds = 60
 
 
 class FinancialSymbolsRegistry:
+    """
+    Resolves financial symbols by their identifiers.
+
+    Resolved symbols are interned, so that an identifier maps to the single live symbol together with
+    its cache of values. The `symbol_cache_size` most recently resolved symbols are held strongly,
+    the rest are kept as long as they are referenced elsewhere. The symbols are resolved again
+    once `ttl_seconds` have passed, so that their period ranges and values follow the sources.
+    The panel of a namespace is attached on resolution, the panel store is checked at most once a minute.
+    """
+
+    def __init__(self, symbol_sources, panel_store: PanelStore, symbol_cache_size: Optional[int] = None,
+                 ttl_seconds: Optional[int] = None):
+        self.panel_store = panel_store
+        self.symbol_cache_size = default_symbol_cache_size if symbol_cache_size is None else symbol_cache_size
+        self.ttl_seconds = default_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.__symbols: 'weakref.WeakValueDictionary[str, FinancialSymbol]' = weakref.WeakValueDictionary()
+        self.__resolved_at: Dict[str, float] = {}
+        self.__panels: Dict[str, Tuple[float, Optional[Panel]]] = {}
+        self.__recent_symbols: 'OrderedDict[str, FinancialSymbol]' = OrderedDict()
+        self.__symbols_lock = threading.Lock()
+        self.__name2source: Dict[str, Dict[str, List[FinancialSymbolsSource]]] = {}
+        self.__name2source_lock = threading.Lock()
 
-    def __init__(self, symbol_sources):
         def symbol_source_key(x: FinancialSymbolsSource) -> str:
             return x.namespace
 
@@ -34,12 +68,129 @@ class FinancialSymbolsRegistry:
                 for name in sym_source.get_all_infos()]
 
     def get(self, financial_symbol_id: FinancialSymbolId) -> Optional[FinancialSymbol]:
+        key = financial_symbol_id.format()
+        with self.__symbols_lock:
+            fin_symbol = self.__interned(key)
+            if fin_symbol is not None:
+                self.__remember(key, fin_symbol)
+                return fin_symbol
+
+        fin_symbol = self.__resolve(financial_symbol_id)
+        if fin_symbol is None:
+            return None
+        panel = self.__panel(financial_symbol_id.namespace)
+        if panel is not None:
+            fin_symbol.attach_panel(panel)
+        with self.__symbols_lock:
+            # another thread may have resolved the symbol meanwhile
+            fin_symbol_interned = self.__interned(key)
+            if fin_symbol_interned is None:
+                self.__symbols[key] = fin_symbol
+                self.__resolved_at[key] = time.time()
+            else:
+                fin_symbol = fin_symbol_interned
+            self.__remember(key, fin_symbol)
+        return fin_symbol
+
+    def get_many(self, financial_symbol_ids: List[FinancialSymbolId],
+                 max_workers: Optional[int] = None) -> List[Optional[FinancialSymbol]]:
+        """
+        Resolves the symbols concurrently
+
+        :param financial_symbol_ids: identifiers of the symbols, may contain duplicates
+        :param max_workers: the number of threads, `CIFRUM_RESOLVE_WORKERS` by default
+        :returns: the symbols in the order of `financial_symbol_ids`, `None` for the unknown ones
+        """
+        id2unique: Dict[str, FinancialSymbolId] = OrderedDict()
+        for financial_symbol_id in financial_symbol_ids:
+            id2unique.setdefault(financial_symbol_id.format(), financial_symbol_id)
+
+        max_workers = default_resolve_workers if max_workers is None else max_workers
+        id2symbol: Dict[str, Optional[FinancialSymbol]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            # the names of the namespaces served by several sources are indexed first, a namespace per thread
+            namespaces = list(OrderedDict.fromkeys(
+                financial_symbol_id.namespace for financial_symbol_id in id2unique.values()
+                if len(self.symbol_sources.get(financial_symbol_id.namespace, [])) > 1))
+            list(pool.map(self.__namespace_index, namespaces))
+
+            # the first lookup of a source loads its index, so a name per source is resolved before the rest
+            source2ids: Dict[Tuple[str, int], List[FinancialSymbolId]] = OrderedDict()
+            for financial_symbol_id in id2unique.values():
+                source2ids.setdefault(self.__owner_key(financial_symbol_id), []).append(financial_symbol_id)
+            first_ids = [ids[0] for ids in source2ids.values()]
+            rest_ids = [financial_symbol_id for ids in source2ids.values() for financial_symbol_id in ids[1:]]
+
+            for ids in [first_ids, rest_ids]:
+                for financial_symbol_id, fin_symbol in zip(ids, pool.map(self.get, ids)):
+                    id2symbol[financial_symbol_id.format()] = fin_symbol
+        return [id2symbol[financial_symbol_id.format()] for financial_symbol_id in financial_symbol_ids]
+
+    def __interned(self, key: str) -> Optional[FinancialSymbol]:
+        fin_symbol = self.__symbols.get(key)
+        if fin_symbol is None or time.time() - self.__resolved_at[key] >= self.ttl_seconds:
+            return None
+        return fin_symbol
+
+    def __panel(self, namespace: str) -> Optional[Panel]:
+        checked_at, panel = self.__panels.get(namespace, (None, None))
+        if checked_at is None or time.time() - checked_at >= _panel_check_seconds:
+            panel = self.panel_store.open(namespace)
+            self.__panels[namespace] = (time.time(), panel)
+        return panel
+
+    def __remember(self, key: str, fin_symbol: FinancialSymbol):
+        self.__recent_symbols[key] = fin_symbol
+        self.__recent_symbols.move_to_end(key)
+        while len(self.__recent_symbols) > self.symbol_cache_size:
+            self.__recent_symbols.popitem(last=False)
+
+    def __namespace_index(self, namespace: str) -> Dict[str, List[FinancialSymbolsSource]]:
+        """
+        Returns the mapping of symbol names to the sources that list them in `get_all_infos`.
+        Built once per namespace served by several sources
+        """
+        name2source = self.__name2source.get(namespace)
+        if name2source is None:
+            with self.__name2source_lock:
+                name2source = self.__name2source.get(namespace)
+                if name2source is None:
+                    name2source = {}
+                    for symbol_source in self.symbol_sources[namespace]:
+                        for info in symbol_source.get_all_infos():
+                            name2source.setdefault(info.fin_sym_id.name, []).append(symbol_source)
+                    self.__name2source[namespace] = name2source
+        return name2source
+
+    def __owner_key(self, financial_symbol_id: FinancialSymbolId) -> Tuple[str, int]:
+        """
+        Returns the key of the source that lists the symbol, the names listed by no source are probed in
+        all the sources of the namespace, so they share the key of the namespace
+        """
+        symbol_sources_list = self.symbol_sources.get(financial_symbol_id.namespace, [])
+        if len(symbol_sources_list) > 1:
+            indexed_sources = self.__namespace_index(financial_symbol_id.namespace).get(financial_symbol_id.name)
+            if indexed_sources is not None:
+                return financial_symbol_id.namespace, id(indexed_sources[0])
+        return financial_symbol_id.namespace, 0
+
+    def __resolve(self, financial_symbol_id: FinancialSymbolId) -> Optional[FinancialSymbol]:
         symbol_sources_list: Optional[List[FinancialSymbolsSource]] = \
             self.symbol_sources.get(financial_symbol_id.namespace)
 
         if symbol_sources_list is None:
             return None
 
+        if len(symbol_sources_list) > 1:
+            # sources may accept names they do not list (e.g. in another case), so all of them are probed on miss
+            indexed_sources = self.__namespace_index(financial_symbol_id.namespace).get(financial_symbol_id.name)
+            if indexed_sources is not None:
+                if len(indexed_sources) > 1:
+                    raise Exception('Something went wrong. {} names are found for {}. '
+                                    'Please, submit the issue'
+                                    .format(len(indexed_sources), financial_symbol_id.format()))
+                symbol_sources_list = indexed_sources
+
         result: List[FinancialSymbol] = []
         for symbol_source in symbol_sources_list:
             fin_symbol = symbol_source.fetch_financial_symbol(financial_symbol_id.name)
@@ -55,49 +206,127 @@ class FinancialSymbolsRegistry:
                             'Please, submit the issue'
                             .format(result_count, financial_symbol_id.format()))
 
+    def build_panel(self, namespace: str) -> Panel:
+        """
+        Builds the memory-mapped panel of monthly values of all the symbols in the namespace.
+        Afterwards the symbols of the namespace are read from the panel
+
+        :param namespace: namespace of financial symbols
+        """
+        if namespace not in self.symbol_sources:
+            raise ValueError('Unknown namespace: {}'.format(namespace))
+        # symbols are fetched from the sources directly, so that the previous panel is not read
+        symbols = (symbol_source.fetch_financial_symbol(info.fin_sym_id.name)
+                   for symbol_source in self.symbol_sources[namespace]
+                   for info in symbol_source.get_all_infos())
+        return self.panel_store.build(namespace, (s for s in symbols if s is not None))
+
 
 class CurrencySymbolsRegistry:
-    def __init__(self, cbr_currencies_source: CbrCurrenciesSource):
+    """
+    Converts currencies by monthly rates.
+
+    The rates of every pair of currencies are precomputed into a dense `currencies x currencies x months`
+    array on the first conversion, the cross rates are triangulated through RUB once.
+    A conversion is a slice of the array then, NaN marks the months without rates
+    """
+
+    _currency_idx = {currency: idx for idx, currency in enumerate(Currency)}
+
+    def __init__(self, cbr_currencies_source: CbrCurrenciesSource, disk_cache: DiskCache):
         self.cbr_currencies_source = cbr_currencies_source
+        self.disk_cache = disk_cache
 
         self.url_base = data_url + 'currency/'
-        currency_index = pd.read_csv('{}__index.csv'.format(self.url_base),
-                                     sep='\t', parse_dates=['date_start', 'date_end'])
-        self.__f_currency_data: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.__f_rates: Optional[Tuple[int, np.ndarray]] = None
+        self.__rates_lock = threading.Lock()
+
+    def __load_currency_data(self) -> Dict[Tuple[str, str], pd.DataFrame]:
+        currency_index = self.disk_cache.read_csv('{}__index.csv'.format(self.url_base),
+                                                  sep='\t', parse_dates=['date_start', 'date_end'])
+        currency_data: Dict[Tuple[str, str], pd.DataFrame] = {}
         for supported_currency_pair in currency_index['name']:
             url = '{}{}.csv'.format(self.url_base, supported_currency_pair)
-            df = pd.read_csv(url, sep='\t', parse_dates=['date'])
+            df = self.disk_cache.read_csv(url, sep='\t', parse_dates=['date'])
             df['period'] = df['date'].dt.to_period(freq='M')
             vals_lastdate_indices = df.groupby(['period'])['date'].transform(max) == df['date']
             df = df[vals_lastdate_indices].copy()
             df['close'] = df['close'] * df['nominal']
             del df['date'], df['nominal']
             supported_currency_pair = tuple(str.split(supported_currency_pair, '-'))
-            self.__f_currency_data.update({supported_currency_pair: df})
+            currency_data.update({supported_currency_pair: df})
+        return currency_data
 
-    def __currency_data(self, currency_pair):
-        return self.__f_currency_data[currency_pair].copy()
+    def __load_rates(self) -> Tuple[int, np.ndarray]:
+        """
+        :returns: month ordinal of the first month and the rates `[currency_from, currency_to, month]`
+        """
+        currency_data = {pair: df for pair, df in self.__load_currency_data().items()
+                         if pair[1] == Currency.RUB.name and pair[0] in Currency.__members__}
+        pair_ordinals = {pair: pd.PeriodIndex(df['period']).asi8 for pair, df in currency_data.items()}
+        start_ordinal = min((ordinals.min() for ordinals in pair_ordinals.values()), default=0)
+        end_ordinal = max((ordinals.max() for ordinals in pair_ordinals.values()), default=0)
 
-    def convert(self, currency_from: Currency, currency_to: Currency,
-                start_period: pd.Period, end_period: pd.Period):
+        to_rub = np.full((len(self._currency_idx), end_ordinal - start_ordinal + 1), np.nan)
+        to_rub[self._currency_idx[Currency.RUB]] = 1.
+        for pair, df in currency_data.items():
+            to_rub[self._currency_idx[Currency[pair[0]]], pair_ordinals[pair] - start_ordinal] = df['close'].values
+        # currency_from -> RUB -> currency_to for every pair at once
+        rates = to_rub[:, np.newaxis, :] * (1. / to_rub)[np.newaxis, :, :]
+        rates.flags.writeable = False
+        return start_ordinal, rates
+
+    def __rates(self) -> Tuple[int, np.ndarray]:
+        if self.__f_rates is None:
+            with self.__rates_lock:
+                if self.__f_rates is None:
+                    self.__f_rates = self.__load_rates()
+        return self.__f_rates
+
+    def __rate_values(self, currency_from: Currency, currency_to: Currency,
+                      start_period: pd.Period, end_period: pd.Period) -> Tuple[pd.Period, np.ndarray]:
+        """
+        :returns: the first month and the rates over the months within the period range that have rates
+        """
         if currency_to == currency_from:
-            currency_min_date = self.cbr_currencies_source._currency_min_date[currency_from.name]
-            p_range = pd.period_range(start=str(currency_min_date),
-                                      end=str(end_period + 1),
-                                      freq='M')
-            df = pd.DataFrame.from_dict({'period': p_range, 'close': 1.})
-        elif currency_to == Currency.RUB:
-            df = self.__currency_data((currency_from.name, currency_to.name))
-        elif currency_from == Currency.RUB:
-            df = self.convert(currency_to, currency_from, start_period, end_period)
-            df['close'] = 1.0 / df['close']
-        else:
-            df = self.convert(currency_from, Currency.RUB, start_period, end_period)
-            df_to = self.convert(Currency.RUB, currency_to, start_period, end_period)
-            df = df.merge(df_to, on='period', suffixes=('', '_to'))
-            df['close'] = df['close'] * df['close_to']
-            del df['close_to']
-
-        df = df[(start_period <= df['period']) & (df['period'] <= end_period)].copy()
-        df.sort_values(by='period', ascending=True, inplace=True)
+            currency_min_period = pd.Period(self.cbr_currencies_source._currency_min_date[currency_from.name],
+                                            freq='M')
+            start_period = max(start_period, currency_min_period)
+            return start_period, np.ones(max((end_period - start_period).n + 1, 0))
+
+        start_ordinal, rates = self.__rates()
+        idx_start = max(start_period.ordinal - start_ordinal, 0)
+        idx_end = max(end_period.ordinal - start_ordinal + 1, idx_start)
+        values = rates[self._currency_idx[currency_from], self._currency_idx[currency_to], idx_start:idx_end]
+        known = np.flatnonzero(~np.isnan(values))
+        if known.size == 0:
+            return start_period, values[:0]
+        return pd.Period(ordinal=start_ordinal + idx_start + known[0], freq='M'), values[known[0]:known[-1] + 1]
+
+    def convert(self, currency_from: Currency, currency_to: Currency,
+                start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
+        """
+        :returns: `period` and `close` rates of the months within the period range that have rates
+        """
+        rate_start_period, values = self.__rate_values(currency_from, currency_to, start_period, end_period)
+        df = pd.DataFrame({'period': pd.period_range(rate_start_period, periods=values.size, freq='M'),
+                           'close': values})
+        if np.isnan(values).any():
+            df = df[df['close'].notnull()].reset_index(drop=True)
         return df
+
+    def rate(self, currency_from: Currency, currency_to: Currency,
+             start_period: pd.Period, end_period: pd.Period) -> TimeSeries:
+        """
+        Returns the conversion rates as time series, the months without rates are trimmed from both ends
+        """
+        rate_start_period, values = self.__rate_values(currency_from, currency_to, start_period, end_period)
+        if values.size == 0:
+            raise ValueError('currency rates {} -> {} are not available for the period range'
+                             .format(currency_from.name, currency_to.name))
+        if np.isnan(values).any():
+            raise ValueError('currency rates {} -> {} have gaps within the period range'
+                             .format(currency_from.name, currency_to.name))
+        return TimeSeries(values=values,
+                          start_period=rate_start_period, end_period=rate_start_period + values.size - 1,
+                          kind=TimeSeriesKind.CURRENCY_RATE)
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Dict
+
+import numpy as np
+import pandas as pd
+
+from .._settings import series_cache_max_bytes as default_series_cache_max_bytes, \
+    cache_ttl_seconds as default_cache_ttl_seconds
+
+
+class CachedSeries:
+    """
+    Parsed values of a financial symbol sorted by month with a month-ordinal index,
+    so that any range of periods is extracted with a binary search
+    """
+
+    def __init__(self, values: pd.DataFrame):
+        if 'period' in values.columns:
+            periods = values['period']
+        else:
+            periods = pd.to_datetime(values['date']).dt.to_period(freq='M')
+        ordinals = pd.PeriodIndex(periods, freq='M').asi8
+
+        if ordinals.size > 1 and np.any(ordinals[1:] < ordinals[:-1]):
+            order = np.argsort(ordinals, kind='mergesort')
+            values = values.iloc[order]
+            ordinals = ordinals[order]
+
+        self._values = values.reset_index(drop=True)
+        self._ordinals = ordinals
+        self.loaded_at = time.time()
+        self._nbytes = int(self._values.memory_usage(index=True, deep=True).sum()) + self._ordinals.nbytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def slice(self, start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
+        idx_start = np.searchsorted(self._ordinals, pd.Period(start_period, freq='M').ordinal, side='left')
+        idx_end = np.searchsorted(self._ordinals, pd.Period(end_period, freq='M').ordinal, side='right')
+        return self._values.iloc[idx_start:idx_end].copy()
+
+
+class SeriesCache:
+    """
+    In-memory cache of parsed series keyed by the symbol data URL.
+    The least recently used series are evicted once the total size exceeds `max_bytes`.
+    Series older than `ttl_seconds` are loaded again, so the revalidated downloads of `DiskCache` are picked up.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_bytes = default_series_cache_max_bytes if max_bytes is None else max_bytes
+        self.ttl_seconds = default_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.__series: 'OrderedDict[str, CachedSeries]' = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__nbytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key: str, loader: Callable[[], pd.DataFrame]) -> CachedSeries:
+        """
+        Returns cached series for the `key`, the `loader` is called on cache miss
+        """
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is not None and time.time() - series.loaded_at < self.ttl_seconds:
+                self.__series.move_to_end(key)
+                self.__hits += 1
+                return series
+            self.__misses += 1
+
+        series = CachedSeries(loader())
+        if series.nbytes > self.max_bytes:
+            return series
+
+        with self.__lock:
+            previous = self.__series.pop(key, None)
+            if previous is not None:
+                self.__nbytes -= previous.nbytes
+            self.__series[key] = series
+            self.__nbytes += series.nbytes
+            while self.__nbytes > self.max_bytes:
+                _, evicted = self.__series.popitem(last=False)
+                self.__nbytes -= evicted.nbytes
+                self.__evictions += 1
+        return series
+
+    def clear(self):
+        with self.__lock:
+            self.__series.clear()
+            self.__nbytes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'evictions': self.__evictions,
+                'entries': len(self.__series),
+                'nbytes': self.__nbytes,
+            }
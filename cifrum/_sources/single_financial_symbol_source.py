@@ -1,10 +1,13 @@
 import datetime as dtm
+import threading
 from functools import lru_cache
 from typing import Optional, Callable
 
 import pandas as pd
 
 from .base_classes import SingleFinancialSymbolSource, FinancialSymbolsSource
+from .disk_cache import DiskCache
+from .series_cache import SeriesCache
 from .._settings import data_url, change_column_name
 from ..common.enums import Currency, SecurityType, Period
 from ..common.financial_symbol import FinancialSymbol
@@ -14,37 +17,41 @@ from ..common.financial_symbol_info import FinancialSymbolInfo
 
 class CbrTopRatesSource(SingleFinancialSymbolSource):
     def _load_rates(self):
-        df = pd.read_csv('{}cbr_deposit_rate/data.csv'.format(data_url), sep='\t')
+        df = self.disk_cache.read_csv('{}cbr_deposit_rate/data.csv'.format(data_url), sep='\t')
         df.sort_values(by='decade', inplace=True)
         df.rename(columns={'close': change_column_name, 'decade': 'date'},
                   inplace=True)
         return df
 
     def _load_dates(self, kind):
-        index = pd.read_csv('{}cbr_deposit_rate/__index.csv'.format(data_url), sep='\t')
+        index = self.disk_cache.read_csv('{}cbr_deposit_rate/__index.csv'.format(data_url), sep='\t')
         period_str = index[kind][0]
         return pd.Period(period_str, freq='M')
 
-    def __init__(self):
+    def __init__(self, disk_cache: DiskCache, series_cache: SeriesCache):
+        self.disk_cache = disk_cache
         super().__init__(
             namespace='cbr',
             name='TOP_rates',
             values_fetcher=lambda: self._load_rates(),
-            start_period=self._load_dates(kind='date_start'),
-            end_period=self._load_dates(kind='date_end'),
+            start_period=lambda: self._load_dates(kind='date_start'),
+            end_period=lambda: self._load_dates(kind='date_end'),
             long_name='Динамика максимальной процентной ставки (по вкладам в российских рублях)',
             currency=Currency.RUB,
             security_type=SecurityType.RATES,
             period=Period.DECADE,
             adjusted_close=False,
+            series_cache=series_cache,
         )
 
 
 class CbrCurrenciesSource(FinancialSymbolsSource):
-    def __init__(self):
+    def __init__(self, disk_cache: DiskCache):
         super().__init__(namespace='cbr')
+        self.disk_cache = disk_cache
         self.url_base = data_url + 'currency/'
-        self.index = pd.read_csv(self.url_base + '__index.csv', sep='\t', index_col='name')
+        self.__index: Optional[pd.DataFrame] = None
+        self.__index_lock = threading.Lock()
         self.__short_names = {
             Currency.RUB: 'Рубль РФ',
             Currency.USD: 'Доллар США',
@@ -56,6 +63,14 @@ class CbrCurrenciesSource(FinancialSymbolsSource):
             Currency.EUR.name: pd.Period('1996', freq='D'),
         }
 
+    @property
+    def index(self) -> pd.DataFrame:
+        if self.__index is None:
+            with self.__index_lock:
+                if self.__index is None:
+                    self.__index = self.disk_cache.read_csv(self.url_base + '__index.csv', sep='\t', index_col='name')
+        return self.__index
+
     @lru_cache(maxsize=512)
     def __currency_values(self, name: str) -> Callable[[pd.Period, pd.Period], pd.DataFrame]:
         def func(start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
@@ -1,15 +1,25 @@
 import datetime as dtm
+import threading
 from collections import namedtuple
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple, List
 
+import numpy as np
 import pandas as pd
 from dateutil import relativedelta
 
+from .._settings import change_column_name
 from ..common.enums import Period, Currency, SecurityType
 from ..common.financial_symbol_id import FinancialSymbolId
 
 
 class ValuesFetcher:
+    """
+    Interval cache of the values of a financial symbol.
+
+    Fetched rows are kept sorted by month ordinal together with the list of the disjoint
+    fetched ranges, so that the values function is called for the missing months only and
+    a range within the fetched ones is answered with a binary search.
+    """
 
     _PeriodRange = namedtuple('PeriodRange', 'start, end')
 
@@ -17,41 +27,95 @@ class ValuesFetcher:
         self._values_func = values_func
         self._period_min = period_min
         self._period_max = period_max
-        self._current_period_start = None
-        self._current_period_end = None
-        self._values = None
+        self._values: Optional[pd.DataFrame] = None
+        self._ordinals = np.empty(0, dtype=np.int64)
+        self._intervals: List[List[int]] = []
+        self._lock = threading.RLock()
 
     @property
     def _period_range(self):
-        return self._PeriodRange(self._current_period_start, self._current_period_end)
+        if len(self._intervals) == 0:
+            return self._PeriodRange(None, None)
+        return self._PeriodRange(pd.Period(ordinal=self._intervals[0][0], freq='M'),
+                                 pd.Period(ordinal=self._intervals[-1][1], freq='M'))
 
-    def _fetch(self, start_period: pd.Period, end_period: pd.Period):
-        start_period = max(start_period, self._period_min)
-        end_period = min(end_period, self._period_max)
+    @staticmethod
+    def _month_ordinals(values: pd.DataFrame) -> np.ndarray:
+        return pd.to_datetime(values['date']).values.astype('datetime64[M]').astype(np.int64)
 
-        if self._current_period_start is None or \
-                (start_period < self._current_period_start and end_period > self._current_period_end):
-            self._current_period_start = start_period
-            self._current_period_end = end_period
-            self._values = self._values_func(start_period, end_period)
+    def _missing_intervals(self, ord_start: int, ord_end: int) -> List[Tuple[int, int]]:
+        gaps = []
+        cursor = ord_start
+        for int_start, int_end in self._intervals:
+            if int_end < cursor:
+                continue
+            if int_start > ord_end:
+                break
+            if int_start > cursor:
+                gaps.append((cursor, int_start - 1))
+            cursor = int_end + 1
+            if cursor > ord_end:
+                break
+        if cursor <= ord_end:
+            gaps.append((cursor, ord_end))
+        return gaps
 
-        elif start_period >= self._current_period_start and end_period <= self._current_period_end:
-            pass
+    def _store(self, ord_start: int, ord_end: int, values: pd.DataFrame):
+        ordinals = self._month_ordinals(values)
+        if ordinals.size > 1 and np.any(ordinals[1:] < ordinals[:-1]):
+            order = np.argsort(ordinals, kind='mergesort')
+            values = values.iloc[order]
+            ordinals = ordinals[order]
+        in_range = (ord_start <= ordinals) & (ordinals <= ord_end)
+        if not in_range.all():
+            values = values[in_range]
+            ordinals = ordinals[in_range]
 
-        elif start_period < self._current_period_start:
-            self._values = self._values_func(start_period, self._current_period_start - 1).append(self._values)
-            self._current_period_start = start_period
+        if self._values is None:
+            self._values = values.reset_index(drop=True)
+            self._ordinals = ordinals
+        else:
+            idx_start = np.searchsorted(self._ordinals, ord_start, side='left')
+            idx_end = np.searchsorted(self._ordinals, ord_end, side='right')
+            self._values = pd.concat([self._values.iloc[:idx_start], values, self._values.iloc[idx_end:]],
+                                     ignore_index=True, sort=False)
+            self._ordinals = np.concatenate([self._ordinals[:idx_start], ordinals, self._ordinals[idx_end:]])
 
-        elif end_period > self._current_period_end:
-            self._values = self._values.append(self._values_func(self._current_period_end + 1, end_period))
-            self._current_period_end = end_period
+        intervals = []
+        for int_start, int_end in sorted(self._intervals + [[ord_start, ord_end]]):
+            if len(intervals) > 0 and int_start <= intervals[-1][1] + 1:
+                intervals[-1][1] = max(intervals[-1][1], int_end)
+            else:
+                intervals.append([int_start, int_end])
+        self._intervals = intervals
 
-        else:
-            pass
+    def _fetch(self, start_period: pd.Period, end_period: pd.Period):
+        """
+        Returns the values within the period range. The result is a view of the cache
+        and must not be modified
+        """
+        start_period = max(start_period, self._period_min)
+        end_period = min(end_period, self._period_max)
+        ord_start = pd.Period(start_period, freq='M').ordinal
+        ord_end = pd.Period(end_period, freq='M').ordinal
 
-        periods = self._values.date.dt.to_period(freq='M')
-        df = self._values[(start_period <= periods) & (periods <= end_period)]
-        return df.copy()
+        with self._lock:
+            gaps = self._missing_intervals(ord_start, ord_end) if ord_start <= ord_end else []
+            if len(gaps) > 1:
+                # a single request of the whole range is cheaper than a request per gap
+                gaps = [(gaps[0][0], gaps[-1][1])]
+            for gap_start, gap_end in gaps:
+                self._store(gap_start, gap_end,
+                            self._values_func(pd.Period(ordinal=gap_start, freq='M'),
+                                              pd.Period(ordinal=gap_end, freq='M')))
+            if self._values is None:
+                return self._values_func(start_period, end_period)
+
+            values, ordinals = self._values, self._ordinals
+
+        idx_start = np.searchsorted(ordinals, ord_start, side='left')
+        idx_end = np.searchsorted(ordinals, ord_end, side='right')
+        return values.iloc[idx_start:idx_end]
 
 
 class FinancialSymbol:
@@ -84,6 +148,54 @@ class FinancialSymbol:
         self._end_period = end_period
         self.period = period
         self.adjusted_close = adjusted_close
+        self.__panel = None
+
+    def attach_panel(self, panel) -> bool:
+        """
+        Makes `monthly_values` of the symbol read the memory-mapped panel of the namespace
+
+        :param panel: `Panel` instance
+        :returns: whether the panel contains the symbol up to its current end period
+        """
+        if self.name not in panel:
+            return False
+        if self._end_period is not None and panel.end_period(self.name) != str(self._end_period):
+            # the source has got newer values since the panel was built
+            return False
+        self.__panel = panel
+        return True
+
+    @property
+    def _value_column(self) -> str:
+        if self.period == Period.DECADE:
+            return change_column_name
+        if self.security_type == SecurityType.INFLATION:
+            return 'value'
+        return 'close'
+
+    def monthly_values(self, start_period: pd.Period, end_period: pd.Period,
+                       use_panel: bool = True) -> Tuple[Optional[pd.Period], np.ndarray]:
+        """
+        Returns monthly values as a contiguous array, a value per month from the first one to the last one.
+        The months missing in the source are `NaN`, as they are in the panel
+
+        :param use_panel: whether to read the attached panel, if any
+        :returns: the period of the first value and the values
+        """
+        if use_panel and self.__panel is not None:
+            return self.__panel.monthly_values(self.name, start_period, end_period)
+
+        vals = self.values(start_period=start_period, end_period=end_period)
+        if len(vals) == 0:
+            return None, np.empty(0, dtype=np.float64)
+        values = vals[self._value_column].values
+        ordinals = pd.PeriodIndex(vals['period']).asi8
+        months = int(ordinals[-1] - ordinals[0]) + 1
+        if months != len(ordinals):
+            values_dense = np.full(months, np.nan)
+            values_dense[ordinals - ordinals[0]] = values
+            values = values_dense
+        return vals['period'].iloc[0], values
 
     def values(self, start_period: pd.Period, end_period: pd.Period) -> pd.DataFrame:
         vals = self.values_fetcher._fetch(start_period=start_period, end_period=end_period)
@@ -96,25 +208,23 @@ class FinancialSymbol:
             # - for every period we take the value that is last in each month
 
             if 'period' not in vals.columns:
-                vals['period'] = vals['date'].dt.to_period(freq='M')
+                vals = vals.assign(period=vals['date'].dt.to_period(freq='M'))
 
             month_ago = pd.Period(dtm.datetime.now() - relativedelta.relativedelta(months=1), freq='D')
             if self.end_period < month_ago:
                 vals = vals[vals['period'] < pd.Period(self.end_period, freq='M')]
             indicator__not_current_period = vals['period'] != pd.Period.now(freq='M')
             indicator__lastdate_indices = vals['period'] != vals['period'].shift(1)
-            vals = vals[indicator__lastdate_indices & indicator__not_current_period].copy()
-            del vals['date']
+            vals = vals[indicator__lastdate_indices & indicator__not_current_period].drop(columns='date')
         elif self.period == Period.MONTH:
-            del vals['date']
+            vals = vals.drop(columns='date')
         elif self.period == Period.DECADE:
-            vals = vals[vals['date'].dt.day == 3]
-            vals['date'] = vals['date'].apply(lambda p: pd.Period(p, freq='M'))
-            vals.rename(columns={'date': 'period'}, inplace=True)
+            vals = vals[vals['date'].dt.day == 3].rename(columns={'date': 'period'})
+            vals['period'] = vals['period'].apply(lambda p: pd.Period(p, freq='M'))
         else:
             raise Exception('Unexpected type of `period`')
 
-        vals.sort_values(by='period', ascending=True, inplace=True)
+        vals = vals.sort_values(by='period', ascending=True)
         return vals
 
     @property
@@ -1,4 +1,4 @@
-import copy
+import operator
 from collections.abc import Iterable
 from enum import Enum
 
@@ -16,6 +16,7 @@ class TimeSeriesKind(Enum):
     CUMULATIVE = 5
     CURRENCY_RATE = 6
     VALUE = 7
+    QTD = 8
 
     def __mul__(self, other):
         if isinstance(other, (int, float, complex)):
@@ -92,48 +93,131 @@ class TimeSeriesKind(Enum):
         return TimeSeriesKind.DIFF
 
 
+def _calendar_buckets(values: np.ndarray, start_ordinal: int, step: int, fill_value: float):
+    """
+    Lays monthly values out with an axis per calendar bucket of `step` months, the last axis is the one of months
+
+    The leading months of a partial first bucket are dropped, a partial last bucket is padded with `fill_value`
+
+    :returns: month ordinal of the first bucket and the (..., buckets, months per bucket) array
+    """
+    size = values.shape[-1]
+    drop_first_count = -start_ordinal % step
+    if drop_first_count >= size:
+        msg = "calendar buckets for the current dates range ({} - {}) are empty".format(
+            pd.Period(ordinal=start_ordinal, freq='M'), pd.Period(ordinal=start_ordinal + size - 1, freq='M'))
+        raise ValueError(msg)
+
+    values = values[..., drop_first_count:]
+    buckets_count = -(-values.shape[-1] // step)
+    buckets = np.full(values.shape[:-1] + (buckets_count * step,), fill_value, dtype=np.float64)
+    buckets[..., :values.shape[-1]] = values
+    return start_ordinal + drop_first_count, buckets.reshape(values.shape[:-1] + (buckets_count, step))
+
+
 class TimeSeries:
+    """
+    Values over the range of periods.
+
+    The period range is stored as the month ordinal of the first period, the count of periods
+    and the step in months, `pd.Period` objects are built on request only.
+
+    Slices and views share the values buffer, which is made read-only once shared.
+    Item assignment copies the shared buffer first (copy-on-write)
+    """
+
+    _freq2step = {'M': 1, 'Q': 3, 'Y': _MONTHS_PER_YEAR}
+
     def __init__(self, values, start_period: pd.Period, end_period: pd.Period, kind, freq='M'):
         if not isinstance(values, np.ndarray):
             raise ValueError('values should be numpy array')
+        if freq not in self._freq2step:
+            raise ValueError('supported freq values: M, Q, Y')
 
         self._values = values
         self._size = self._values.size
         self._freq = freq
         self._kind = kind
 
-        if self._freq == 'M':
-            self._period_range = list(pd.period_range(start_period, end_period, freq='M'))
-        elif self._freq == 'Y':
-            rng = pd.period_range(start_period, end_period, freq='M')
-            self._period_range = list(filter(lambda r: r.month == start_period.month, rng))
-        else:
-            raise ValueError('supported freq values: M, Y')
-        self._start_period = min(self._period_range)
-        self._end_period = max(self._period_range)
+        start_ordinal = self._month_ordinal(start_period)
+        end_ordinal = self._month_ordinal(end_period)
+        if start_ordinal > end_ordinal:
+            raise ValueError('start period should not be greater than end period')
+        self._step = self._freq2step[freq]
+        self._start_ordinal = start_ordinal
+        self._periods_count = (end_ordinal - start_ordinal) // self._step + 1
 
         if self.kind == TimeSeriesKind.DIFF or \
                 self.kind == TimeSeriesKind.VALUES or \
                 self.kind == TimeSeriesKind.CUMULATIVE:
-            if self.size != (end_period - start_period).n + 1:
+            if self.size != self._periods_count:
                 raise ValueError('values and period range have different lengths')
 
-        if self.kind == TimeSeriesKind.YTD:
-            if self._start_period.month != 1:
-                raise ValueError('start period month should be 1')
-            if self._end_period.month != 1:
-                raise ValueError('end period month should be 1')
-            if len(values) != self._end_period.year - self._start_period.year + 1:
-                raise ValueError('values len should be equal to full years count')
+        if self.kind == TimeSeriesKind.YTD or self.kind == TimeSeriesKind.QTD:
+            if start_ordinal % self._step != 0:
+                raise ValueError('start period should be the first month of the {} bucket'.format(freq))
+            if self._end_ordinal % self._step != 0:
+                raise ValueError('end period should be the first month of the {} bucket'.format(freq))
+            if len(values) != self._periods_count:
+                raise ValueError('values len should be equal to full {} buckets count'.format(freq))
 
         if self.kind == TimeSeriesKind.REDUCED_VALUE:
             if self.size > 1:
                 raise ValueError('size is greater than 1')
 
+    @staticmethod
+    def _month_ordinal(period) -> int:
+        if isinstance(period, pd.Period) and period.freqstr == 'M':
+            return period.ordinal
+        return pd.Period(period, freq='M').ordinal
+
+    @classmethod
+    def _new(cls, values: np.ndarray, start_ordinal: int, periods_count: int, freq: str, kind) -> 'TimeSeries':
+        """
+        Trusted constructor for the results of operations on valid series, skips validation
+        """
+        ts = cls.__new__(cls)
+        ts._values = values
+        ts._size = values.size
+        ts._freq = freq
+        ts._kind = kind
+        ts._step = cls._freq2step[freq]
+        ts._start_ordinal = start_ordinal
+        ts._periods_count = periods_count
+        return ts
+
+    def _like(self, values: np.ndarray, kind) -> 'TimeSeries':
+        return self._new(values, self._start_ordinal, self._periods_count, self._freq, kind)
+
+    def _binary_op(self, other, values_op, kind_op, reflected=False) -> 'TimeSeries':
+        if isinstance(other, TimeSeries):
+            self.__validate(other)
+            if reflected:
+                return self._like(values_op(other._values, self._values), kind_op(other._kind, self._kind))
+            return self._like(values_op(self._values, other._values), kind_op(self._kind, other._kind))
+        elif isinstance(other, (int, float, complex)):
+            if reflected:
+                return self._like(values_op(other, self._values), self._kind)
+            return self._like(values_op(self._values, other), self._kind)
+        else:
+            raise ValueError('argument has incompatible type')
+
+    @property
+    def _end_ordinal(self) -> int:
+        return self._start_ordinal + (self._periods_count - 1) * self._step
+
+    @property
+    def _start_period(self) -> pd.Period:
+        return pd.Period(ordinal=self._start_ordinal, freq='M')
+
+    @property
+    def _end_period(self) -> pd.Period:
+        return pd.Period(ordinal=self._end_ordinal, freq='M')
+
     def __validate(self, time_series):
-        if self._start_period != time_series.start_period:
+        if self._start_ordinal != time_series._start_ordinal:
             raise ValueError('start periods are incompatible')
-        if self._end_period != time_series.end_period:
+        if self._end_ordinal != time_series._end_ordinal:
             raise ValueError('end periods are incompatible')
 
     @property
@@ -160,23 +244,51 @@ class TimeSeries:
 
     @property
     def period_size(self):
-        return (self._end_period - self._start_period).n + 1
+        return self._end_ordinal - self._start_ordinal + 1
 
     def period_range(self):
-        return copy.deepcopy(self._period_range)
+        return [pd.Period(ordinal=ordinal, freq='M')
+                for ordinal in range(self._start_ordinal, self._end_ordinal + 1, self._step)]
 
     @property
     def size(self):
         return self._size
 
+    def _shared_values(self) -> np.ndarray:
+        if self._values.flags.writeable:
+            # the array passed to the constructor is left writable, the series switches to a read-only view of it
+            values = self._values.view()
+            values.flags.writeable = False
+            self._values = values
+        return self._values
+
+    def view(self) -> 'TimeSeries':
+        """
+        Returns the series sharing the values buffer with this one
+        """
+        return self._like(self._shared_values(), self._kind)
+
+    def copy(self) -> 'TimeSeries':
+        """
+        Returns the series with its own writable copy of the values
+        """
+        return self._like(self._values.copy(), self._kind)
+
+    def __setitem__(self, key, value):
+        if not self._values.flags.writeable:
+            self._values = self._values.copy()
+        self._values[key] = value
+
     def pct_change(self):
         if len(self._values) < 2:
             raise ValueError('`value` length should be >= 2')
         vals = np.diff(self._values) / self._values[:-1]
-        return TimeSeries(values=vals,
-                          start_period=self._start_period + 1, end_period=self._end_period,
-                          freq=self._freq,
-                          kind=self.kind.pct_change())
+        if self._freq != 'M':
+            return TimeSeries(values=vals,
+                              start_period=self._start_period + 1, end_period=self._end_period,
+                              freq=self._freq,
+                              kind=self.kind.pct_change())
+        return self._new(vals, self._start_ordinal + 1, self._periods_count - 1, self._freq, self._kind.pct_change())
 
     def apply(self, fun, *args):
         if len(args) == 0:
@@ -204,13 +316,10 @@ class TimeSeries:
                 raise ValueError('argument has incompatible type')
 
     def reduce(self, fun):
-        return TimeSeries(values=np.array([fun(self._values)]),
-                          start_period=self._start_period, end_period=self._end_period,
-                          freq=self._freq,
-                          kind=TimeSeriesKind.REDUCED_VALUE)
+        return self._like(np.array([fun(self._values)]), TimeSeriesKind.REDUCED_VALUE)
 
     def __mul__(self, other):
-        return self.apply(lambda x, y: x * y, other)
+        return self._binary_op(other, np.multiply, operator.mul)
 
     def __add__(self, other):
         if isinstance(other, Iterable):
@@ -229,7 +338,7 @@ class TimeSeries:
                             kind=self._kind)
             return ts
 
-        return self.apply(lambda x, y: x + y, other)
+        return self._binary_op(other, np.add, operator.add)
 
     def __radd__(self, other):
         if isinstance(other, Iterable):
@@ -248,28 +357,34 @@ class TimeSeries:
                             kind=self._kind)
             return ts
 
-        return self.apply(lambda x, y: y + x, other)
+        return self._binary_op(other, np.add, operator.add, reflected=True)
 
     def __rsub__(self, other):
-        return self.apply(lambda x, y: y - x, other)
+        return self._binary_op(other, np.subtract, operator.sub, reflected=True)
 
     def __rmul__(self, other):
-        return self.apply(lambda x, y: y * x, other)
+        return self._binary_op(other, np.multiply, operator.mul, reflected=True)
 
     def __sub__(self, other):
-        return self.apply(lambda x, y: x - y, other)
+        return self._binary_op(other, np.subtract, operator.sub)
 
     def __truediv__(self, other):
-        return self.apply(lambda x, y: x / y, other)
+        return self._binary_op(other, np.true_divide, operator.truediv)
 
     def __getitem__(self, key):
         if isinstance(key, slice):
             if not (key.step is None or key.step == 1):
                 raise ValueError('step value is not supported: {}'.format(key.step))
-            pr = pd.period_range(start=self._start_period, end=self._end_period, freq='M')
-            pr = pr[key.start:key.stop]
-            ts = TimeSeries(values=self._values[key.start:key.stop],
-                            start_period=pr.min(), end_period=pr.max(),
+            ordinals = range(self._start_ordinal, self._end_ordinal + 1)[key.start:key.stop]
+            if len(ordinals) == 0:
+                raise ValueError('slice of the period range is empty')
+            if self._freq == 'M':
+                values = self._shared_values()[key.start:key.stop]
+                if values.size == len(ordinals):
+                    return self._new(values, ordinals[0], len(ordinals), self._freq, self._kind)
+            ts = TimeSeries(values=self._shared_values()[key.start:key.stop],
+                            start_period=pd.Period(ordinal=ordinals[0], freq='M'),
+                            end_period=pd.Period(ordinal=ordinals[-1], freq='M'),
                             freq=self._freq,
                             kind=self._kind)
             return ts
@@ -288,56 +403,67 @@ class TimeSeries:
             raise ValueError('Type of `key` is not supported')
 
     def __pow__(self, power, modulo=None):
-        return self.apply(lambda x: x ** power)
+        return self._like(self._values ** power, self._kind ** power)
 
     def sqrt(self):
-        return self.apply(lambda x: np.sqrt(x))
+        return self._like(np.sqrt(self._values), self._kind.sqrt())
 
     def std(self):
-        return self.reduce(lambda x: x.std())
+        return self._like(np.array([self._values.std()]), TimeSeriesKind.REDUCED_VALUE)
 
     def mean(self):
-        return self.reduce(lambda x: x.mean())
+        return self._like(np.array([self._values.mean()]), TimeSeriesKind.REDUCED_VALUE)
 
     def sum(self):
-        return self.reduce(lambda x: x.sum())
+        return self._like(np.array([self._values.sum()]), TimeSeriesKind.REDUCED_VALUE)
 
     def prod(self):
-        return self.reduce(lambda x: x.prod())
+        return self._like(np.array([self._values.prod()]), TimeSeriesKind.REDUCED_VALUE)
 
     def cumprod(self):
-        return self.apply(lambda x: x.cumprod())
+        return self._like(self._values.cumprod(), self._kind.cumprod())
 
-    def ytd(self):
-        if self._kind != TimeSeriesKind.DIFF:
-            raise ValueError('incorrect kind')
+    def _calendar_buckets(self, freq: str, fill_value: float):
         if self._freq != 'M':
             raise ValueError('incorrect frequency')
+        return _calendar_buckets(self._values, self._start_ordinal, self._freq2step[freq], fill_value)
 
-        drop_first_count = None if self.start_period.month == 1 else _MONTHS_PER_YEAR - self.start_period.month + 1
-        if drop_first_count and drop_first_count == self.size:
-            msg = "YTD for the current dates range ({} - {}) is empty".format(self.start_period, self.end_period)
-            raise ValueError(msg)
-        values_full_yearly = self[drop_first_count:]
-
-        values_ytd_ts = []
-        years_count = len(pd.period_range(start=values_full_yearly.start_period,
-                                          end=values_full_yearly.end_period,
-                                          freq='Y'))
-        for year in range(years_count):
-            values_full_yearly_split = values_full_yearly[year * _MONTHS_PER_YEAR:(year + 1) * _MONTHS_PER_YEAR]
-            assert values_full_yearly_split.start_period.month == 1
-            if year < years_count - 1:
-                assert values_full_yearly_split.end_period.month == 12
-            values_ytd = (values_full_yearly_split + 1.).prod() - 1.
-            values_ytd_ts.append(values_ytd.value)
-
-        values_ytd = TimeSeries(values=np.array(values_ytd_ts),
-                                start_period=values_full_yearly.start_period,
-                                end_period=values_full_yearly.end_period,
-                                freq='Y',
-                                kind=TimeSeriesKind.YTD)
-        return values_ytd
+    def _compound(self, freq: str, kind) -> 'TimeSeries':
+        if self._kind != TimeSeriesKind.DIFF:
+            raise ValueError('incorrect kind')
+        start_ordinal, matrix = self._calendar_buckets(freq, fill_value=0.)
+        matrix += 1.
+        values = matrix.prod(axis=1) - 1.
+        return self._new(values, start_ordinal, values.size, freq, kind)
+
+    def ytd(self):
+        """
+        Compounds monthly rates of return within calendar years
+
+        The partial first year is dropped, the last year may be partial
+        """
+        return self._compound('Y', TimeSeriesKind.YTD)
+
+    def qtd(self):
+        """
+        Compounds monthly rates of return within calendar quarters
+
+        The partial first quarter is dropped, the last quarter may be partial
+        """
+        return self._compound('Q', TimeSeriesKind.QTD)
+
+    def resample(self, freq: str, fun, kind=None) -> 'TimeSeries':
+        """
+        Aggregates monthly values within calendar buckets
+
+        :param freq: bucket frequency, 'Q' or 'Y'
+        :param fun: NaN-aware reduction applied along the rows, e.g. `np.nansum` or `np.nanmean`,
+            missing months of a partial last bucket are NaN
+        :param kind: kind of the result, the kind of the series by default
+        """
+        start_ordinal, matrix = self._calendar_buckets(freq, fill_value=np.nan)
+        values = np.asarray(fun(matrix, axis=1), dtype=np.float64)
+        return self._new(values, start_ordinal, values.size, freq, self._kind if kind is None else kind)
 
     def __repr__(self):
         return 'TimeSeries(start_period={}, end_period={}, kind={}, values={}'.format(
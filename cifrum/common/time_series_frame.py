@@ -0,0 +1,194 @@
+import operator
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .time_series import TimeSeries, TimeSeriesKind, _calendar_buckets
+
+
+class TimeSeriesFrame:
+    """
+    Values of several series over the shared range of periods, a row per series.
+
+    Operations are applied to the whole (series, periods) matrix at once and follow the `TimeSeriesKind`
+    semantics of `TimeSeries`. A `TimeSeries` operand is broadcast over the rows
+    """
+
+    def __init__(self, values, start_period: pd.Period, end_period: pd.Period, kind, freq='M'):
+        if not isinstance(values, np.ndarray) or values.ndim != 2:
+            raise ValueError('values should be 2-dimensional numpy array')
+        axis = TimeSeries(values=np.empty(values.shape[1]),
+                          start_period=start_period, end_period=end_period,
+                          kind=kind, freq=freq)
+        self._values = values
+        self._kind = kind
+        self._freq = freq
+        self._start_ordinal = axis._start_ordinal
+        self._periods_count = axis._periods_count
+
+    @classmethod
+    def _new(cls, values: np.ndarray, start_ordinal: int, periods_count: int, freq: str, kind) -> 'TimeSeriesFrame':
+        """
+        Trusted constructor for the results of operations on valid frames, skips validation
+        """
+        frame = cls.__new__(cls)
+        frame._values = values
+        frame._kind = kind
+        frame._freq = freq
+        frame._start_ordinal = start_ordinal
+        frame._periods_count = periods_count
+        return frame
+
+    @classmethod
+    def from_series(cls, series: List[TimeSeries]) -> 'TimeSeriesFrame':
+        """
+        Stacks series over the same range of periods and of the same kind into the frame
+        """
+        if len(series) == 0:
+            raise ValueError('at least one series is expected')
+        first = series[0]
+        for ts in series[1:]:
+            if ts._start_ordinal != first._start_ordinal or ts._end_ordinal != first._end_ordinal:
+                raise ValueError('period ranges are incompatible')
+            if ts._freq != first._freq:
+                raise ValueError('frequencies are incompatible')
+            if ts.kind != first.kind:
+                raise ValueError('kinds are incompatible')
+        values = np.vstack([ts.values for ts in series])
+        return cls._new(values, first._start_ordinal, first._periods_count, first._freq, first.kind)
+
+    def _like(self, values: np.ndarray, kind) -> 'TimeSeriesFrame':
+        return self._new(values, self._start_ordinal, self._periods_count, self._freq, kind)
+
+    @property
+    def _step(self) -> int:
+        return TimeSeries._freq2step[self._freq]
+
+    @property
+    def _end_ordinal(self) -> int:
+        return self._start_ordinal + (self._periods_count - 1) * self._step
+
+    def __validate(self, other):
+        if self._start_ordinal != other._start_ordinal:
+            raise ValueError('start periods are incompatible')
+        if self._end_ordinal != other._end_ordinal:
+            raise ValueError('end periods are incompatible')
+
+    def _binary_op(self, other, values_op, kind_op, reflected=False) -> 'TimeSeriesFrame':
+        if isinstance(other, (TimeSeriesFrame, TimeSeries)):
+            self.__validate(other)
+            if isinstance(other, TimeSeriesFrame) and other.shape != self.shape:
+                raise ValueError('frame shapes are incompatible')
+            if reflected:
+                return self._like(values_op(other._values, self._values), kind_op(other._kind, self._kind))
+            return self._like(values_op(self._values, other._values), kind_op(self._kind, other._kind))
+        elif isinstance(other, (int, float, complex)):
+            if reflected:
+                return self._like(values_op(other, self._values), self._kind)
+            return self._like(values_op(self._values, other), self._kind)
+        else:
+            raise ValueError('argument has incompatible type')
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def shape(self):
+        return self._values.shape
+
+    @property
+    def start_period(self):
+        return pd.Period(ordinal=self._start_ordinal, freq='M')
+
+    @property
+    def end_period(self):
+        return pd.Period(ordinal=self._end_ordinal, freq='M')
+
+    @property
+    def period_size(self):
+        return self._end_ordinal - self._start_ordinal + 1
+
+    def period_range(self):
+        return [pd.Period(ordinal=ordinal, freq='M')
+                for ordinal in range(self._start_ordinal, self._end_ordinal + 1, self._step)]
+
+    def __len__(self):
+        return self._values.shape[0]
+
+    def __getitem__(self, key) -> TimeSeries:
+        if not isinstance(key, int):
+            raise ValueError('Type of `key` is not supported')
+        values = self._values[key].view()
+        values.flags.writeable = False
+        return TimeSeries._new(values, self._start_ordinal, self._periods_count, self._freq, self._kind)
+
+    def series(self) -> List[TimeSeries]:
+        return [self[idx] for idx in range(len(self))]
+
+    def dot(self, weights) -> TimeSeries:
+        """
+        Returns the weighted sum of the series as one matrix-vector product
+
+        :param weights: weight per row of the frame
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != (len(self),):
+            raise ValueError('weights count should be equal to series count')
+        return TimeSeries._new(weights @ self._values,
+                               self._start_ordinal, self._periods_count, self._freq, self._kind)
+
+    def __add__(self, other):
+        return self._binary_op(other, np.add, operator.add)
+
+    def __radd__(self, other):
+        return self._binary_op(other, np.add, operator.add, reflected=True)
+
+    def __sub__(self, other):
+        return self._binary_op(other, np.subtract, operator.sub)
+
+    def __rsub__(self, other):
+        return self._binary_op(other, np.subtract, operator.sub, reflected=True)
+
+    def __mul__(self, other):
+        return self._binary_op(other, np.multiply, operator.mul)
+
+    def __rmul__(self, other):
+        return self._binary_op(other, np.multiply, operator.mul, reflected=True)
+
+    def __truediv__(self, other):
+        return self._binary_op(other, np.true_divide, operator.truediv)
+
+    def pct_change(self):
+        if self._values.shape[1] < 2:
+            raise ValueError('`value` length should be >= 2')
+        vals = np.diff(self._values, axis=1) / self._values[:, :-1]
+        return self._new(vals, self._start_ordinal + self._step, self._periods_count - 1,
+                         self._freq, self._kind.pct_change())
+
+    def cumprod(self):
+        return self._like(self._values.cumprod(axis=1), self._kind.cumprod())
+
+    def ytd(self):
+        """
+        Compounds monthly rates of return within calendar years, see `TimeSeries.ytd`
+        """
+        if self._kind != TimeSeriesKind.DIFF:
+            raise ValueError('incorrect kind')
+        if self._freq != 'M':
+            raise ValueError('incorrect frequency')
+        start_ordinal, buckets = _calendar_buckets(self._values, self._start_ordinal,
+                                                   TimeSeries._freq2step['Y'], fill_value=0.)
+        buckets += 1.
+        values = buckets.prod(axis=-1) - 1.
+        return self._new(values, start_ordinal, values.shape[1], 'Y', TimeSeriesKind.YTD)
+
+    def __repr__(self):
+        return 'TimeSeriesFrame(start_period={}, end_period={}, kind={}, shape={})'.format(
+            self.start_period, self.end_period, self._kind, self.shape
+        )
@@ -1,6 +1,15 @@
+import numpy as np
+import pandas as pd
 import pytest
 from hamcrest.core.base_matcher import BaseMatcher
 
+from cifrum._portfolio.currency import PortfolioCurrencyFactory
+from cifrum._portfolio.portfolio import PortfolioItemsFactory
+from cifrum._sources.registries import CurrencySymbolsRegistry
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol
+from cifrum.common.financial_symbol_id import FinancialSymbolId
+
 decimal_places = 4
 delta = 10 ** (-decimal_places)
 
@@ -23,6 +32,83 @@ def sorted_asc():
     return ListIsSorted()
 
 
+synthetic_period_start = pd.Period('2010-1', freq='M')
+synthetic_period_end = pd.Period('2015-12', freq='M')
+_synthetic_months = (synthetic_period_end - synthetic_period_start).n + 1
+
+
+def _synthetic_symbol(namespace, name, column, values, security_type):
+    periods = pd.period_range(synthetic_period_start, periods=len(values), freq='M')
+    df = pd.DataFrame({'date': periods.to_timestamp(), 'period': periods, column: values})
+
+    def values_func(start, end):
+        return df[(start <= df['period']) & (df['period'] <= end)]
+
+    return FinancialSymbol(identifier=FinancialSymbolId(namespace, name), values=values_func,
+                           adjusted_close=True, currency=Currency.RUB, period=Period.MONTH,
+                           security_type=security_type,
+                           start_period=periods[0], end_period=periods[-1])
+
+
+class _SyntheticInflationSource:
+    def fetch_financial_symbol(self, name):
+        return _synthetic_symbol('infl', name, 'value', np.linspace(.001, .01, num=_synthetic_months),
+                                 SecurityType.INFLATION)
+
+
+class _SyntheticCurrenciesSource:
+    _currency_min_date = {currency.name: pd.Period('1990', freq='D') for currency in Currency}
+
+    def fetch_financial_symbol(self, name):
+        return _synthetic_symbol('cbr', name, 'close', np.ones(_synthetic_months), SecurityType.CURRENCY)
+
+
+def synthetic_portfolio_items_factory() -> PortfolioItemsFactory:
+    """
+    Offline factory of portfolio items in RUB with the inflation growing linearly
+    """
+    currencies_source = _SyntheticCurrenciesSource()
+    return PortfolioItemsFactory(
+        portfolio_currency_factory=PortfolioCurrencyFactory(inflation_source=_SyntheticInflationSource(),
+                                                            cbr_currencies_source=currencies_source),
+        currency_symbols_registry=CurrencySymbolsRegistry(cbr_currencies_source=currencies_source,
+                                                          disk_cache=None))
+
+
+def synthetic_assets(factory: PortfolioItemsFactory, names, seed=0):
+    """
+    Assets with random walk closes over `synthetic_period_start` - `synthetic_period_end`
+    """
+    random_state = np.random.RandomState(seed)
+    return [factory.new_asset(symbol=_synthetic_symbol('micex', name, 'close',
+                                                       100. * np.cumprod(1. + random_state.normal(
+                                                           .01, .05, size=_synthetic_months)),
+                                                       SecurityType.STOCK_ETF),
+                              start_period=synthetic_period_start, end_period=synthetic_period_end,
+                              currency=Currency.RUB)
+            for name in names]
+
+
+class _SymbolInfo:
+    def __init__(self, symbol: FinancialSymbol):
+        self.fin_sym_id = symbol.identifier
+
+
+class SyntheticSymbolsRegistry:
+    """
+    Offline registry of the given symbols, enough for `Cifrum` methods resolving many names
+    """
+
+    def __init__(self, symbols):
+        self.symbols = {s.identifier.format(): s for s in symbols}
+
+    def get_all_infos(self, namespace):
+        return [_SymbolInfo(s) for s in self.symbols.values() if s.namespace == namespace]
+
+    def get_many(self, financial_symbol_ids):
+        return [self.symbols.get(financial_symbol_id.format()) for financial_symbol_id in financial_symbol_ids]
+
+
 def pytest_addoption(parser):
     parser.addoption("--runslow", action="store_true", default=False, help="run slow tests")
 
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cifrum._instance import Cifrum
+from cifrum._portfolio import metrics
+from cifrum._portfolio.return_panel import ReturnPanel
+from conftest import SyntheticSymbolsRegistry, synthetic_assets, synthetic_portfolio_items_factory
+
+
+def _masked_returns(assets_count, months_count, seed=0):
+    random_state = np.random.RandomState(seed)
+    ror = random_state.normal(.01, .05, size=(assets_count, months_count))
+    starts = random_state.randint(0, months_count // 2, size=assets_count)
+    ror[np.arange(months_count) < starts[:, np.newaxis]] = np.nan
+    ror[random_state.uniform(size=ror.shape) < .05] = np.nan
+    return ror
+
+
+@pytest.mark.parametrize('kind', ['cov', 'corr'])
+def test__pairwise_matches_pandas(kind):
+    ror = _masked_returns(assets_count=40, months_count=60)
+    df = pd.DataFrame(ror.T)
+    expected = (df.cov(min_periods=20) if kind == 'cov' else df.corr(min_periods=20)).values
+
+    actual = metrics.pairwise(ror, kind=kind, min_periods=20, chunk_rows=7)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual[~np.isnan(actual)], expected[~np.isnan(expected)], rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(actual, actual.T)
+
+
+def test__correlation():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B', 'C', 'D'], seed=5)
+    cifrum_instance = Cifrum(financial_symbols_registry=SyntheticSymbolsRegistry([a.symbol for a in assets]),
+                             portfolio_currency_factory=None,
+                             portfolio_items_factory=factory,
+                             search=None)
+    names = ['micex/C', 'micex/A', 'micex/D']
+
+    corr = cifrum_instance.correlation(names=names, currency='rub', start_period='2011-1', end_period='2014-12')
+    assert list(corr.index) == names and list(corr.columns) == names
+    offset = (pd.Period('2011-1', freq='M') - assets[0].get_return().start_period).n
+    ror = np.array([a.get_return().values[offset:offset + 48] for a in [assets[2], assets[0], assets[3]]])
+    np.testing.assert_almost_equal(corr.values, np.corrcoef(ror))
+
+    with pytest.raises(ValueError):
+        corr.iloc[0, 1] = 0.
+    corr_copy = corr.copy()
+    corr_copy.iloc[0, 1] = 0.
+    corr_cached = cifrum_instance.correlation(names=names, currency='RUB', start_period='2011-01', end_period='2014-12')
+    assert np.shares_memory(corr_cached.values, corr.values)
+    np.testing.assert_almost_equal(corr_cached.values, np.corrcoef(ror))
+
+    corr_latest = cifrum_instance.correlation(names=names, currency='RUB')
+    corr_current_month = cifrum_instance.correlation(names=names, currency='RUB', start_period='1900-1',
+                                                     end_period=str(pd.Period.now(freq='M')))
+    assert np.shares_memory(corr_latest.values, corr_current_month.values)
+
+    cov = cifrum_instance.correlation(names=names, currency='RUB', kind='cov',
+                                      start_period='2011-1', end_period='2014-12')
+    np.testing.assert_almost_equal(cov.values, np.cov(ror))
+    assert ReturnPanel.from_assets(assets).pairwise(min_periods=100).isnull().all().all()
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cifrum._sources.registries import CurrencySymbolsRegistry
+from cifrum.common.enums import Currency
+
+
+class _CurrenciesSource:
+    _currency_min_date = {currency.name: pd.Period('1990', freq='D') for currency in Currency}
+
+
+class _DiskCache:
+    """
+    Daily rates to RUB, USD misses 2012-3
+    """
+
+    def __init__(self):
+        self.reads = 0
+
+    def read_csv(self, url, **kwargs):
+        self.reads += 1
+        if url.endswith('__index.csv'):
+            return pd.DataFrame({'name': ['USD-RUB', 'EUR-RUB']})
+        if url.endswith('USD-RUB.csv'):
+            dates = pd.date_range('2010-1-1', '2015-12-31', freq='D')
+            dates = dates[dates.to_period('M') != pd.Period('2012-3', freq='M')]
+            close = 30. + np.arange(dates.size) / 100.
+        else:
+            dates = pd.date_range('2011-1-1', '2015-6-30', freq='D')
+            close = 40. + np.arange(dates.size) / 50.
+        return pd.DataFrame({'date': dates, 'close': close, 'nominal': 1})
+
+
+def _period(s):
+    return pd.Period(s, freq='M')
+
+
+def test__rates_are_loaded_once_and_triangulated_through_rub():
+    disk_cache = _DiskCache()
+    csr = CurrencySymbolsRegistry(cbr_currencies_source=_CurrenciesSource(), disk_cache=disk_cache)
+
+    usd_rub = csr.rate(Currency.USD, Currency.RUB, _period('2013-1'), _period('2014-12'))
+    eur_rub = csr.rate(Currency.EUR, Currency.RUB, _period('2013-1'), _period('2014-12'))
+    usd_eur = csr.rate(Currency.USD, Currency.EUR, _period('2013-1'), _period('2014-12'))
+    rub_usd = csr.rate(Currency.RUB, Currency.USD, _period('2013-1'), _period('2014-12'))
+    assert disk_cache.reads == 3
+
+    assert usd_eur.start_period == _period('2013-1') and usd_eur.end_period == _period('2014-12')
+    np.testing.assert_almost_equal(usd_eur.values, usd_rub.values / eur_rub.values)
+    np.testing.assert_almost_equal(rub_usd.values, 1. / usd_rub.values)
+    # the last rate of a month is taken
+    assert usd_rub.values[0] == 30. + ((pd.Timestamp('2013-1-31') - pd.Timestamp('2010-1-1')).days - 31) / 100.
+
+
+def test__rates_out_of_data_range():
+    csr = CurrencySymbolsRegistry(cbr_currencies_source=_CurrenciesSource(), disk_cache=_DiskCache())
+
+    usd_eur = csr.rate(Currency.USD, Currency.EUR, _period('2012-3'), _period('2020-1'))
+    assert usd_eur.start_period == _period('2012-4') and usd_eur.end_period == _period('2015-6')
+
+    df = csr.convert(Currency.USD, Currency.EUR, _period('2010-1'), _period('2020-1'))
+    assert df['period'].min() == _period('2011-1') and df['period'].max() == _period('2015-6')
+    assert _period('2012-3') not in set(df['period'])
+    assert len(df) == (_period('2015-6') - _period('2011-1')).n
+
+    with pytest.raises(ValueError):
+        csr.rate(Currency.USD, Currency.EUR, _period('2011-6'), _period('2013-1'))
+    with pytest.raises(ValueError):
+        csr.rate(Currency.EUR, Currency.RUB, _period('2016-1'), _period('2017-1'))
+
+
+def test__identity_rates_are_not_loaded():
+    csr = CurrencySymbolsRegistry(cbr_currencies_source=_CurrenciesSource(), disk_cache=None)
+    rate = csr.rate(Currency.USD, Currency.USD, _period('1980-1'), _period('2015-1'))
+    assert rate.start_period == _period('1990-1') and rate.end_period == _period('2015-1')
+    np.testing.assert_equal(rate.values, 1.)
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import stat
+import time
+
+import pytest
+from hamcrest import assert_that, has_length
+
+from cifrum._sources.disk_cache import DiskCache
+
+_url = 'https://example.org/data/foo.csv'
+
+
+class _RecordingDiskCache(DiskCache):
+    def __init__(self, cache_dir, ttl_seconds=60, max_bytes=1024 ** 2):
+        super().__init__(cache_dir=cache_dir, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        self.bodies = {}
+        self.requests = []
+
+    def _download(self, url, headers):
+        self.requests.append((url, headers))
+        body, etag = self.bodies[url]
+        if headers.get('If-None-Match') == etag:
+            return None, {'ETag': etag}
+        return body, {'ETag': etag}
+
+
+@pytest.fixture
+def disk_cache(tmpdir):
+    dc = _RecordingDiskCache(cache_dir=str(tmpdir))
+    dc.bodies[_url] = (b'date\tclose\n2015-01-01\t1.0\n2015-02-01\t2.0\n', '"v1"')
+    return dc
+
+
+def test__download_once_within_ttl(disk_cache):
+    df1 = disk_cache.read_csv(_url, sep='\t')
+    df2 = disk_cache.read_csv(_url, sep='\t', parse_dates=['date'])
+
+    assert_that(disk_cache.requests, has_length(1))
+    assert list(df1['close']) == [1., 2.]
+    assert list(df2['close']) == [1., 2.]
+
+
+def test__cache_is_shared_between_instances(disk_cache):
+    disk_cache.read_csv(_url, sep='\t')
+
+    other = _RecordingDiskCache(cache_dir=disk_cache.cache_dir)
+    df = other.read_csv(_url, sep='\t')
+
+    assert_that(other.requests, has_length(0))
+    assert list(df['close']) == [1., 2.]
+
+
+def test__revalidate_with_etag_after_ttl(disk_cache):
+    disk_cache.ttl_seconds = 0
+    disk_cache.read_csv(_url, sep='\t')
+    disk_cache.read_csv(_url, sep='\t')
+
+    assert_that(disk_cache.requests, has_length(2))
+    assert disk_cache.requests[1][1]['If-None-Match'] == '"v1"'
+
+    disk_cache.bodies[_url] = (b'date\tclose\n2015-01-01\t3.0\n', '"v2"')
+    df = disk_cache.read_csv(_url, sep='\t')
+    assert list(df['close']) == [3.]
+
+
+def test__serve_stale_copy_if_server_is_unreachable(disk_cache):
+    disk_cache.ttl_seconds = 0
+    disk_cache.read_csv(_url, sep='\t')
+    disk_cache.bodies.clear()
+
+    def unreachable(url, headers):
+        raise OSError('unreachable')
+    disk_cache._download = unreachable
+
+    df = disk_cache.read_csv(_url, sep='\t')
+    assert list(df['close']) == [1., 2.]
+
+
+def test__evict_least_recently_used_entries(disk_cache):
+    urls = ['https://example.org/data/{}.csv'.format(i) for i in range(3)]
+    for idx, url in enumerate(urls):
+        disk_cache.bodies[url] = (b'close\n' + b'1.0\n' * 100, '"{}"'.format(idx))
+        disk_cache.fetch(url)
+        past = time.time() - 100 + idx
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        for name in os.listdir(disk_cache.cache_dir):
+            if name.startswith(key):
+                os.utime(os.path.join(disk_cache.cache_dir, name), (past, past))
+
+    disk_cache.max_bytes = 1300
+    disk_cache.bodies[_url] = (b'close\n' + b'2.0\n' * 100, '"new"')
+    disk_cache.fetch(_url)
+
+    disk_cache.requests.clear()
+    disk_cache.fetch(urls[0])
+    disk_cache.fetch(_url)
+    assert [url for url, _ in disk_cache.requests] == [urls[0]]
+
+
+def test__only_raw_responses_are_stored(disk_cache):
+    disk_cache.read_csv(_url, sep='\t')
+    df = disk_cache.read_csv(_url, sep='\t', parse_dates=['date'])
+
+    assert df['date'].dtype.kind == 'M'
+    assert sorted(name.split('.', 1)[1] for name in os.listdir(disk_cache.cache_dir)
+                  if not name.endswith('.lock')) == ['body', 'meta']
+
+
+def test__cache_directory_is_private(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), 'shared')
+    os.makedirs(cache_dir)
+    os.chmod(cache_dir, 0o777)
+
+    dc = _RecordingDiskCache(cache_dir=cache_dir)
+    dc.bodies[_url] = (b'close\n1.0\n', '"v1"')
+    dc.fetch(_url)
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, 'geteuid') or os.geteuid() != 0, reason='changing the owner needs root')
+def test__cache_is_disabled_in_directory_of_other_user(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), 'other')
+    os.makedirs(cache_dir, mode=0o700)
+    os.chown(cache_dir, 12345, 12345)
+
+    with pytest.warns(UserWarning):
+        assert not DiskCache(cache_dir=cache_dir).enabled
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from cifrum._portfolio.frontier import EfficientFrontier, _project
+from cifrum.common.enums import Currency
+from conftest import synthetic_assets, synthetic_period_end, synthetic_period_start, synthetic_portfolio_items_factory
+
+_names = ['A', 'B', 'C', 'D', 'E', 'F']
+
+
+def _portfolio(factory, assets, weights):
+    return factory.new_portfolio(assets_to_weight=dict(zip(assets, weights)),
+                                 start_period=synthetic_period_start, end_period=synthetic_period_end,
+                                 currency=Currency.RUB)
+
+
+def test__project():
+    lower, upper = np.zeros(4), np.full(4, .4)
+    w = _project(np.array([.9, .3, -.2, .1]), lower, upper)
+    np.testing.assert_almost_equal(w, [.4, .4, 0., .2])
+
+    w = _project(np.array([1., 2., 3., 4.]), lower, upper)
+    assert abs(w.sum() - 1.) < 1e-12
+    assert np.all(w >= lower) and np.all(w <= upper)
+
+
+def test__optimal_portfolios():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, _names, seed=1)
+    ef = EfficientFrontier(_portfolio(factory, assets, np.full(len(_names), 1. / len(_names))), upper=.4)
+
+    weights_random = np.random.RandomState(0).dirichlet(np.ones(len(_names)), size=2000)
+    weights_random = weights_random[(weights_random <= .4).all(axis=1)]
+    ror_random = weights_random @ ef._ror_assets
+
+    min_variance = ef.min_variance()
+    assert abs(min_variance.weights.sum() - 1.) < 1e-9
+    assert np.all(min_variance.weights >= 0.) and np.all(min_variance.weights <= .4 + 1e-12)
+    assert min_variance.std <= ror_random.std(axis=1).min()
+
+    p = _portfolio(factory, assets, min_variance.weights)
+    np.testing.assert_almost_equal(min_variance.cagr, p.cagr().value)
+    np.testing.assert_almost_equal(min_variance.risk, p.risk().value)
+
+    max_sharpe = ef.max_sharpe()
+    assert max_sharpe.mean / max_sharpe.std >= (ror_random.mean(axis=1) / ror_random.std(axis=1)).max()
+    assert max_sharpe.mean / max_sharpe.std >= min_variance.mean / min_variance.std
+
+    mean = (min_variance.mean + max_sharpe.mean) / 2.
+    target = ef.target_return(mean)
+    assert abs(target.mean - mean) < 1e-8
+    ror_random_above = ror_random[ror_random.mean(axis=1) >= mean]
+    assert target.std <= ror_random_above.std(axis=1).min()
+
+    frontier = ef.frontier(points=5)
+    assert [point.std for point in frontier] == sorted(point.std for point in frontier)
+
+    with pytest.raises(ValueError):
+        ef.target_return(1.)
+
+
+def test__optimal_portfolios_do_not_depend_on_calls_before():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, _names, seed=2)
+    portfolio = _portfolio(factory, assets, np.full(len(_names), 1. / len(_names)))
+
+    ef = EfficientFrontier(portfolio, upper=.4)
+    ef.max_sharpe()
+    min_variance = ef.min_variance()
+    target = ef.target_return(min_variance.mean + 1e-4)
+
+    ef_fresh = EfficientFrontier(portfolio, upper=.4)
+    np.testing.assert_array_equal(min_variance.weights, ef_fresh.min_variance().weights)
+    np.testing.assert_array_equal(target.weights, ef_fresh.target_return(min_variance.mean + 1e-4).weights)
+
+
+def test__infeasible_bounds():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, _names)
+    with pytest.raises(ValueError):
+        EfficientFrontier(_portfolio(factory, assets, np.full(len(_names), 1. / len(_names))), upper=.1)
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+import pinject
+import pytest
+
+import cifrum as lib
+from cifrum._search import _Search
+from cifrum._sources.disk_cache import DiskCache
+from cifrum._sources.registries import CurrencySymbolsRegistry
+
+
+def test__import_does_not_touch_network():
+    env = dict(os.environ, DATA_URL='http://cifrum.invalid/')
+    completed = subprocess.run([sys.executable, '-c', 'import cifrum; cifrum.portfolio_asset'], env=env)
+    assert completed.returncode == 0
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='module __getattr__ is available since Python 3.7')
+def test__instance_is_created_on_first_access(monkeypatch):
+    monkeypatch.setattr(lib, '_cifrum_instance', None)
+    import cifrum
+    assert cifrum._cifrum_instance is None
+
+    from cifrum import cifrum_instance
+    assert isinstance(cifrum_instance, lib.Cifrum)
+    assert cifrum_instance is lib._cifrum_instance
+    assert lib.cifrum_instance is cifrum_instance
+
+
+def test__instance_construction_does_not_load_data(monkeypatch):
+    def read_csv(self, url: str, **kwargs):
+        raise AssertionError('unexpected access to {}'.format(url))
+    monkeypatch.setattr(DiskCache, 'read_csv', read_csv)
+
+    obj_graph = pinject.new_object_graph(binding_specs=[lib.BindingSpec()], modules=lib._graph_modules)
+    obj_graph.provide(lib.Cifrum)
+    obj_graph.provide(_Search)
+    obj_graph.provide(CurrencySymbolsRegistry)
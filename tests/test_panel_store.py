@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+from hamcrest import assert_that, contains, has_length
+
+from cifrum._sources.panel_store import PanelStore
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol
+from cifrum.common.financial_symbol_id import FinancialSymbolId
+from conftest import synthetic_portfolio_items_factory
+
+
+def _financial_symbol(name, start_period, values, missing=()):
+    dates = pd.date_range(start_period, periods=len(values), freq='M')
+    df = pd.DataFrame({'date': dates, 'period': dates.to_period(freq='M'), 'close': np.array(values, dtype=float)})
+    df = df[~df['period'].isin([pd.Period(p, freq='M') for p in missing])]
+
+    def values_func(start, end):
+        return df[(start <= df['period']) & (df['period'] <= end)].copy()
+
+    return FinancialSymbol(identifier=FinancialSymbolId('foo', name),
+                           values=values_func,
+                           adjusted_close=True,
+                           currency=Currency.RUB,
+                           period=Period.MONTH,
+                           security_type=SecurityType.STOCK_ETF,
+                           start_period=pd.Period(dates[0], freq='M'),
+                           end_period=pd.Period(dates[-1], freq='M'))
+
+
+def test__build_and_read_panel(tmpdir):
+    store = PanelStore(panel_dir=str(tmpdir))
+    assert store.open('foo') is None
+
+    store.build('foo', [_financial_symbol('B', '2015-3-1', [3., 4., 5.]),
+                        _financial_symbol('A', '2015-1-1', [1., 2., 3., 4.])])
+
+    panel = PanelStore(panel_dir=str(tmpdir)).open('foo')
+    assert_that(panel.symbols, contains('A', 'B'))
+    assert panel.values.shape == (2, 5)
+    assert panel.period_start == pd.Period('2015-1', freq='M')
+
+    period_start, vals = panel.monthly_values('B', pd.Period('2000-1', freq='M'), pd.Period('2015-4', freq='M'))
+    assert period_start == pd.Period('2015-3', freq='M')
+    np.testing.assert_equal(vals, [3., 4.])
+
+    period_start, vals = panel.monthly_values('A', pd.Period('2015-5', freq='M'), pd.Period('2020-1', freq='M'))
+    assert period_start is None
+    assert_that(vals, has_length(0))
+
+
+def test__rebuild_replaces_panel(tmpdir):
+    store = PanelStore(panel_dir=str(tmpdir))
+    store.build('foo', [_financial_symbol('A', '2015-1-1', [1., 2.])])
+    store.build('foo', [_financial_symbol('A', '2015-1-1', [1., 2., 3.])])
+
+    assert store.open('foo').values.shape == (1, 3)
+    assert_that([p for p in tmpdir.listdir() if p.ext == '.f8'], has_length(1))
+
+
+def test__symbol_reads_attached_panel(tmpdir):
+    store = PanelStore(panel_dir=str(tmpdir))
+    panel = store.build('foo', [_financial_symbol('A', '2015-1-1', [1., 2., 3., 4.])])
+
+    def values_func(start, end):
+        raise AssertionError('the panel should be read instead')
+
+    sym = FinancialSymbol(identifier=FinancialSymbolId('foo', 'A'), values=values_func,
+                          adjusted_close=True, currency=Currency.RUB, period=Period.MONTH,
+                          security_type=SecurityType.STOCK_ETF,
+                          start_period=pd.Period('2015-1', freq='M'), end_period=pd.Period('2015-4', freq='M'))
+    assert sym.attach_panel(panel)
+
+    period_start, vals = sym.monthly_values(pd.Period('2015-2', freq='M'), pd.Period('2015-3', freq='M'))
+    assert period_start == pd.Period('2015-2', freq='M')
+    np.testing.assert_equal(vals, [2., 3.])
+
+
+def test__values_are_not_read_from_panel(tmpdir):
+    store = PanelStore(panel_dir=str(tmpdir))
+    sym = _financial_symbol('A', '2015-1-1', [1., 2., 3., 4.])
+    assert sym.attach_panel(store.build('foo', [sym]))
+
+    vals = sym.values(pd.Period('2015-2', freq='M'), pd.Period('2015-3', freq='M'))
+    assert_that(list(vals.columns), contains('period', 'close'))
+    assert_that(list(vals['period']), contains(pd.Period('2015-2', freq='M'), pd.Period('2015-3', freq='M')))
+
+
+def test__stale_panel_is_ignored(tmpdir):
+    store = PanelStore(panel_dir=str(tmpdir))
+    panel = store.build('foo', [_financial_symbol('A', '2015-1-1', [1., 2., 3.])])
+
+    assert not _financial_symbol('A', '2015-1-1', [1., 2., 3., 4.]).attach_panel(panel)
+    assert _financial_symbol('A', '2015-1-1', [1., 2., 3.]).attach_panel(panel)
+
+    assert PanelStore(panel_dir=str(tmpdir), ttl_seconds=60).open('foo') is not None
+    assert PanelStore(panel_dir=str(tmpdir), ttl_seconds=-1).open('foo') is None
+
+
+def test__missing_month_is_nan_in_both_paths_and_asset_fails(tmpdir):
+    sym = _financial_symbol('A', '2010-1-1', np.arange(1., 13.), missing=['2010-6'])
+    period_start, vals = sym.monthly_values(pd.Period('2010-1', freq='M'), pd.Period('2010-12', freq='M'))
+    assert period_start == pd.Period('2010-1', freq='M')
+    np.testing.assert_equal(vals, [1., 2., 3., 4., 5., np.nan, 7., 8., 9., 10., 11., 12.])
+
+    factory = synthetic_portfolio_items_factory()
+    with pytest.raises(ValueError, match='2010-06'):
+        factory.new_asset(symbol=sym, start_period=pd.Period('2010-1', freq='M'),
+                          end_period=pd.Period('2010-12', freq='M'), currency=Currency.RUB)
+
+    store = PanelStore(panel_dir=str(tmpdir))
+    sym_panel = _financial_symbol('A', '2010-1-1', np.arange(1., 13.), missing=['2010-6'])
+    assert sym_panel.attach_panel(store.build('foo', [sym]))
+    _, vals_panel = sym_panel.monthly_values(pd.Period('2010-1', freq='M'), pd.Period('2010-12', freq='M'))
+    np.testing.assert_equal(vals_panel, vals)
+    with pytest.raises(ValueError, match='2010-06'):
+        factory.new_asset(symbol=sym_panel, start_period=pd.Period('2010-1', freq='M'),
+                          end_period=pd.Period('2010-12', freq='M'), currency=Currency.RUB)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from cifrum._instance import Cifrum
+from conftest import SyntheticSymbolsRegistry, synthetic_assets, synthetic_period_start, \
+    synthetic_portfolio_items_factory
+
+
+def test__duplicate_names_give_separate_assets():
+    factory = synthetic_portfolio_items_factory()
+    asset, = synthetic_assets(factory, ['A'], seed=5)
+    cifrum_instance = Cifrum(financial_symbols_registry=SyntheticSymbolsRegistry([asset.symbol]),
+                             portfolio_currency_factory=None,
+                             portfolio_items_factory=factory,
+                             search=None)
+
+    assets = cifrum_instance.portfolio_asset(names=['micex/A', 'micex/NONEXISTING', 'micex/A'], currency='RUB',
+                                             start_period=str(synthetic_period_start + 1), end_period='2015-12')
+    assert len(assets) == 2
+    assert assets[0] is not assets[1]
+    np.testing.assert_array_equal(assets[0].close().values, assets[1].close().values)
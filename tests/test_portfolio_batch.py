@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from cifrum.common.enums import Currency
+from conftest import synthetic_assets, synthetic_period_end, synthetic_period_start, synthetic_portfolio_items_factory
+
+
+def test__statistics_match_the_ones_of_portfolio():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B', 'C'])
+    weights = np.array([[.2, .3, .5], [1., 0., 0.], [.6, .2, .2]])
+    batch = factory.new_portfolio_batch(assets=assets, weights=weights,
+                                        start_period=synthetic_period_start, end_period=synthetic_period_end,
+                                        currency=Currency.RUB)
+    assert len(batch) == 3
+
+    cagr, cagr_real, risk = batch.cagr(), batch.cagr(real=True), batch.risk()
+    ror_cumulative = batch.get_return(kind='cumulative', real=True)
+    for idx, row in enumerate(weights):
+        p = factory.new_portfolio(assets_to_weight=dict(zip(assets, row)),
+                                  start_period=synthetic_period_start, end_period=synthetic_period_end,
+                                  currency=Currency.RUB)
+        np.testing.assert_almost_equal(cagr[idx], p.cagr().value)
+        np.testing.assert_almost_equal(cagr_real[idx], p.cagr(real=True).value)
+        np.testing.assert_almost_equal(risk[idx], p.risk().value)
+        np.testing.assert_almost_equal(ror_cumulative[idx], p.get_return(kind='cumulative', real=True).values)
+        assert batch.start_period == p.get_return().start_period
+
+
+def test__weights_should_match_assets():
+    factory = synthetic_portfolio_items_factory()
+    with pytest.raises(ValueError):
+        factory.new_portfolio_batch(assets=synthetic_assets(factory, ['A', 'B', 'C']), weights=np.ones((2, 2)),
+                                    start_period=synthetic_period_start, end_period=synthetic_period_end,
+                                    currency=Currency.RUB)
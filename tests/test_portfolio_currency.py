@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from hamcrest import assert_that, has_length, same_instance
+
+from cifrum._portfolio.currency import PortfolioCurrencyFactory
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol
+from cifrum.common.financial_symbol_id import FinancialSymbolId
+
+
+class _Source:
+    def __init__(self, namespace, security_type, column):
+        self.namespace = namespace
+        self.security_type = security_type
+        self.column = column
+        self.requests = []
+
+    def fetch_financial_symbol(self, name):
+        periods = pd.period_range('2010-1', '2015-12', freq='M')
+        df = pd.DataFrame({'date': periods.to_timestamp(), 'period': periods,
+                           self.column: np.arange(1, len(periods) + 1) / 1000.})
+
+        def values(start_period, end_period):
+            self.requests.append((start_period, end_period))
+            return df[(start_period <= df['period']) & (df['period'] <= end_period)]
+
+        return FinancialSymbol(identifier=FinancialSymbolId(self.namespace, name), values=values,
+                               adjusted_close=False, currency=Currency[name], period=Period.MONTH,
+                               security_type=self.security_type,
+                               start_period=periods[0], end_period=periods[-1])
+
+
+def test__currency_is_shared_and_inflation_is_loaded_once():
+    inflation_source = _Source('infl', SecurityType.INFLATION, 'value')
+    factory = PortfolioCurrencyFactory(inflation_source=inflation_source,
+                                       cbr_currencies_source=_Source('cbr', SecurityType.CURRENCY, 'close'))
+
+    pc = factory.new(Currency.USD)
+    assert_that(factory.new(Currency.USD), same_instance(pc))
+
+    ts1 = pc.inflation(kind='values', start_period=pd.Period('2011-1', freq='M'),
+                       end_period=pd.Period('2011-3', freq='M'))
+    ts2 = pc.inflation(kind='values', start_period=pd.Period('2009-1', freq='M'),
+                       end_period=pd.Period('2010-2', freq='M'))
+
+    assert_that(inflation_source.requests, has_length(1))
+    np.testing.assert_almost_equal(ts1.values, [.013, .014, .015])
+    assert ts2.start_period == pd.Period('2010-1', freq='M')
+    np.testing.assert_almost_equal(ts2.values, [.001, .002])
+
+
+def test__currency_is_built_again_once_expired():
+    inflation_source = _Source('infl', SecurityType.INFLATION, 'value')
+    factory = PortfolioCurrencyFactory(inflation_source=inflation_source,
+                                       cbr_currencies_source=_Source('cbr', SecurityType.CURRENCY, 'close'),
+                                       ttl_seconds=-1)
+
+    pc = factory.new(Currency.USD)
+    assert factory.new(Currency.USD) is not pc
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from hamcrest import assert_that, contains
+
+from cifrum._portfolio import metrics
+from cifrum._portfolio.metrics_cache import MetricsCache
+from cifrum.common.enums import Currency
+from conftest import synthetic_assets, synthetic_period_end, synthetic_period_start, synthetic_portfolio_items_factory
+
+
+def _portfolio():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B'])
+    return factory.new_portfolio(assets_to_weight={assets[0]: .4, assets[1]: .6},
+                                 start_period=synthetic_period_start, end_period=synthetic_period_end,
+                                 currency=Currency.RUB)
+
+
+def test__cagr_for_many_horizons():
+    p = _portfolio()
+    ror = p.get_return().values
+    inflation = p.inflation(kind='values').values
+
+    cagr = p.cagr(years_ago=[1, 3, 10])
+    assert_that(list(cagr.keys()), contains(1, 3, 10))
+    np.testing.assert_almost_equal(cagr[3].value, np.prod(ror[-36:] + 1.) ** (1 / 3) - 1.)
+    np.testing.assert_almost_equal(cagr[10].value, p.cagr().value)
+    np.testing.assert_almost_equal(p.cagr().value, np.prod(ror + 1.) ** (12 / ror.size) - 1.)
+
+    cagr_real = p.cagr(years_ago=[1, 3, 10], real=True)
+    np.testing.assert_almost_equal(cagr_real[1].value,
+                                   (np.prod(ror[-12:] + 1.) / np.prod(inflation[-12:] + 1.)) - 1.)
+    np.testing.assert_almost_equal(cagr_real[3].value, p.cagr(years_ago=3, real=True).value)
+    np.testing.assert_almost_equal(cagr_real[10].value, p.cagr(real=True).value)
+
+
+def test__rolling():
+    p = _portfolio()
+    ror = p.get_return(real=True).values
+
+    cagr = p.rolling(window_months=24, real=True)
+    assert cagr.start_period == p.get_return().start_period + 23
+    assert cagr.end_period == p.get_return().end_period
+    np.testing.assert_almost_equal(cagr.values, [np.prod(ror[i:i + 24] + 1.) ** .5 - 1. for i in range(cagr.size)])
+
+    risk = p.rolling(window_months=24, metric='risk', real=True)
+    np.testing.assert_almost_equal(risk.values, [metrics.risk(ror[i:i + 24]) for i in range(risk.size)])
+
+    with pytest.raises(ValueError):
+        p.rolling(window_months=ror.size + 1)
+
+
+def test__heatmap():
+    p = _portfolio()
+    ror = p.get_return()
+
+    heatmap = p.heatmap(metric='cumulative')
+    assert_that(list(heatmap.columns), contains(1, 2, 3, 4, 5))
+    assert heatmap.index[0] == ror.start_period
+    np.testing.assert_almost_equal(heatmap[3].values[:-35], p.rolling(window_months=36, metric='cumulative').values)
+    assert np.isnan(heatmap[3].values[-35:]).all()
+    np.testing.assert_almost_equal(heatmap.loc[ror.start_period, 5], np.prod(ror.values[:60] + 1.) - 1.)
+
+
+def test__metrics_are_cached():
+    p = _portfolio()
+    ror = p.get_return()
+    p.risk()
+    p.cagr(years_ago=[1, 3], real=True)
+    p.cagr(years_ago=[1, 3], real=True)
+    assert p.metrics_cache.stats == {'hits': 3, 'misses': 3, 'entries': 3}
+
+    ror[0] = 100.
+    assert p.get_return().values[0] != 100.
+
+    p.weights = [1., 0.]
+    p.invalidate_metrics()
+    p.get_return()
+    assert p.metrics_cache.stats == {'hits': 4, 'misses': 4, 'entries': 1}
+
+
+def test__metrics_cache_drops_least_recently_used():
+    cache = MetricsCache(max_entries=2)
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 0)
+    cache.get('c', lambda: 3)
+    assert cache.get('a', lambda: 0) == 1
+    assert cache.get('b', lambda: 0) == 0
+    assert cache.stats == {'hits': 2, 'misses': 4, 'entries': 2}
+
+
+def test__asset_close_is_read_only_view():
+    asset = synthetic_assets(synthetic_portfolio_items_factory(), ['A'])[0]
+    close = asset.close()
+    close_value = close.values[0]
+
+    # the values are shared with the asset, writing to them fails, the item assignment copies them first
+    with pytest.raises(ValueError):
+        close.values[0] = 0.
+    close[0] = 0.
+    close_copy = asset.close().copy()
+    close_copy.values[0] = 0.
+    assert asset.close().values[0] == close_value
+
+
+def test__asset_metrics_match_the_ones_of_single_asset_portfolio():
+    factory = synthetic_portfolio_items_factory()
+    asset = synthetic_assets(factory, ['A'])[0]
+    p = factory.new_portfolio(assets_to_weight={asset: 1.},
+                              start_period=synthetic_period_start, end_period=synthetic_period_end,
+                              currency=Currency.RUB)
+
+    def new_portfolio(*args, **kwargs):
+        raise AssertionError('asset metrics should not build a portfolio')
+
+    factory.new_portfolio = new_portfolio
+    np.testing.assert_almost_equal(asset.risk().value, p.risk().value)
+    np.testing.assert_almost_equal(asset.risk(period='month').value, p.risk(period='month').value)
+    np.testing.assert_almost_equal(asset.cagr(real=True).value, p.cagr(real=True).value)
+    cagr = asset.cagr(years_ago=[1, 3])
+    np.testing.assert_almost_equal(cagr[3].value, p.cagr(years_ago=3).value)
@@ -0,0 +1,104 @@
+import urllib.error
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cifrum._instance import Cifrum
+from cifrum._portfolio import metrics
+from cifrum._portfolio.return_panel import ReturnPanel
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol
+from cifrum.common.financial_symbol_id import FinancialSymbolId
+from conftest import SyntheticSymbolsRegistry, _synthetic_symbol, synthetic_assets, synthetic_period_start, \
+    synthetic_portfolio_items_factory
+
+
+def test__masked_metrics_match_assets():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B', 'C'], seed=3)
+    panel = ReturnPanel.from_assets(assets)
+    # months out of the period range of the first asset
+    panel.values[0, :13] = np.nan
+    short_ror = assets[0].get_return()[13:]
+
+    assert panel.names == ['micex/A', 'micex/B', 'micex/C']
+    np.testing.assert_array_equal(panel.observations(), [short_ror.size, panel.values.shape[1], panel.values.shape[1]])
+
+    cagr = metrics.masked(panel.values, 'cagr')
+    risk = metrics.masked(panel.values, 'risk')
+    np.testing.assert_almost_equal(cagr[0], metrics.series_cagr(short_ror).value)
+    np.testing.assert_almost_equal(risk[0], metrics.series_risk(short_ror).value)
+    for a, a_cagr, a_risk in list(zip(assets, cagr, risk))[1:]:
+        np.testing.assert_almost_equal(a_cagr, a.cagr().value)
+        np.testing.assert_almost_equal(a_risk, a.risk().value)
+
+    wealth = np.cumprod(short_ror.values + 1.)
+    max_drawdown = (1. - wealth / np.maximum(np.maximum.accumulate(wealth), 1.)).max()
+    np.testing.assert_almost_equal(metrics.masked(panel.values, 'max_drawdown')[0], max_drawdown)
+
+
+def test__screen():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B', 'C', 'D', 'E'], seed=4)
+    short = _synthetic_symbol('micex', 'SHORT', 'close', [1., 1.1, 1.2], SecurityType.STOCK_ETF)
+    inflation = _synthetic_symbol('micex', 'INFL', 'value', np.full(20, .01), SecurityType.INFLATION)
+    registry = SyntheticSymbolsRegistry([a.symbol for a in assets] + [short, inflation])
+    cifrum_instance = Cifrum(financial_symbols_registry=registry,
+                             portfolio_currency_factory=None,
+                             portfolio_items_factory=factory,
+                             search=None)
+
+    start_period = str(synthetic_period_start + 1)
+    df = cifrum_instance.screen(namespace='micex', currency='RUB', metrics=['cagr', 'risk', 'months'],
+                                start_period=start_period, end_period='2015-12', batch_size=2)
+    assert list(df.columns) == ['cagr', 'risk', 'months']
+    assert list(df.index) == ['micex/A', 'micex/B', 'micex/C', 'micex/D', 'micex/E']
+
+    np.testing.assert_almost_equal(df['cagr'].values, [a.cagr().value for a in assets])
+    np.testing.assert_almost_equal(df['risk'].values, [a.risk().value for a in assets])
+    assert (df['months'] == (pd.Period('2015-12', freq='M') - synthetic_period_start).n).all()
+
+
+def _failing_symbol(name, error):
+    def values_func(start, end):
+        raise error
+
+    return FinancialSymbol(identifier=FinancialSymbolId('micex', name), values=values_func,
+                           adjusted_close=True, currency=Currency.RUB, period=Period.MONTH,
+                           security_type=SecurityType.STOCK_ETF,
+                           start_period=synthetic_period_start, end_period=pd.Period('2015-12', freq='M'))
+
+
+@pytest.mark.parametrize('batch_size', [1, 2])
+def test__screen_reports_symbols_failed_to_load(batch_size):
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B'], seed=4)
+    http_error = urllib.error.HTTPError('https://example.com', 503, 'Service Unavailable', {}, None)
+    url_error = urllib.error.URLError('connection refused')
+    failing = [_failing_symbol('HTTP', http_error), _failing_symbol('URL', url_error)]
+    registry = SyntheticSymbolsRegistry([assets[0].symbol] + failing + [assets[1].symbol])
+    cifrum_instance = Cifrum(financial_symbols_registry=registry,
+                             portfolio_currency_factory=None,
+                             portfolio_items_factory=factory,
+                             search=None)
+
+    df = cifrum_instance.screen(namespace='micex', currency='RUB', metrics=('cagr', 'months'),
+                                start_period=str(synthetic_period_start + 1), end_period='2015-12',
+                                batch_size=batch_size)
+    assert list(df.index) == ['micex/A', 'micex/HTTP', 'micex/URL', 'micex/B']
+    np.testing.assert_almost_equal(df['cagr'].values[[0, 3]], [a.cagr().value for a in assets])
+    assert df.loc[['micex/HTTP', 'micex/URL']].isnull().all(axis=None)
+
+
+def test__screen_does_not_hide_programming_errors():
+    factory = synthetic_portfolio_items_factory()
+    registry = SyntheticSymbolsRegistry([_failing_symbol('BUG', KeyError('close'))])
+    cifrum_instance = Cifrum(financial_symbols_registry=registry,
+                             portfolio_currency_factory=None,
+                             portfolio_items_factory=factory,
+                             search=None)
+
+    with pytest.raises(KeyError):
+        cifrum_instance.screen(namespace='micex', currency='RUB', start_period=str(synthetic_period_start + 1),
+                               end_period='2015-12')
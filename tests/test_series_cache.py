@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from hamcrest import assert_that, has_length
+
+from cifrum._sources.series_cache import SeriesCache
+
+
+def _load_values(periods_count=24):
+    dates = pd.date_range('2015-1-1', periods=periods_count, freq='M')
+    return pd.DataFrame({'date': dates, 'close': np.arange(1., periods_count + 1.)})
+
+
+def test__slice_by_period_range():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _load_values()
+
+    sc = SeriesCache()
+    vs1 = sc.get('foo', loader).slice(pd.Period('2015-3', freq='M'), pd.Period('2015-5', freq='M'))
+    vs2 = sc.get('foo', loader).slice(pd.Period('2014-1', freq='M'), pd.Period('2015-2', freq='M'))
+
+    assert_that(loads, has_length(1))
+    np.testing.assert_equal(vs1['close'].values, [3., 4., 5.])
+    np.testing.assert_equal(vs2['close'].values, [1., 2.])
+    assert sc.stats['hits'] == 1
+    assert sc.stats['misses'] == 1
+
+
+def test__expired_series_are_loaded_again():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _load_values()
+
+    sc = SeriesCache(ttl_seconds=60)
+    sc.get('foo', loader)
+    sc.get('foo', loader)
+    assert_that(loads, has_length(1))
+
+    sc = SeriesCache(ttl_seconds=-1)
+    sc.get('foo', loader)
+    sc.get('foo', loader)
+    assert_that(loads, has_length(3))
+    assert sc.stats['entries'] == 1
+
+
+def test__unsorted_values_are_sorted():
+    sc = SeriesCache()
+    vals = sc.get('foo', lambda: _load_values().iloc[::-1]) \
+        .slice(pd.Period('2015-1', freq='M'), pd.Period('2015-3', freq='M'))
+    np.testing.assert_equal(vals['close'].values, [1., 2., 3.])
+
+
+def test__evict_least_recently_used_series():
+    entry_nbytes = SeriesCache().get('foo', _load_values).nbytes
+
+    sc = SeriesCache(max_bytes=entry_nbytes * 2)
+    sc.get('foo', _load_values)
+    sc.get('bar', _load_values)
+    sc.get('foo', _load_values)
+    sc.get('baz', _load_values)
+
+    assert sc.stats['entries'] == 2
+    assert sc.stats['evictions'] == 1
+    assert sc.stats['nbytes'] <= sc.max_bytes
+
+    sc.get('foo', _load_values)
+    assert sc.stats['misses'] == 3
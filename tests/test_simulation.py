@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from cifrum._portfolio import simulation
+from cifrum._portfolio.simulation import simulate
+from cifrum.common.enums import Currency
+from conftest import synthetic_assets, synthetic_period_end, synthetic_period_start, synthetic_portfolio_items_factory
+
+
+def test__constant_rate_of_return():
+    result = simulate(np.full(10, .01), paths_count=30, horizon_months=24, method='bootstrap')
+    np.testing.assert_almost_equal(result.wealth[2], 1.01 ** np.arange(1, 25))
+    np.testing.assert_almost_equal(result.cagr, [1.01 ** 12 - 1.] * 5)
+    np.testing.assert_almost_equal(result.max_drawdown, [0.] * 5)
+
+
+@pytest.mark.parametrize('method', ['bootstrap', 'parametric'])
+def test__results_do_not_depend_on_processes(method):
+    ror = np.random.RandomState(0).normal(.01, .05, size=60)
+    result1 = simulate(ror, paths_count=250, horizon_months=36, method=method, seed=3,
+                       max_workers=1, paths_per_chunk=100)
+    result2 = simulate(ror, paths_count=250, horizon_months=36, method=method, seed=3,
+                       max_workers=2, paths_per_chunk=100)
+    np.testing.assert_equal(result1.wealth, result2.wealth)
+    np.testing.assert_equal(result1.cagr, result2.cagr)
+    np.testing.assert_equal(result1.max_drawdown, result2.max_drawdown)
+
+    result3 = simulate(ror, paths_count=250, horizon_months=36, method=method, seed=4,
+                       max_workers=1, paths_per_chunk=100)
+    assert not np.array_equal(result1.cagr, result3.cagr)
+
+
+def test__chunks_run_in_this_process_by_default(monkeypatch):
+    def no_process_pool(*args, **kwargs):
+        raise AssertionError('process pool should be opted in')
+
+    monkeypatch.setattr(simulation, 'ProcessPoolExecutor', no_process_pool)
+    result = simulate(np.full(10, .01), paths_count=250, horizon_months=12, paths_per_chunk=100)
+    assert result.wealth.shape == (5, 12)
+
+
+def test__portfolio_simulate():
+    factory = synthetic_portfolio_items_factory()
+    assets = synthetic_assets(factory, ['A', 'B'])
+    p = factory.new_portfolio(assets_to_weight={assets[0]: .5, assets[1]: .5},
+                              start_period=synthetic_period_start, end_period=synthetic_period_end,
+                              currency=Currency.RUB)
+
+    result = p.simulate(n_paths=500, horizon_months=120, method='parametric', real=True)
+    assert result.wealth.shape == (5, 120)
+    assert np.all(np.diff(result.wealth, axis=0) >= 0.)
+    assert np.all(np.diff(result.cagr) >= 0.)
+    assert np.all((0. <= result.max_drawdown) & (result.max_drawdown <= 1.))
+
+    with pytest.raises(ValueError):
+        p.simulate(n_paths=10, horizon_months=12, method='garch')
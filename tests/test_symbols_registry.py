@@ -0,0 +1,177 @@
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from hamcrest import assert_that, contains, has_length, none, same_instance
+
+from cifrum._sources.base_classes import FinancialSymbolsSource
+from cifrum._sources.micex_stocks_source import MicexStocksSource
+from cifrum._sources.panel_store import PanelStore
+from cifrum._sources.registries import FinancialSymbolsRegistry
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol
+from cifrum.common.financial_symbol_id import FinancialSymbolId
+from cifrum.common.financial_symbol_info import FinancialSymbolInfo
+
+
+class _Source(FinancialSymbolsSource):
+    def __init__(self, namespace, names):
+        super().__init__(namespace)
+        self.names = names
+        self.fetched = []
+
+    def fetch_financial_symbol(self, name):
+        self.fetched.append(name)
+        if name not in self.names:
+            return None
+        return FinancialSymbol(identifier=FinancialSymbolId(self.namespace, name),
+                               values=lambda start, end: pd.DataFrame(),
+                               adjusted_close=True, currency=Currency.RUB, period=Period.MONTH,
+                               security_type=SecurityType.STOCK_ETF,
+                               start_period=pd.Period('2015-1', freq='M'), end_period=pd.Period('2016-1', freq='M'))
+
+    def get_all_infos(self):
+        return [FinancialSymbolInfo(fin_sym_id=FinancialSymbolId(self.namespace, name), short_name=name)
+                for name in self.names]
+
+
+class _Sources:
+    def __init__(self, *sources):
+        self.sources = sources
+
+
+def _registry(source, symbol_cache_size=None):
+    return FinancialSymbolsRegistry(symbol_sources=_Sources(source),
+                                    panel_store=PanelStore(panel_dir=''),
+                                    symbol_cache_size=symbol_cache_size)
+
+
+def test__same_symbol_is_returned():
+    source = _Source('foo', ['A', 'B'])
+    registry = _registry(source)
+
+    sym1 = registry.get(FinancialSymbolId('foo', 'A'))
+    sym2 = registry.get(FinancialSymbolId('foo', 'A'))
+
+    assert_that(sym1, same_instance(sym2))
+    assert_that(source.fetched, has_length(1))
+    assert_that(registry.get(FinancialSymbolId('foo', 'C')), none())
+
+
+def test__least_recently_used_symbols_are_dropped_once_unreferenced():
+    source = _Source('foo', ['A', 'B', 'C'])
+    registry = _registry(source, symbol_cache_size=1)
+
+    sym_a = registry.get(FinancialSymbolId('foo', 'A'))
+    registry.get(FinancialSymbolId('foo', 'B'))
+    registry.get(FinancialSymbolId('foo', 'C'))
+
+    # the symbol is still referenced, so it is kept
+    assert_that(registry.get(FinancialSymbolId('foo', 'A')), same_instance(sym_a))
+    assert_that(source.fetched, has_length(3))
+
+    registry.get(FinancialSymbolId('foo', 'B'))
+    del sym_a
+    gc.collect()
+    registry.get(FinancialSymbolId('foo', 'A'))
+    assert_that(source.fetched, has_length(5))
+
+
+def test__symbols_are_resolved_again_once_expired():
+    source = _Source('foo', ['A'])
+    registry = FinancialSymbolsRegistry(symbol_sources=_Sources(source), panel_store=PanelStore(panel_dir=''),
+                                        ttl_seconds=-1)
+
+    sym1 = registry.get(FinancialSymbolId('foo', 'A'))
+    sym2 = registry.get(FinancialSymbolId('foo', 'A'))
+    assert sym1 is not sym2
+    assert_that(source.fetched, has_length(2))
+
+
+def test__panel_store_is_not_checked_on_every_lookup():
+    class _PanelStore(PanelStore):
+        def __init__(self):
+            super().__init__(panel_dir='')
+            self.opened = []
+
+        def open(self, namespace):
+            self.opened.append(namespace)
+            return super().open(namespace)
+
+    panel_store = _PanelStore()
+    registry = FinancialSymbolsRegistry(symbol_sources=_Sources(_Source('foo', ['A', 'B'])), panel_store=panel_store)
+    for name in ['A', 'B', 'A', 'B']:
+        registry.get(FinancialSymbolId('foo', name))
+    assert_that(panel_store.opened, contains('foo'))
+
+
+def test__only_owning_source_is_probed():
+    source1 = _Source('foo', ['A', 'B'])
+    source2 = _Source('foo', ['C'])
+    registry = FinancialSymbolsRegistry(symbol_sources=_Sources(source1, source2),
+                                        panel_store=PanelStore(panel_dir=''))
+
+    assert registry.get(FinancialSymbolId('foo', 'C')).name == 'C'
+    assert_that(source1.fetched, has_length(0))
+    assert_that(source2.fetched, has_length(1))
+
+    assert_that(registry.get(FinancialSymbolId('foo', 'D')), none())
+    assert_that(source1.fetched, has_length(1))
+    assert_that(source2.fetched, has_length(2))
+
+
+def test__get_many_keeps_order_and_resolves_duplicates_once():
+    source = _Source('foo', ['A', 'B', 'C'])
+    registry = _registry(source)
+
+    ids = [FinancialSymbolId('foo', name) for name in ['C', 'A', 'D', 'C', 'B']]
+    symbols = registry.get_many(ids, max_workers=3)
+
+    assert_that([s and s.name for s in symbols], contains('C', 'A', None, 'C', 'B'))
+    assert_that(symbols[0], same_instance(symbols[3]))
+    assert_that(source.fetched, has_length(4))
+
+
+def test__get_many_resolves_a_name_per_source_first():
+    source1 = _Source('foo', ['A', 'B'])
+    source2 = _Source('foo', ['C', 'D'])
+    source3 = _Source('bar', ['E', 'F'])
+    registry = FinancialSymbolsRegistry(symbol_sources=_Sources(source1, source2, source3),
+                                        panel_store=PanelStore(panel_dir=''))
+    resolved = []
+    get = registry.get
+
+    def recording_get(financial_symbol_id):
+        resolved.append(financial_symbol_id.format())
+        return get(financial_symbol_id)
+    registry.get = recording_get
+
+    names = ['foo/A', 'foo/B', 'bar/E', 'foo/C', 'bar/F', 'foo/D']
+    symbols = registry.get_many([FinancialSymbolId.parse(name) for name in names], max_workers=1)
+
+    assert_that([s.name for s in symbols], contains('A', 'B', 'E', 'C', 'F', 'D'))
+    assert_that(resolved, contains('foo/A', 'bar/E', 'foo/C', 'foo/B', 'bar/F', 'foo/D'))
+
+
+def test__source_index_is_loaded_once_by_concurrent_lookups():
+    class DiskCache:
+        def __init__(self):
+            self.reads = 0
+            self.lock = threading.Lock()
+
+        def read_csv(self, url, **kwargs):
+            with self.lock:
+                self.reads += 1
+            time.sleep(.05)
+            return pd.DataFrame({'name': ['SBER'], 'date_start': pd.to_datetime(['2010-1-1']),
+                                 'date_end': pd.to_datetime(['2015-1-1'])}).set_index('name')
+
+    disk_cache = DiskCache()
+    source = MicexStocksSource(disk_cache=disk_cache, series_cache=None)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        indices = list(pool.map(lambda _: source.index, range(8)))
+
+    assert disk_cache.reads == 1
+    assert all(index is indices[0] for index in indices)
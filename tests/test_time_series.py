@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import pytest
 
 from cifrum.common.time_series import TimeSeries, TimeSeriesKind
 
@@ -22,3 +23,86 @@ def test__period_getters():
 
 def test__values_getter():
     np.testing.assert_equal(_tseries.values, _values)
+
+
+def test__yearly_period_range():
+    ts = TimeSeries(values=np.array([.1, .2, .3]),
+                    start_period=pd.Period('2011-1', freq='M'), end_period=pd.Period('2013-6', freq='M'),
+                    freq='Y', kind=TimeSeriesKind.YTD)
+    assert ts.end_period == pd.Period('2013-1', freq='M')
+    assert ts.period_size == 25
+    assert ts.period_range() == [pd.Period('2011-1', freq='M'), pd.Period('2012-1', freq='M'),
+                                 pd.Period('2013-1', freq='M')]
+
+
+def test__slice():
+    ts = _tseries[1:-1]
+    assert ts.start_period == pd.Period('2011-2', freq='M')
+    assert ts.end_period == pd.Period('2011-3', freq='M')
+    np.testing.assert_equal(ts.values, _values[1:-1])
+
+
+def test__slice_shares_values_and_copies_on_write():
+    ts = _tseries.copy()
+    ts_slice = ts[1:3]
+    assert np.shares_memory(ts.values, ts_slice.values)
+
+    ts_slice[0] = 100.
+    ts[1] = 200.
+    np.testing.assert_equal(ts.values, [1., 200., 7., 10.])
+    np.testing.assert_equal(ts_slice.values, [100., 7.])
+    np.testing.assert_equal(_tseries.values, _values)
+
+
+def test__arithmetic_keeps_periods_and_kinds():
+    ts = (_tseries * 2. + _tseries) / _tseries - 1.
+    assert ts.start_period == _start_period
+    assert ts.end_period == _end_period
+    assert ts.kind == TimeSeriesKind.VALUES
+    np.testing.assert_almost_equal(ts.values, [2., 2., 2., 2.])
+
+    ror = _tseries.pct_change()
+    assert ror.start_period == _start_period + 1
+    assert ror.kind == TimeSeriesKind.DIFF
+    assert (ror + 1.).cumprod().kind == TimeSeriesKind.CUMULATIVE
+
+
+def test__arithmetic_on_incompatible_series():
+    with pytest.raises(ValueError):
+        _ = _tseries + _tseries[1:]
+    with pytest.raises(ValueError):
+        _ = _tseries + np.int64(1)
+
+
+def test__ytd_and_qtd_drop_partial_first_bucket():
+    ror = TimeSeries(values=np.full(19, .01),
+                     start_period=pd.Period('2010-11', freq='M'), end_period=pd.Period('2012-5', freq='M'),
+                     kind=TimeSeriesKind.DIFF)
+
+    ytd = ror.ytd()
+    assert ytd.kind == TimeSeriesKind.YTD
+    assert ytd.period_range() == [pd.Period('2011-1', freq='M'), pd.Period('2012-1', freq='M')]
+    np.testing.assert_almost_equal(ytd.values, [1.01 ** 12 - 1., 1.01 ** 5 - 1.])
+
+    qtd = ror.qtd()
+    assert qtd.kind == TimeSeriesKind.QTD
+    assert qtd.start_period == pd.Period('2011-1', freq='M')
+    assert qtd.end_period == pd.Period('2012-4', freq='M')
+    np.testing.assert_almost_equal(qtd.values, [1.01 ** 3 - 1.] * 5 + [1.01 ** 2 - 1.])
+
+    with pytest.raises(ValueError):
+        ror[:2].ytd()
+
+
+def test__resample():
+    ts = TimeSeries(values=np.arange(1., 8.),
+                    start_period=pd.Period('2011-3', freq='M'), end_period=pd.Period('2011-9', freq='M'),
+                    kind=TimeSeriesKind.VALUES)
+
+    ts_q = ts.resample('Q', np.nansum)
+    assert ts_q.kind == TimeSeriesKind.VALUES
+    assert ts_q.start_period == pd.Period('2011-4', freq='M')
+    np.testing.assert_equal(ts_q.values, [2. + 3. + 4., 5. + 6. + 7.])
+    np.testing.assert_equal(ts.resample('Q', np.nanmean).values, [3., 6.])
+    with pytest.raises(ValueError):
+        ts.resample('Y', np.nansum)
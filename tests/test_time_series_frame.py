@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cifrum.common.time_series import TimeSeries, TimeSeriesKind
+from cifrum.common.time_series_frame import TimeSeriesFrame
+
+_start_period = pd.Period('2010-11', freq='M')
+_end_period = pd.Period('2012-5', freq='M')
+
+
+def _series(values, kind=TimeSeriesKind.DIFF):
+    return TimeSeries(values=np.array(values, dtype=float),
+                      start_period=_start_period, end_period=_end_period,
+                      kind=kind)
+
+
+def test__operations_match_the_ones_of_series():
+    ts1 = _series(np.linspace(.001, .019, num=19))
+    ts2 = _series(np.linspace(-.01, .01, num=19))
+    inflation = _series(np.full(19, .005))
+    frame = TimeSeriesFrame.from_series([ts1, ts2])
+    assert frame.shape == (2, 19)
+    assert frame.start_period == _start_period
+
+    ror = ((frame + 1.) / (inflation + 1.) - 1.).dot([.3, .7])
+    ror_expected = ((ts1 + 1.) / (inflation + 1.) - 1.) * .3 + ((ts2 + 1.) / (inflation + 1.) - 1.) * .7
+    assert ror.kind == TimeSeriesKind.DIFF
+    assert ror.period_range() == ror_expected.period_range()
+    np.testing.assert_almost_equal(ror.values, ror_expected.values)
+
+    ytd = frame.ytd()
+    assert ytd.kind == TimeSeriesKind.YTD
+    assert ytd.period_range() == ts1.ytd().period_range()
+    np.testing.assert_almost_equal(ytd[1].values, ts2.ytd().values)
+
+    closes = TimeSeriesFrame.from_series([(ts1 + 1.).cumprod(), (ts2 + 1.).cumprod()])
+    ror = closes.pct_change()
+    assert ror.start_period == _start_period + 1
+    np.testing.assert_almost_equal(ror[0].values, ts1.values[1:])
+
+
+def test__incompatible_series():
+    ts = _series(np.zeros(19))
+    with pytest.raises(ValueError):
+        TimeSeriesFrame.from_series([ts, ts[1:]])
+    with pytest.raises(ValueError):
+        TimeSeriesFrame.from_series([ts, _series(np.zeros(19), kind=TimeSeriesKind.VALUES)])
+    with pytest.raises(ValueError):
+        TimeSeriesFrame.from_series([ts, ts]).dot([1.])
@@ -3,7 +3,9 @@ import pandas as pd
 import pytest
 from hamcrest import assert_that, has_length, none
 
-from cifrum.common.financial_symbol import ValuesFetcher
+from cifrum.common.enums import Currency, Period, SecurityType
+from cifrum.common.financial_symbol import FinancialSymbol, ValuesFetcher
+from cifrum.common.financial_symbol_id import FinancialSymbolId
 
 
 @pytest.fixture
@@ -156,3 +158,49 @@ def test__fetch_broader_than_stored_region(values_fetcher):
                             values_fetcher._values_func(start_period=ps2, end_period=pe2).close.values)
     assert values_fetcher._period_range.start == ps2
     assert values_fetcher._period_range.end == pe2
+
+
+def test__fetch_only_missing_region_between_stored_regions(values_fetcher):
+    _ = values_fetcher._fetch(start_period=pd.Period('2013-1', freq='M'), end_period=pd.Period('2013-6', freq='M'))
+    _ = values_fetcher._fetch(start_period=pd.Period('2014-1', freq='M'), end_period=pd.Period('2014-6', freq='M'))
+
+    ps = pd.Period('2013-3', freq='M')
+    pe = pd.Period('2014-3', freq='M')
+    values = values_fetcher._fetch(start_period=ps, end_period=pe)
+
+    assert values_fetcher._values_func.requests[-1] == (pd.Period('2013-7', freq='M'), pd.Period('2013-12', freq='M'))
+    assert_that(values, has_length((pe - ps).n + 1))
+    np.testing.assert_equal(values.close.values,
+                            values_fetcher._values_func(start_period=ps, end_period=pe).close.values)
+
+
+def test__repeated_fetch_does_not_request_values(values_fetcher):
+    ps = pd.Period('2014-1', freq='M')
+    pe = pd.Period('2015-1', freq='M')
+    for _ in range(3):
+        _ = values_fetcher._fetch(start_period=pd.Period('2013-1', freq='M'), end_period=pe)
+        _ = values_fetcher._fetch(start_period=ps, end_period=pd.Period('2016-6', freq='M'))
+
+    assert_that(values_fetcher._values_func.requests, has_length(2))
+    assert values_fetcher._period_range.start == pd.Period('2013-1', freq='M')
+    assert values_fetcher._period_range.end == pd.Period('2016-6', freq='M')
+
+
+@pytest.mark.parametrize('ascending, closes', [(True, [1., 3.]), (False, [2., 4.])])
+def test__daily_values_keep_the_first_row_of_month_in_source_order(ascending, closes):
+    def values_func(start_period, end_period):
+        df = pd.DataFrame.from_dict({
+            'date': pd.to_datetime(['2015-01-05', '2015-01-30', '2015-02-02', '2015-02-27']),
+            'close': [1., 2., 3., 4.],
+        })
+        return df if ascending else df.iloc[::-1]
+
+    fs = FinancialSymbol(identifier=FinancialSymbolId('micex', 'FOO'), values=values_func,
+                         adjusted_close=True, currency=Currency.RUB, period=Period.DAY,
+                         security_type=SecurityType.STOCK_ETF,
+                         start_period=pd.Period('2015-1-5', freq='D'), end_period=pd.Period.now(freq='D'))
+    vals = fs.values(start_period=pd.Period('2015-1', freq='M'), end_period=pd.Period('2015-2', freq='M'))
+
+    assert list(vals['period']) == [pd.Period('2015-1', freq='M'), pd.Period('2015-2', freq='M')]
+    # the last day of the month for the sources listing the latest days first, as the baseline expects
+    assert list(vals['close']) == closes